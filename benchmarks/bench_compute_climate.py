@@ -0,0 +1,184 @@
+"""Measure allocations and time of the per tick climate computation of a profile.
+
+The computation is compared with a reference of how it worked before climate settings were
+cached, which built new settings from the schedule entry on every tick.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_compute_climate
+"""
+
+import timeit
+import tracemalloc
+from bisect import bisect_right
+from collections.abc import Callable
+from datetime import date, timedelta
+
+from custom_components.climate_scheduler.common import ComputedClimateData
+from custom_components.climate_scheduler.const import (
+    CONF_PROFILE_DEFAULT_HVAC_MODE,
+    CONF_PROFILE_DEFAULT_MIN_TEMP,
+    CONF_PROFILE_ID,
+    CONF_PROFILE_SCHEDULE,
+    CONF_SCHEDULE_DAYS,
+    CONF_SCHEDULE_MIN_TEMP,
+    CONF_SCHEDULE_TIME,
+)
+from custom_components.climate_scheduler.profile import SECONDS_PER_DAY, ClimateSchedulerProfile
+from custom_components.climate_scheduler.schedule import ClimateSchedulerSchedule
+
+TICKS = 10_000
+
+
+def _profile() -> ClimateSchedulerProfile:
+    schedule = [
+        {CONF_SCHEDULE_TIME: timedelta(minutes=30 * i), CONF_SCHEDULE_MIN_TEMP: 17.0 + i % 6} for i in range(48)
+    ]
+    schedule.append({CONF_SCHEDULE_TIME: timedelta(hours=9, minutes=15), CONF_SCHEDULE_DAYS: ["sat", "sun"]})
+    return ClimateSchedulerProfile(
+        {
+            CONF_PROFILE_ID: "Benchmark",
+            CONF_PROFILE_DEFAULT_HVAC_MODE: "heat",
+            CONF_PROFILE_DEFAULT_MIN_TEMP: 20.0,
+            CONF_PROFILE_SCHEDULE: schedule,
+        }
+    )
+
+
+class PreChangeSchedule:
+    """Schedule entry as it was before, a regular object with properties over its settings."""
+
+    def __init__(self, schedule: ClimateSchedulerSchedule) -> None:
+        self._hvac_mode = schedule.hvac_mode
+        self._fan_mode = schedule.fan_mode
+        self._swing_mode = schedule.swing_mode
+        self._min_temp = schedule.min_temp
+        self._max_temp = schedule.max_temp
+
+    @property
+    def hvac_mode(self) -> str | None:
+        return self._hvac_mode
+
+    @property
+    def fan_mode(self) -> str | None:
+        return self._fan_mode
+
+    @property
+    def swing_mode(self) -> str | None:
+        return self._swing_mode
+
+    @property
+    def min_temp(self) -> float | None:
+        return self._min_temp
+
+    @property
+    def max_temp(self) -> float | None:
+        return self._max_temp
+
+
+class PreChangeProfile:
+    """compute_climate as it was before, over the compiled tables of a profile."""
+
+    def __init__(self, profile: ClimateSchedulerProfile) -> None:
+        schedules = {}
+
+        def _pre_change(schedule: ClimateSchedulerSchedule) -> PreChangeSchedule:
+            return schedules.setdefault(schedule, PreChangeSchedule(schedule))
+
+        (
+            self._default_hvac_mode,
+            self._default_fan_mode,
+            self._default_swing_mode,
+            self._default_min_temp,
+            self._default_max_temp,
+        ) = profile._default_climate
+        self._week_starts = list(profile._week_starts)
+        self._week_schedules = [_pre_change(s) for s in profile._week_schedules]
+        self._overrides = {
+            day: (times, [_pre_change(s) for s in day_schedules])
+            for day, (times, day_schedules) in profile._overrides.items()
+        }
+
+    def compute_climate(self, time_of_day: timedelta, day: date | None = None) -> ComputedClimateData:
+        schedule = self._find_schedule(int(time_of_day.total_seconds()), day)
+        if schedule is None:
+            return ComputedClimateData(
+                self._default_hvac_mode,
+                self._default_fan_mode,
+                self._default_swing_mode,
+                self._default_min_temp,
+                self._default_max_temp,
+            )
+
+        return self._compute_schedule_climate(schedule)
+
+    def _compute_schedule_climate(self, schedule: PreChangeSchedule) -> ComputedClimateData:
+        return ComputedClimateData(
+            schedule.hvac_mode if schedule.hvac_mode else self._default_hvac_mode,
+            schedule.fan_mode if schedule.fan_mode else self._default_fan_mode,
+            schedule.swing_mode if schedule.swing_mode else self._default_swing_mode,
+            schedule.min_temp if schedule.min_temp else self._default_min_temp,
+            schedule.max_temp if schedule.max_temp else self._default_max_temp,
+        )
+
+    def _find_schedule(self, seconds: int, day: date | None) -> PreChangeSchedule | None:
+        if day is not None:
+            override = self._overrides.get(day)
+            if override is not None and seconds >= override[0][0]:
+                return override[1][bisect_right(override[0], seconds) - 1]
+
+        if len(self._week_schedules) == 0:
+            return None
+
+        position = (0 if day is None else day.weekday()) * SECONDS_PER_DAY + seconds
+        return self._week_schedules[bisect_right(self._week_starts, position) - 1]
+
+
+def _ticks() -> list[tuple[timedelta, date]]:
+    day = date(2024, 1, 1)
+    return [(timedelta(seconds=(i * 61) % 86400), day + timedelta(days=i % 7)) for i in range(TICKS)]
+
+
+def _measure(
+    compute: Callable[[timedelta, date], ComputedClimateData], ticks: list[tuple[timedelta, date]]
+) -> tuple[float, int, float]:
+    """Return the bytes allocated per tick, the number of distinct results and the seconds per tick."""
+
+    def run() -> None:
+        for time_of_day, day in ticks:
+            compute(time_of_day, day)
+
+    run()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    results = [compute(t, d) for t, d in ticks]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    # Results are kept alive so that every object allocated for them is counted
+    allocated = sum(s.size_diff for s in after.compare_to(before, "filename"))
+    distinct = len({id(r) for r in results})
+    seconds = min(timeit.repeat(run, number=1, repeat=5))
+    return allocated / len(ticks), distinct, seconds / len(ticks)
+
+
+def main() -> None:
+    profile = _profile()
+    ticks = _ticks()
+    reference = PreChangeProfile(profile)
+
+    # Both compute the same settings
+    assert all(profile.compute_climate(t, d) == reference.compute_climate(t, d) for t, d in ticks)
+
+    before = _measure(reference.compute_climate, ticks)
+    after = _measure(profile.compute_climate, ticks)
+
+    print(f"ticks:            {len(ticks)}")
+    print(f"{'':18}{'before':>10}{'after':>10}")
+    print(f"bytes/tick:       {before[0]:>10.1f}{after[0]:>10.1f}")
+    print(f"distinct results: {before[1]:>10}{after[1]:>10}")
+    print(f"time/tick (us):   {before[2] * 1e6:>10.2f}{after[2] * 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Measure the startup cost of the integration: module imports and profile setup.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_startup
+
+Imports are measured in fresh interpreters which already loaded the Home Assistant modules the
+integration depends on, as Home Assistant does before setting up the integration. The run fails
+when modules only needed by optional features or by changed configurations are loaded on import,
+or when importing takes longer than the budget.
+"""
+
+import subprocess
+import sys
+import timeit
+from datetime import timedelta
+
+from custom_components.climate_scheduler.const import (
+    CONF_PROFILE_DEFAULT_HVAC_MODE,
+    CONF_PROFILE_ID,
+    CONF_PROFILE_SCHEDULE,
+    CONF_SCHEDULE_DAYS,
+    CONF_SCHEDULE_MIN_TEMP,
+    CONF_SCHEDULE_TIME,
+)
+from custom_components.climate_scheduler.profile import ClimateSchedulerProfile
+from custom_components.climate_scheduler.snapshot import dump_profiles, load_profiles, validate_profiles
+
+IMPORT_RUNS = 5
+IMPORT_BUDGET_MS = 50.0
+PROFILES = 20
+
+# Loaded by Home Assistant before the integration, through its manifest dependencies
+PRELOADED = [
+    "homeassistant.core",
+    "homeassistant.helpers.config_validation",
+    "homeassistant.helpers.entity",
+    "homeassistant.helpers.event",
+    "homeassistant.helpers.restore_state",
+    "homeassistant.helpers.storage",
+    "homeassistant.components.climate",
+    "homeassistant.components.switch",
+    "homeassistant.components.websocket_api",
+]
+
+# Only needed by optional features, when profiling or when validating a changed configuration
+DEFERRED = [
+    "cProfile",
+    "pstats",
+    "homeassistant.components.input_select",
+    "custom_components.climate_scheduler.ack",
+    "custom_components.climate_scheduler.hysteresis",
+    "custom_components.climate_scheduler.optimal_start",
+    "custom_components.climate_scheduler.pause",
+    "custom_components.climate_scheduler.tariff",
+]
+DEFERRED_SCHEMAS = {
+    "custom_components.climate_scheduler.profile": "PROFILES_SCHEMA",
+    "custom_components.climate_scheduler.schedule": "SCHEDULE_SCHEMA",
+}
+
+_IMPORT_SCRIPT = f"""
+import importlib, sys, time
+for name in {PRELOADED!r}:
+    importlib.import_module(name)
+start = time.perf_counter()
+import custom_components.climate_scheduler.switch
+elapsed = time.perf_counter() - start
+loaded = [name for name in {DEFERRED!r} if name in sys.modules]
+loaded += [
+    f"{{module}}.{{name}}" for module, name in {DEFERRED_SCHEMAS!r}.items() if name in vars(sys.modules[module])
+]
+print(elapsed * 1000)
+print(",".join(loaded))
+"""
+
+
+def _measure_import() -> tuple[float, list[str]]:
+    output = subprocess.run(
+        [sys.executable, "-c", _IMPORT_SCRIPT], check=True, capture_output=True, text=True
+    ).stdout.splitlines()
+    return float(output[0]), [name for name in output[1].split(",") if name]
+
+
+def _profiles_config() -> list[dict]:
+    schedule = [
+        {CONF_SCHEDULE_TIME: str(timedelta(minutes=30 * i)), CONF_SCHEDULE_MIN_TEMP: 17 + i % 6} for i in range(47)
+    ]
+    schedule.append({CONF_SCHEDULE_TIME: "23:45:00", CONF_SCHEDULE_DAYS: ["sat", "sun"]})
+    return [
+        {CONF_PROFILE_ID: f"Profile {i}", CONF_PROFILE_DEFAULT_HVAC_MODE: "heat", CONF_PROFILE_SCHEDULE: schedule}
+        for i in range(PROFILES)
+    ]
+
+
+def main() -> None:
+    # Warm up, so that measured runs import from compiled bytecode
+    _measure_import()
+    import_ms, loaded = min(_measure_import() for _ in range(IMPORT_RUNS))
+
+    config = _profiles_config()
+    snapshot = dump_profiles(validate_profiles(config))
+
+    def build(profiles: list[dict]) -> None:
+        schedule_cache = {}
+        for profile in profiles:
+            ClimateSchedulerProfile(profile, schedule_cache)
+
+    validate_ms = min(timeit.repeat(lambda: build(validate_profiles(config)), number=1, repeat=5)) * 1000
+    snapshot_ms = min(timeit.repeat(lambda: build(load_profiles(snapshot)), number=1, repeat=5)) * 1000
+
+    print(f"import:           {import_ms:.2f} ms (budget {IMPORT_BUDGET_MS:.0f} ms)")
+    print(f"deferred loaded:  {', '.join(loaded) or 'none'}")
+    print(f"setup {PROFILES} profiles, validated:     {validate_ms:.2f} ms")
+    print(f"setup {PROFILES} profiles, from snapshot: {snapshot_ms:.2f} ms")
+
+    if loaded or import_ms > IMPORT_BUDGET_MS:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,16 +4,35 @@ import logging
 
 import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
-
-from .const import CONF_UPDATE_INTERVAL, DATA_CLIMATE_SCHEDULER
+from homeassistant.helpers.discovery import async_load_platform
+
+from .const import (
+    CONF_CALLBACK_BUDGET,
+    CONF_CONFIRM_TIMEOUT,
+    CONF_LOOP_LAG_SENSOR,
+    CONF_UPDATE_INTERVAL,
+    DATA_CLIMATE_SCHEDULER,
+)
 from .scheduler import ClimateScheduler
+from .services import async_setup_services
+from .websocket_api import async_setup_websocket_api
 
 DOMAIN = "climate_scheduler"
 
 
 CONFIG_SCHEMA = vol.Schema(
-    {DOMAIN: vol.Schema({vol.Optional(CONF_UPDATE_INTERVAL, default="00:15:00"): cv.positive_time_period})},
+    {
+        DOMAIN: vol.Schema(
+            {
+                vol.Optional(CONF_UPDATE_INTERVAL, default="00:15:00"): cv.positive_time_period,
+                vol.Optional(CONF_CALLBACK_BUDGET, default=1.0): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Optional(CONF_LOOP_LAG_SENSOR, default=False): cv.boolean,
+                vol.Optional(CONF_CONFIRM_TIMEOUT): cv.positive_time_period,
+            }
+        )
+    },
     extra=vol.ALLOW_EXTRA,
 )
 
@@ -30,7 +49,14 @@ async def async_setup(hass: HomeAssistant, global_config: dict) -> bool:
         _LOGGER.error("No config found for Climate Scheduler")
         return False
 
-    climate_scheduler = ClimateScheduler(hass, config)
+    climate_scheduler = ClimateScheduler(hass, config, global_config)
     hass.data[DATA_CLIMATE_SCHEDULER] = climate_scheduler
+    async_setup_services(hass, DOMAIN, climate_scheduler)
+    async_setup_websocket_api(hass, DOMAIN)
+
+    if config.get(CONF_LOOP_LAG_SENSOR):
+        hass.async_create_task(
+            async_load_platform(hass, Platform.SENSOR, DOMAIN, {CONF_LOOP_LAG_SENSOR: True}, global_config)
+        )
 
     return True
@@ -0,0 +1,193 @@
+"""Acknowledgement of climate commands for Climate Scheduler."""
+
+import logging
+import time
+from collections import deque
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from functools import partial
+
+from homeassistant.components.climate import ATTR_HVAC_MODE
+from homeassistant.core import Event, HomeAssistant, State, callback
+from homeassistant.helpers.event import async_call_later, async_track_state_change_event
+
+from .common import ClimateCommand
+from .const import ACK_LATENCY_SAMPLES, ACK_MAX_RETRIES, ACK_TEMPERATURE_TOLERANCE
+from .dispatch import async_dispatch_commands
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def expected_state(commands: list[ClimateCommand]) -> dict:
+    """Return the settings climate commands should leave an entity with, the hvac mode being its state."""
+    expected = {}
+    for command in commands:
+        expected.update(command.data)
+    return expected
+
+
+def state_matches(state: State | None, expected: dict) -> bool:
+    """Return whether the state of a climate entity has all the expected settings."""
+    if state is None:
+        return False
+
+    for attribute, value in expected.items():
+        actual = state.state if attribute == ATTR_HVAC_MODE else state.attributes.get(attribute)
+        if isinstance(value, float):
+            # Devices round setpoints to their own step
+            try:
+                if abs(float(actual) - value) > ACK_TEMPERATURE_TOLERANCE:
+                    return False
+            except (TypeError, ValueError):
+                return False
+        elif actual != value:
+            return False
+    return True
+
+
+class _LatencyStats:
+    """Confirmation counts and latest confirm latencies of a climate entity, in seconds."""
+
+    __slots__ = ("sent", "confirmed", "retries", "unconfirmed", "latencies")
+
+    def __init__(self) -> None:
+        self.sent = 0
+        self.confirmed = 0
+        self.retries = 0
+        self.unconfirmed = 0
+        self.latencies: deque[float] = deque(maxlen=ACK_LATENCY_SAMPLES)
+
+    def as_dict(self) -> dict:
+        latencies = sorted(self.latencies)
+        return {
+            "sent": self.sent,
+            "confirmed": self.confirmed,
+            "retries": self.retries,
+            "unconfirmed": self.unconfirmed,
+            "latency_ms": None
+            if not latencies
+            else {
+                "samples": len(latencies),
+                "mean": round(sum(latencies) / len(latencies) * 1000, 1),
+                "p50": round(_percentile(latencies, 0.5) * 1000, 1),
+                "p90": round(_percentile(latencies, 0.9) * 1000, 1),
+                "max": round(latencies[-1] * 1000, 1),
+            },
+        }
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    """Return the nearest rank percentile of sorted values."""
+    return ordered[max(round(fraction * len(ordered)) - 1, 0)]
+
+
+class _Expectation:
+    """Settings sent to a climate entity and not confirmed yet."""
+
+    __slots__ = ("commands", "expected", "sent", "attempts", "remove_listener", "cancel_timeout")
+
+    def __init__(self, commands: list[ClimateCommand]) -> None:
+        self.commands = commands
+        self.expected = expected_state(commands)
+        self.sent = time.monotonic()
+        self.attempts = 1
+        self.remove_listener: Callable[[], None] | None = None
+        self.cancel_timeout: Callable[[], None] | None = None
+
+    def cancel(self) -> None:
+        for remove in (self.remove_listener, self.cancel_timeout):
+            if remove is not None:
+                remove()
+        self.remove_listener = self.cancel_timeout = None
+
+
+class CommandAcknowledgements:
+    """Matches the commands sent to climate entities against their state changes.
+
+    Entities which don't confirm within the timeout are sent their commands again, up to a few
+    times, after which the unconfirmed callback lets the next update send them from scratch.
+    """
+
+    def __init__(self, hass: HomeAssistant, timeout: timedelta, on_unconfirmed: Callable[[str], None]) -> None:
+        """Initialize the acknowledgements."""
+        self._hass = hass
+        self._timeout = timeout
+        self._on_unconfirmed = on_unconfirmed
+        self._pending: dict[str, _Expectation] = {}
+        self._stats: dict[str, _LatencyStats] = {}
+
+    def expect(self, entity_id: str, commands: list[ClimateCommand]) -> None:
+        """Expect the settings of commands about to be sent to an entity, replacing earlier ones."""
+        self.forget(entity_id)
+        if not commands:
+            return
+
+        expectation = _Expectation(commands)
+        if state_matches(self._hass.states.get(entity_id), expectation.expected):
+            # Nothing will change, so there is nothing to confirm
+            return
+
+        self._stats.setdefault(entity_id, _LatencyStats()).sent += 1
+        expectation.remove_listener = async_track_state_change_event(
+            self._hass, [entity_id], self._async_on_state_change
+        )
+        expectation.cancel_timeout = async_call_later(
+            self._hass, self._timeout, partial(self._async_on_timeout, entity_id, expectation)
+        )
+        self._pending[entity_id] = expectation
+
+    @callback
+    def forget(self, entity_id: str) -> None:
+        """Stop waiting for an entity to confirm its latest commands."""
+        expectation = self._pending.pop(entity_id, None)
+        if expectation is not None:
+            expectation.cancel()
+
+    def is_pending(self, entity_id: str) -> bool:
+        """Return whether an entity didn't confirm its latest commands yet."""
+        return entity_id in self._pending
+
+    @callback
+    def _async_on_state_change(self, event: Event) -> None:
+        entity_id = event.data["entity_id"]
+        expectation = self._pending.get(entity_id)
+        if expectation is None or not state_matches(event.data.get("new_state"), expectation.expected):
+            return
+
+        latency = time.monotonic() - expectation.sent
+        _LOGGER.debug("%s confirmed its settings after %.2f s", entity_id, latency)
+        stats = self._stats[entity_id]
+        stats.confirmed += 1
+        stats.latencies.append(latency)
+        self.forget(entity_id)
+
+    @callback
+    def _async_on_timeout(self, entity_id: str, expectation: _Expectation, _now: datetime) -> None:
+        expectation.cancel_timeout = None
+        if self._pending.get(entity_id) is not expectation:
+            return
+
+        stats = self._stats[entity_id]
+        if expectation.attempts > ACK_MAX_RETRIES:
+            _LOGGER.warning(
+                "%s didn't confirm %s after %s attempts", entity_id, expectation.expected, expectation.attempts
+            )
+            stats.unconfirmed += 1
+            self.forget(entity_id)
+            self._on_unconfirmed(entity_id)
+            return
+
+        _LOGGER.info("%s didn't confirm %s, sending it again", entity_id, expectation.expected)
+        stats.retries += 1
+        expectation.attempts += 1
+        expectation.cancel_timeout = async_call_later(
+            self._hass, self._timeout, partial(self._async_on_timeout, entity_id, expectation)
+        )
+        self._hass.async_create_task(async_dispatch_commands(self._hass, expectation.commands))
+
+    def as_dict(self, entity_ids: list[str]) -> dict:
+        """Return the confirmation statistics of climate entities."""
+        return {
+            entity_id: {**self._stats.get(entity_id, _LatencyStats()).as_dict(), "pending": self.is_pending(entity_id)}
+            for entity_id in entity_ids
+        }
@@ -6,3 +6,42 @@ ComputedClimateData = namedtuple(
     "ComputedClimateData",
     ["hvac_mode", "fan_mode", "swing_mode", "min_temp", "max_temp"],
 )
+
+# Per entity adjustment of the climate computed by a profile. The offset shifts temperatures,
+# other fields override the computed value when not None.
+ClimateAdjustment = namedtuple("ClimateAdjustment", ["offset", "hvac_mode", "fan_mode", "swing_mode"])
+
+# Schedule time relative to sunrise or sunset, offset is a signed timedelta
+SunRelativeTime = namedtuple("SunRelativeTime", ["event", "offset"])
+
+# Climate settings of a profile right now, and the next time and settings they change to
+ScheduleStatus = namedtuple("ScheduleStatus", ["current", "next_time", "next_climate"])
+
+# Temporary override of a switch until a UTC time. The profile, when not None, replaces the current
+# one and the climate fields which are not None replace the scheduled values.
+Hold = namedtuple("Hold", ["until", "profile_id", "climate"])
+
+# Climate service call for a single entity. Data is a tuple of (attribute, value) pairs so
+# that commands can be compared and deduplicated.
+ClimateCommand = namedtuple("ClimateCommand", ["service", "entity_id", "data"])
+
+# Duration in seconds of a climate service call sent by the dispatcher, entity_id is the call target
+ServiceCallTiming = namedtuple("ServiceCallTiming", ["service", "entity_id", "duration"])
+
+
+def adjust_climate(data: ComputedClimateData, adjustment: ClimateAdjustment) -> ComputedClimateData:
+    """Return climate settings with a per entity adjustment applied."""
+    return ComputedClimateData(
+        adjustment.hvac_mode or data.hvac_mode,
+        adjustment.fan_mode or data.fan_mode,
+        adjustment.swing_mode or data.swing_mode,
+        None if data.min_temp is None else data.min_temp + adjustment.offset,
+        None if data.max_temp is None else data.max_temp + adjustment.offset,
+    )
+
+
+def hold_climate(data: ComputedClimateData | None, held: ComputedClimateData) -> ComputedClimateData | None:
+    """Return climate settings with the values held by a hold replacing scheduled ones."""
+    if data is None:
+        return held if any(v is not None for v in held) else None
+    return ComputedClimateData(*(d if h is None else h for d, h in zip(data, held)))
@@ -1,20 +1,47 @@
 """Constants for Climate Scheduler."""
 
+from datetime import timedelta
+
 CONF_CLIMATE_ENTITIES = "climate_entities"
 CONF_DEFAULT_STATE = "default_state"
 CONF_DEFAULT_PROFILE = "default_profile"
 CONF_PROFILES = "profiles"
+CONF_CLIMATE_ENTITY_OFFSET = "offset"
+CONF_PRIORITY = "priority"
+CONF_OPTIMAL_START = "optimal_start"
+CONF_OPTIMAL_START_MAX_LEAD = "optimal_start_max_lead"
+CONF_TEMPERATURE_SENSOR = "temperature_sensor"
+CONF_HYSTERESIS = "hysteresis"
+CONF_MIN_CYCLE_TIME = "min_cycle_time"
+CONF_WINDOW_SENSORS = "window_sensors"
+CONF_WINDOW_DELAY = "window_delay"
+CONF_OCCUPANCY_SENSORS = "occupancy_sensors"
+CONF_OCCUPANCY_TIMEOUT = "occupancy_timeout"
+CONF_SENSORS = "sensors"
 
 DATA_CLIMATE_SCHEDULER = "data_climate_scheduler"
 CONF_UPDATE_INTERVAL = "update_interval"
+CONF_CALLBACK_BUDGET = "callback_budget"
+CONF_LOOP_LAG_SENSOR = "loop_lag_sensor"
+CONF_CONFIRM_TIMEOUT = "confirm_timeout"
 
 CONF_PROFILE_ID = "id"
+CONF_PROFILE_EXTENDS = "extends"
 CONF_PROFILE_SCHEDULE = "schedule"
 CONF_PROFILE_DEFAULT_HVAC_MODE = "default_hvac_mode"
 CONF_PROFILE_DEFAULT_FAN_MODE = "default_fan_mode"
 CONF_PROFILE_DEFAULT_SWING_MODE = "default_swing_mode"
 CONF_PROFILE_DEFAULT_MIN_TEMP = "default_min_temp"
 CONF_PROFILE_DEFAULT_MAX_TEMP = "default_max_temp"
+CONF_PROFILE_IDLE_HVAC_MODE = "idle_hvac_mode"
+CONF_PROFILE_IDLE_FAN_MODE = "idle_fan_mode"
+CONF_PROFILE_COST_OPTIMIZATION = "cost_optimization"
+
+CONF_TARIFF_SENSOR = "tariff_sensor"
+CONF_TARIFF_ATTRIBUTE = "forecast_attribute"
+CONF_TARIFF_HEATING_RATE = "heating_rate"
+CONF_TARIFF_LOSS_RATE = "loss_rate"
+CONF_TARIFF_PREHEAT_MARGIN = "preheat_margin"
 
 CONF_SCHEDULE_TIME = "time"
 CONF_SCHEDULE_HVAC = "hvac_mode"
@@ -22,9 +49,64 @@ CONF_SCHEDULE_MIN_TEMP = "min_temp"
 CONF_SCHEDULE_MAX_TEMP = "max_temp"
 CONF_SCHEDULE_FAN_MODE = "fan_mode"
 CONF_SCHEDULE_SWING_MODE = "swing_mode"
+CONF_SCHEDULE_DAYS = "days"
+CONF_SCHEDULE_DATES = "dates"
 
 ATTR_IS_ON = "is_on"
 ATTR_PROFILE = "current_profile"
 ATTR_PROFILE_OPTIONS = "profile_options"
+ATTR_OPTIMAL_START_RATES = "optimal_start_rates"
+ATTR_OPTIMAL_START_TIME = "optimal_start_time"
+ATTR_PAUSED = "paused"
+ATTR_HOLD = "hold"
+ATTR_VERSION = "version"
+
+OPTIMAL_START_HISTORY = timedelta(days=3)
+OPTIMAL_START_MAX_SAMPLES = 48
+OPTIMAL_START_MIN_SAMPLE_INTERVAL = timedelta(minutes=5)
+OPTIMAL_START_MAX_SAMPLE_INTERVAL = timedelta(hours=2)
+
+TARIFF_HORIZON = 24
+TARIFF_STEP = 0.25
+TARIFF_MAX_STATES = 32
+TARIFF_SOLVER_CACHE_SIZE = 128
+
+MAX_PARALLEL_COMMANDS = 10
+
+TRACE_SIZE = 50
+
+PROFILING_REPORT_FUNCTIONS = 40
+
+SIGNAL_TIMELINE_UPDATED = "climate_scheduler_timeline_updated"
+SIGNAL_SCHEDULE_STATUS_UPDATED = "climate_scheduler_schedule_status_updated"
+SIGNAL_WATCHDOG_UPDATED = "climate_scheduler_watchdog_updated"
+
+# Time during which the lag of the timers of a schedule boundary is collected before being published
+WATCHDOG_LAG_WINDOW = timedelta(seconds=5)
+
+# Commands a climate entity doesn't confirm are sent again up to this many times
+ACK_MAX_RETRIES = 2
+# Devices round setpoints to their own step
+ACK_TEMPERATURE_TOLERANCE = 0.25
+# Latest confirm latencies kept per climate entity
+ACK_LATENCY_SAMPLES = 50
+
+SNAPSHOT_STORAGE_KEY = "climate_scheduler_profiles"
+SNAPSHOT_STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 10
+# Part of the configuration hash, bump when validation changes the validated profiles
+SNAPSHOT_FORMAT = 1
+
+SERVICE_SET_PROFILE = "set_profile"
+SERVICE_GET_TRACE = "get_trace"
+SERVICE_GET_COMMAND_LATENCY = "get_command_latency"
+SERVICE_PROFILE_UPDATES = "profile_updates"
+SERVICE_HOLD = "hold"
+SERVICE_CANCEL_HOLD = "cancel_hold"
+ATTR_UPDATES = "updates"
+ATTR_TIMEOUT = "timeout"
+ATTR_PROFILE_ID = "profile"
+ATTR_DURATION = "duration"
+ATTR_UNTIL = "until"
 
 ICON = "mdi:calendar-clock"
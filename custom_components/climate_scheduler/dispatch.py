@@ -0,0 +1,58 @@
+"""Dispatching of climate commands for Climate Scheduler."""
+
+import asyncio
+import time
+from collections.abc import Iterable
+
+from homeassistant.components.climate import DOMAIN as CLIMATE_DOMAIN
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant
+
+from .common import ClimateCommand, ServiceCallTiming
+from .const import MAX_PARALLEL_COMMANDS
+
+
+async def async_dispatch_commands(hass: HomeAssistant, commands: Iterable[ClimateCommand]) -> ServiceCallTiming | None:
+    """Send climate commands as one batch.
+
+    Duplicate commands are only sent once and identical commands of several entities are merged
+    into a single service call. Commands of an entity are sent in order: the n-th command of every
+    entity is sent in a round of calls running in parallel up to a limit, so that large batches
+    don't flood devices.
+
+    Returns the slowest service call, if any.
+    """
+    return await async_send_rounds(hass, group_commands(commands))
+
+
+def group_commands(commands: Iterable[ClimateCommand]) -> list[dict[tuple, list[str]]]:
+    """Group commands into rounds of service calls, each mapping (service, data) to entity IDs."""
+    rounds: list[dict[tuple, list[str]]] = []
+    entity_positions: dict[str, int] = {}
+    for command in dict.fromkeys(commands):
+        position = entity_positions.get(command.entity_id, 0)
+        entity_positions[command.entity_id] = position + 1
+        if position == len(rounds):
+            rounds.append({})
+        rounds[position].setdefault((command.service, command.data), []).append(command.entity_id)
+    return rounds
+
+
+async def async_send_rounds(hass: HomeAssistant, rounds: list[dict[tuple, list[str]]]) -> ServiceCallTiming | None:
+    """Send rounds of service calls one after the other, returning the slowest call."""
+    semaphore = asyncio.Semaphore(MAX_PARALLEL_COMMANDS)
+    slowest: ServiceCallTiming | None = None
+
+    async def _async_send(service: str, data: tuple, entity_ids: list[str]) -> None:
+        nonlocal slowest
+        async with semaphore:
+            target = entity_ids[0] if len(entity_ids) == 1 else entity_ids
+            start = time.perf_counter()
+            await hass.services.async_call(CLIMATE_DOMAIN, service, {ATTR_ENTITY_ID: target, **dict(data)})
+            duration = time.perf_counter() - start
+            if slowest is None or duration > slowest.duration:
+                slowest = ServiceCallTiming(service, target, duration)
+
+    for calls in rounds:
+        await asyncio.gather(*(_async_send(service, data, e) for (service, data), e in calls.items()))
+    return slowest
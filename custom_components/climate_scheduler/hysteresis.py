@@ -0,0 +1,154 @@
+"""Temperature band control for Climate Scheduler."""
+
+import logging
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+from functools import partial
+
+from homeassistant.components.climate import ATTR_CURRENT_TEMPERATURE, HVACMode
+from homeassistant.core import Event, HomeAssistant, State, callback
+from homeassistant.helpers.event import async_call_later, async_track_state_change_event
+from homeassistant.util import dt as dt_util
+
+from .common import ComputedClimateData
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _reading(state: State | None) -> float | None:
+    """Return the temperature of a climate entity or of a temperature sensor."""
+    if state is None:
+        return None
+    value = state.attributes.get(ATTR_CURRENT_TEMPERATURE) if state.domain == "climate" else state.state
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _band_demand(data: ComputedClimateData, current: float, band: float) -> bool | None:
+    """Return whether an entity must run, stop, or None while the reading is within the band."""
+    low = data.min_temp if data.hvac_mode in (HVACMode.HEAT, HVACMode.HEAT_COOL) else None
+    high = data.max_temp if data.hvac_mode in (HVACMode.COOL, HVACMode.HEAT_COOL) else None
+    if low is None and high is None:
+        # Nothing to regulate, always follow the schedule
+        return True
+
+    if (low is not None and current <= low - band) or (high is not None and current >= high + band):
+        return True
+    if (low is None or current >= low + band) and (high is None or current <= high - band):
+        return False
+    return None
+
+
+class HysteresisController:
+    """Runs climate entities only while their temperature is outside of a band around the target.
+
+    Entities are switched on when the temperature leaves the band on the wrong side of the target
+    and off once it leaves the band on the other side, but never sooner than a minimum cycle time
+    after the previous switch.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        sensors: dict[str, str],
+        band: float,
+        min_cycle_time: timedelta,
+        on_change: Callable[[str, ComputedClimateData], Awaitable[None]],
+    ) -> None:
+        """Initialize the controller with the temperature source of each climate entity."""
+        self._hass = hass
+        self._sensors = sensors
+        self._band = band
+        self._min_cycle_time = min_cycle_time
+        self._on_change = on_change
+
+        self._entities_by_sensor: dict[str, list[str]] = {}
+        for entity_id, sensor in sensors.items():
+            self._entities_by_sensor.setdefault(sensor, []).append(entity_id)
+
+        self._targets: dict[str, ComputedClimateData] = {}
+        self._demand: dict[str, bool] = {}
+        self._last_change: dict[str, datetime] = {}
+        self._timers: dict[str, Callable[[], None]] = {}
+        self._remove_tracker: Callable[[], None] | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Follow the temperature of the climate entities."""
+        self._remove_tracker = async_track_state_change_event(
+            self._hass, list(self._entities_by_sensor), self._async_on_state_change
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop following temperatures."""
+        if self._remove_tracker is not None:
+            self._remove_tracker()
+            self._remove_tracker = None
+        for cancel in self._timers.values():
+            cancel()
+        self._timers.clear()
+
+    def update_target(self, entity_id: str, data: ComputedClimateData) -> bool:
+        """Set the scheduled climate of an entity and return whether the entity must run."""
+        self._targets[entity_id] = data
+        self._evaluate(entity_id)
+        return self._demand[entity_id]
+
+    @callback
+    def _async_on_state_change(self, event: Event) -> None:
+        for entity_id in self._entities_by_sensor[event.data["entity_id"]]:
+            self._async_reevaluate(entity_id)
+
+    @callback
+    def _async_reevaluate(self, entity_id: str, cycle_elapsed: bool = False) -> None:
+        if entity_id not in self._targets:
+            return
+        if self._evaluate(entity_id, cycle_elapsed):
+            self._hass.async_create_task(self._on_change(entity_id, self._targets[entity_id]))
+
+    def _evaluate(self, entity_id: str, cycle_elapsed: bool = False) -> bool:
+        """Update the demand of an entity, returning whether it changed."""
+        current = _reading(self._hass.states.get(self._sensors[entity_id]))
+        demand = self._demand.get(entity_id)
+        if current is None:
+            # Without a temperature, fall back to the plain schedule
+            desired = True
+        else:
+            desired = _band_demand(self._targets[entity_id], current, self._band)
+            if desired is None:
+                # Within the band, keep going in the same direction
+                desired = True if demand is None else demand
+
+        if desired == demand:
+            self._cancel_timer(entity_id)
+            return False
+
+        now = dt_util.utcnow()
+        last_change = self._last_change.get(entity_id)
+        too_soon = last_change is not None and now - last_change < self._min_cycle_time
+        if demand is not None and too_soon and not cycle_elapsed:
+            if entity_id not in self._timers:
+                self._timers[entity_id] = async_call_later(
+                    self._hass, last_change + self._min_cycle_time - now, partial(self._async_on_timer, entity_id)
+                )
+            return False
+
+        self._cancel_timer(entity_id)
+        self._demand[entity_id] = desired
+        if demand is not None:
+            self._last_change[entity_id] = now
+            _LOGGER.debug("%s: %s at %s", entity_id, "Running" if desired else "Idle", current)
+        return demand is not None
+
+    @callback
+    def _async_on_timer(self, entity_id: str, _now: datetime) -> None:
+        self._timers.pop(entity_id, None)
+        self._async_reevaluate(entity_id, cycle_elapsed=True)
+
+    def _cancel_timer(self, entity_id: str) -> None:
+        cancel = self._timers.pop(entity_id, None)
+        if cancel is not None:
+            cancel()
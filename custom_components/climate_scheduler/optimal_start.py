@@ -0,0 +1,246 @@
+"""Optimal start model for Climate Scheduler."""
+
+import logging
+from collections import deque
+from collections.abc import Callable
+from datetime import timedelta
+
+from homeassistant.components.climate import (
+    ATTR_CURRENT_TEMPERATURE,
+    ATTR_HVAC_ACTION,
+    ATTR_TARGET_TEMP_HIGH,
+    ATTR_TARGET_TEMP_LOW,
+    HVACAction,
+    HVACMode,
+)
+from homeassistant.const import ATTR_TEMPERATURE
+from homeassistant.core import Event, HomeAssistant, State, callback
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.util import dt as dt_util
+
+from .common import ComputedClimateData
+from .const import (
+    OPTIMAL_START_HISTORY,
+    OPTIMAL_START_MAX_SAMPLE_INTERVAL,
+    OPTIMAL_START_MAX_SAMPLES,
+    OPTIMAL_START_MIN_SAMPLE_INTERVAL,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _as_float(value) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _hvac_phase(state: State, current: float) -> HVACAction | None:
+    """Return whether the entity is actively heating or cooling."""
+    action = state.attributes.get(ATTR_HVAC_ACTION)
+    if action is not None:
+        return action if action in (HVACAction.HEATING, HVACAction.COOLING) else None
+
+    # Entities without hvac_action: infer from the mode and the target
+    low = _as_float(state.attributes.get(ATTR_TARGET_TEMP_LOW, state.attributes.get(ATTR_TEMPERATURE)))
+    high = _as_float(state.attributes.get(ATTR_TARGET_TEMP_HIGH, state.attributes.get(ATTR_TEMPERATURE)))
+    if state.state in (HVACMode.HEAT, HVACMode.HEAT_COOL) and low is not None and current < low:
+        return HVACAction.HEATING
+    if state.state in (HVACMode.COOL, HVACMode.HEAT_COOL) and high is not None and current > high:
+        return HVACAction.COOLING
+    return None
+
+
+class _RateWindow:
+    """Running mean over a bounded window of rates."""
+
+    __slots__ = ("_rates", "_total")
+
+    def __init__(self, size: int) -> None:
+        self._rates: deque[float] = deque(maxlen=size)
+        self._total = 0.0
+
+    def __len__(self) -> int:
+        return len(self._rates)
+
+    def add(self, rate: float) -> None:
+        if len(self._rates) == self._rates.maxlen:
+            self._total -= self._rates[0]
+        self._rates.append(rate)
+        self._total += rate
+
+    @property
+    def mean(self) -> float | None:
+        if not self._rates:
+            return None
+        return self._total / len(self._rates)
+
+
+class ThermalRateEstimator:
+    """Heating and cooling rate estimate of a single climate entity, in degrees per hour."""
+
+    def __init__(self, max_samples: int = OPTIMAL_START_MAX_SAMPLES) -> None:
+        """Initialize the estimator."""
+        self._heating = _RateWindow(max_samples)
+        self._cooling = _RateWindow(max_samples)
+        self._anchor: tuple | None = None
+
+    @property
+    def heating_rate(self) -> float | None:
+        """Return the mean heating rate."""
+        return self._heating.mean
+
+    @property
+    def cooling_rate(self) -> float | None:
+        """Return the mean cooling rate."""
+        return self._cooling.mean
+
+    def observe(self, state: State) -> bool:
+        """Update the estimate with a new state of the climate entity, return whether a rate was sampled."""
+        current = _as_float(state.attributes.get(ATTR_CURRENT_TEMPERATURE))
+        if current is None:
+            self._anchor = None
+            return False
+
+        phase = _hvac_phase(state, current)
+        if phase is None:
+            self._anchor = None
+            return False
+
+        when = state.last_updated
+        if self._anchor is None or self._anchor[2] != phase:
+            self._anchor = (when, current, phase)
+            return False
+
+        elapsed = when - self._anchor[0]
+        if elapsed < OPTIMAL_START_MIN_SAMPLE_INTERVAL:
+            # Keep the older anchor so slow changes still add up to a measurable rate
+            return False
+
+        sampled = False
+        if elapsed <= OPTIMAL_START_MAX_SAMPLE_INTERVAL:
+            rate = (current - self._anchor[1]) / (elapsed.total_seconds() / 3600)
+            if phase == HVACAction.HEATING and rate > 0:
+                self._heating.add(rate)
+                sampled = True
+            elif phase == HVACAction.COOLING and rate < 0:
+                self._cooling.add(-rate)
+                sampled = True
+
+        self._anchor = (when, current, phase)
+        return sampled
+
+    def lead_time(self, current: float, target: float) -> timedelta | None:
+        """Predict how long it takes to bring the temperature from current to target."""
+        if target == current:
+            return timedelta()
+
+        rate = self.heating_rate if target > current else self.cooling_rate
+        if not rate:
+            return None
+        return timedelta(hours=abs(target - current) / rate)
+
+    def as_dict(self) -> dict:
+        """Return the estimate as state attributes."""
+        return {
+            "heating_rate": None if self.heating_rate is None else round(self.heating_rate, 2),
+            "cooling_rate": None if self.cooling_rate is None else round(self.cooling_rate, 2),
+            "samples": len(self._heating) + len(self._cooling),
+        }
+
+
+class OptimalStartModel:
+    """Rate estimates of all climate entities controlled by a scheduler."""
+
+    def __init__(
+        self, hass: HomeAssistant, entity_ids: list[str], max_lead: timedelta, on_change: Callable[[], None]
+    ) -> None:
+        """Initialize the model, on_change is called whenever the estimates change."""
+        self._hass = hass
+        self._max_lead = max_lead
+        self._on_change = on_change
+        self._estimators: dict[str, ThermalRateEstimator] = {e: ThermalRateEstimator() for e in entity_ids}
+        self._remove_tracker: Callable[[], None] | None = None
+
+    async def async_start(self) -> None:
+        """Seed the estimates from recorder history and follow state changes from then on."""
+        await self._async_load_history()
+        self._on_change()
+        self._remove_tracker = async_track_state_change_event(
+            self._hass, list(self._estimators), self._async_on_state_change
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop following state changes."""
+        if self._remove_tracker is not None:
+            self._remove_tracker()
+            self._remove_tracker = None
+
+    async def _async_load_history(self) -> None:
+        if "recorder" not in self._hass.config.components:
+            return
+
+        from homeassistant.components.recorder import get_instance, history
+
+        start_time = dt_util.utcnow() - OPTIMAL_START_HISTORY
+        for entity_id, estimator in self._estimators.items():
+            try:
+                states = await get_instance(self._hass).async_add_executor_job(
+                    history.state_changes_during_period, self._hass, start_time, None, entity_id
+                )
+            except Exception:  # noqa: BLE001
+                _LOGGER.warning("Unable to load history of %s for optimal start", entity_id)
+                continue
+
+            for state in states.get(entity_id, []):
+                estimator.observe(state)
+
+    @callback
+    def _async_on_state_change(self, event: Event) -> None:
+        new_state = event.data.get("new_state")
+        if new_state is None:
+            return
+        if self._estimators[new_state.entity_id].observe(new_state):
+            self._on_change()
+
+    @property
+    def heating_rate(self) -> float | None:
+        """Return the heating rate of the slowest entity with an estimate."""
+        rates = [e.heating_rate for e in self._estimators.values() if e.heating_rate]
+        return min(rates) if rates else None
+
+    def lead_time(self, data: ComputedClimateData) -> timedelta:
+        """Return how early the given climate must be applied to be reached in time by every entity."""
+        lead = timedelta()
+        for entity_id, estimator in self._estimators.items():
+            state = self._hass.states.get(entity_id)
+            current = None if state is None else _as_float(state.attributes.get(ATTR_CURRENT_TEMPERATURE))
+            target = _optimal_start_target(data, current)
+            if current is None or target is None:
+                continue
+
+            entity_lead = estimator.lead_time(current, target)
+            if entity_lead is not None:
+                lead = max(lead, entity_lead)
+
+        return min(lead, self._max_lead)
+
+    def as_dict(self) -> dict:
+        """Return the estimates of every entity as state attributes."""
+        return {entity_id: estimator.as_dict() for entity_id, estimator in self._estimators.items()}
+
+
+def _optimal_start_target(data: ComputedClimateData, current: float | None) -> float | None:
+    """Return the temperature an entity has to reach for the climate, if it has to move at all."""
+    if current is None:
+        return None
+
+    if data.hvac_mode in (HVACMode.HEAT, HVACMode.HEAT_COOL) and data.min_temp is not None:
+        if current < data.min_temp:
+            return data.min_temp
+    if data.hvac_mode in (HVACMode.COOL, HVACMode.HEAT_COOL) and data.max_temp is not None:
+        if current > data.max_temp:
+            return data.max_temp
+    return None
@@ -0,0 +1,134 @@
+"""Window and occupancy pause inputs for Climate Scheduler."""
+
+import logging
+from collections.abc import Awaitable, Callable
+from datetime import timedelta
+
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later, async_track_state_change_event
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _DebouncedCondition:
+    """Condition which only becomes active once it has held for a delay.
+
+    Becoming inactive is immediate, so that a switch resumes as soon as possible.
+    """
+
+    def __init__(self, hass: HomeAssistant, delay: timedelta, on_change: Callable[[], None]) -> None:
+        self._hass = hass
+        self._delay = delay
+        self._on_change = on_change
+        self.active = False
+        self._target = False
+        self._cancel_timer: Callable[[], None] | None = None
+
+    def update(self, active: bool) -> None:
+        if active == self._target:
+            return
+
+        self._target = active
+        self.cancel()
+        if active == self.active:
+            return
+
+        if active and self._delay:
+            self._cancel_timer = async_call_later(self._hass, self._delay, self._async_on_timer)
+        else:
+            self._apply()
+
+    @callback
+    def cancel(self) -> None:
+        if self._cancel_timer is not None:
+            self._cancel_timer()
+            self._cancel_timer = None
+
+    @callback
+    def _async_on_timer(self, _now) -> None:
+        self._cancel_timer = None
+        self._apply()
+
+    def _apply(self) -> None:
+        self.active = self._target
+        self._on_change()
+
+
+class PauseMonitor:
+    """Pauses a scheduler while a window is open or rooms have been vacant for a while."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        window_sensors: list[str],
+        window_delay: timedelta,
+        occupancy_sensors: list[str],
+        occupancy_timeout: timedelta,
+        on_change: Callable[[], Awaitable[None]],
+    ) -> None:
+        """Initialize the monitor."""
+        self._hass = hass
+        self._window_sensors = window_sensors
+        self._occupancy_sensors = occupancy_sensors
+        self._on_change = on_change
+        self._paused = False
+
+        self._window_open = _DebouncedCondition(hass, window_delay, self._async_evaluate)
+        self._vacant = _DebouncedCondition(hass, occupancy_timeout, self._async_evaluate)
+        self._remove_tracker: Callable[[], None] | None = None
+
+    @property
+    def paused(self) -> bool:
+        """Return whether the scheduler is paused."""
+        return self._paused
+
+    @property
+    def window_open(self) -> bool:
+        """Return whether a window has been open for long enough to pause."""
+        return self._window_open.active
+
+    @property
+    def vacant(self) -> bool:
+        """Return whether the rooms have been vacant for long enough to pause."""
+        return self._vacant.active
+
+    @callback
+    def async_start(self) -> None:
+        """Follow the sensors, starting from their current states."""
+        self._remove_tracker = async_track_state_change_event(
+            self._hass, self._window_sensors + self._occupancy_sensors, self._async_on_state_change
+        )
+        self._async_update_conditions()
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop following the sensors."""
+        if self._remove_tracker is not None:
+            self._remove_tracker()
+            self._remove_tracker = None
+        self._window_open.cancel()
+        self._vacant.cancel()
+
+    @callback
+    def _async_on_state_change(self, event: Event) -> None:
+        self._async_update_conditions()
+
+    @callback
+    def _async_update_conditions(self) -> None:
+        states = self._hass.states
+        self._window_open.update(any(states.is_state(e, STATE_ON) for e in self._window_sensors))
+        # Unknown or unavailable occupancy sensors never count as vacant
+        self._vacant.update(
+            bool(self._occupancy_sensors) and all(states.is_state(e, STATE_OFF) for e in self._occupancy_sensors)
+        )
+
+    @callback
+    def _async_evaluate(self) -> None:
+        paused = self._window_open.active or self._vacant.active
+        if paused == self._paused:
+            return
+
+        self._paused = paused
+        _LOGGER.debug("Pause changed to %s (window open: %s, vacant: %s)", paused, self.window_open, self.vacant)
+        self._hass.async_create_task(self._on_change())
@@ -1,44 +1,112 @@
 """Profile class for Climate Scheduler."""
 
-from datetime import timedelta
+import hashlib
+import json
+import logging
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable, Sequence
+from datetime import UTC, date, datetime, timedelta, tzinfo
+from itertools import repeat
 
 import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
-from homeassistant.components.climate import HVAC_MODES
+from homeassistant.components.climate import HVAC_MODES, HVACMode
 
-from .common import ComputedClimateData
+from .common import ComputedClimateData, SunRelativeTime
 from .const import (
+    ATTR_VERSION,
+    CONF_PROFILE_COST_OPTIMIZATION,
     CONF_PROFILE_DEFAULT_FAN_MODE,
     CONF_PROFILE_DEFAULT_HVAC_MODE,
     CONF_PROFILE_DEFAULT_MAX_TEMP,
     CONF_PROFILE_DEFAULT_MIN_TEMP,
     CONF_PROFILE_DEFAULT_SWING_MODE,
+    CONF_PROFILE_EXTENDS,
     CONF_PROFILE_ID,
+    CONF_PROFILE_IDLE_FAN_MODE,
+    CONF_PROFILE_IDLE_HVAC_MODE,
     CONF_PROFILE_SCHEDULE,
 )
-from .schedule import SCHEDULE_SCHEMA, ClimateSchedulerSchedule
-from .validation import unique_schedule_times
-
-PROFILES_SCHEMA = vol.Schema(
-    [
-        {
-            vol.Required(CONF_PROFILE_ID): vol.All(cv.string),
-            vol.Optional(CONF_PROFILE_SCHEDULE, default=[]): vol.All(SCHEDULE_SCHEMA, unique_schedule_times),
-            vol.Optional(CONF_PROFILE_DEFAULT_HVAC_MODE): vol.All(cv.string, vol.In(HVAC_MODES)),
-            vol.Optional(CONF_PROFILE_DEFAULT_FAN_MODE): cv.string,
-            vol.Optional(CONF_PROFILE_DEFAULT_SWING_MODE): cv.string,
-            vol.Optional(CONF_PROFILE_DEFAULT_MIN_TEMP): vol.Coerce(float),
-            vol.Optional(CONF_PROFILE_DEFAULT_MAX_TEMP): vol.Coerce(float),
-        }
-    ]
-)
+from .schedule import ClimateSchedulerSchedule
+from .validation import lazy_schemas, unique_schedule_times
+
+_LOGGER = logging.getLogger(__name__)
+
+SECONDS_PER_DAY = 24 * 60 * 60
+SECONDS_PER_WEEK = 7 * SECONDS_PER_DAY
+# Daily plans cached per profile, the status of a switch looks at today and tomorrow in turn
+PLAN_CACHE_SIZE = 2
+
+
+def _profiles_schema() -> vol.Schema:
+    from .schedule import SCHEDULE_SCHEMA
+    from .tariff import COST_OPTIMIZATION_SCHEMA
+
+    return vol.Schema(
+        [
+            {
+                vol.Required(CONF_PROFILE_ID): vol.All(cv.string),
+                vol.Optional(CONF_PROFILE_EXTENDS): cv.string,
+                vol.Optional(CONF_PROFILE_SCHEDULE, default=[]): vol.All(SCHEDULE_SCHEMA, unique_schedule_times),
+                vol.Optional(CONF_PROFILE_DEFAULT_HVAC_MODE): vol.All(cv.string, vol.In(HVAC_MODES)),
+                vol.Optional(CONF_PROFILE_DEFAULT_FAN_MODE): cv.string,
+                vol.Optional(CONF_PROFILE_DEFAULT_SWING_MODE): cv.string,
+                vol.Optional(CONF_PROFILE_DEFAULT_MIN_TEMP): vol.Coerce(float),
+                vol.Optional(CONF_PROFILE_DEFAULT_MAX_TEMP): vol.Coerce(float),
+                vol.Optional(CONF_PROFILE_IDLE_HVAC_MODE): vol.All(cv.string, vol.In(HVAC_MODES)),
+                vol.Optional(CONF_PROFILE_IDLE_FAN_MODE): cv.string,
+                vol.Optional(CONF_PROFILE_COST_OPTIMIZATION): COST_OPTIMIZATION_SCHEMA,
+            }
+        ]
+    )
+
+
+__getattr__ = lazy_schemas(globals(), PROFILES_SCHEMA=_profiles_schema)
+
+
+def local_time_to_utc(day: date, time: timedelta, time_zone: tzinfo) -> datetime:
+    """Return the UTC time of a time relative to the start of a local day.
+
+    Local times skipped by a daylight saving time change happen when the clock jumps over them
+    and local times repeated by a change only happen the first time.
+    """
+    local = datetime.combine(day, datetime.min.time()) + time
+    first = local.replace(tzinfo=time_zone).astimezone(UTC)
+    second = local.replace(tzinfo=time_zone, fold=1).astimezone(UTC)
+    if first <= second:
+        return first
+
+    # Skipped local time, search the instant the clock jumped over it
+    low, high = int(second.timestamp()), int(first.timestamp())
+    while high - low > 1:
+        middle = (low + high) // 2
+        if datetime.fromtimestamp(middle, time_zone).replace(tzinfo=None) >= local:
+            high = middle
+        else:
+            low = middle
+    return datetime.fromtimestamp(high, UTC)
+
+
+def _schedule_key(config: dict) -> tuple:
+    """Return a hashable key identifying the settings of a schedule entry."""
+    return tuple(sorted((k, tuple(v) if isinstance(v, list) else v) for k, v in config.items()))
+
+
+def content_version(content) -> str:
+    """Return a short hash identifying JSON serializable content."""
+    encoded = json.dumps(content, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.sha1(encoded).hexdigest()[:12]
 
 
 class ClimateSchedulerProfile:
     """Representation of a profile."""
 
-    def __init__(self, config: dict) -> None:
-        """Initialize the profile."""
+    def __init__(self, config: dict, schedule_cache: dict | None = None) -> None:
+        """Initialize the profile.
+
+        Profiles sharing a schedule cache share identical schedule entries instead of each storing
+        their own copy.
+        """
         self._id: str = config.get(CONF_PROFILE_ID)
 
         self._default_hvac_mode = config.get(CONF_PROFILE_DEFAULT_HVAC_MODE)
@@ -46,59 +114,377 @@ class ClimateSchedulerProfile:
         self._default_swing_mode = config.get(CONF_PROFILE_DEFAULT_SWING_MODE)
         self._default_min_temp = config.get(CONF_PROFILE_DEFAULT_MIN_TEMP)
         self._default_max_temp = config.get(CONF_PROFILE_DEFAULT_MAX_TEMP)
+        self._default_climate = ComputedClimateData(
+            self._default_hvac_mode,
+            self._default_fan_mode,
+            self._default_swing_mode,
+            self._default_min_temp,
+            self._default_max_temp,
+        )
+        # Settings of rooms idled by band control or a pause
+        self._idle_climate = ComputedClimateData(
+            config.get(CONF_PROFILE_IDLE_HVAC_MODE, HVACMode.OFF),
+            config.get(CONF_PROFILE_IDLE_FAN_MODE),
+            None,
+            None,
+            None,
+        )
 
-        self._schedules = [ClimateSchedulerSchedule(c) for c in config.get(CONF_PROFILE_SCHEDULE)]
-        self._schedules.sort(key=lambda x: x.time.total_seconds())
+        self._cost_optimization: dict | None = config.get(CONF_PROFILE_COST_OPTIMIZATION)
+        # Optimized setpoints by local date, as segment start times in seconds and setpoints. A None
+        # setpoint leaves the regular schedule in place.
+        self._optimized: dict[date, tuple[list[int], list[float | None]]] = {}
+        self._optimized_climates: dict[tuple[ComputedClimateData, float], ComputedClimateData] = {}
+
+        schedule_cache = {} if schedule_cache is None else schedule_cache
+        schedules = []
+        for schedule_config in config.get(CONF_PROFILE_SCHEDULE):
+            key = _schedule_key(schedule_config)
+            schedule = schedule_cache.get(key)
+            if schedule is None:
+                schedule = schedule_cache[key] = ClimateSchedulerSchedule.from_config(schedule_config)
+            schedules.append(schedule)
+
+        # Sun relative schedules only take part once resolved for the current day
+        self._sun_schedules = [s for s in schedules if s.sun_time is not None]
+        self._schedules = [s for s in schedules if s.sun_time is None]
+        # Entries already reported as having no effect, so that recompiling doesn't repeat warnings.
+        # Sun relative entries are resolved again every day, they are kept as configured.
+        self._reported_no_ops: set[ClimateSchedulerSchedule] = set()
+        self._compile()
 
     @property
     def profile_id(self) -> str:
         """Return the profile ID."""
         return self._id
 
-    def compute_climate(self, time_of_day: timedelta) -> ComputedClimateData:
-        """Compute the climate settings for a specific time of day."""
-        schedule = self._find_schedule(time_of_day)
-        if schedule is None:
-            return ComputedClimateData(
-                self._default_hvac_mode,
-                self._default_fan_mode,
-                self._default_swing_mode,
-                self._default_min_temp,
-                self._default_max_temp,
-            )
+    @property
+    def idle_climate(self) -> ComputedClimateData:
+        """Return the climate settings of idle rooms."""
+        return self._idle_climate
 
-        return ComputedClimateData(
-            schedule.hvac_mode if schedule.hvac_mode else self._default_hvac_mode,
-            schedule.fan_mode if schedule.fan_mode else self._default_fan_mode,
-            schedule.swing_mode if schedule.swing_mode else self._default_swing_mode,
-            schedule.min_temp if schedule.min_temp else self._default_min_temp,
-            schedule.max_temp if schedule.max_temp else self._default_max_temp,
-        )
+    @property
+    def cost_optimization(self) -> dict | None:
+        """Return the cost optimization settings, if the profile is optimized for a tariff."""
+        return self._cost_optimization
 
-    def get_trigger_times(self) -> list[timedelta]:
-        """Return a list of times when the schedule changes."""
-        return [s.time for s in self._schedules]
+    @property
+    def has_sun_times(self) -> bool:
+        """Return whether some schedules are relative to sunrise or sunset."""
+        return len(self._sun_schedules) > 0
+
+    def resolve_sun_times(self, resolver: Callable[[SunRelativeTime], timedelta | None]) -> None:
+        """Resolve sun relative schedules to times of day and recompile the schedule.
+
+        Schedules whose time cannot be resolved, such as a sunset during polar day, are skipped.
+        """
+        resolved = []
+        for schedule in self._sun_schedules:
+            time = resolver(schedule.sun_time)
+            if time is not None:
+                resolved.append(schedule.resolve(time))
+
+        self._schedules = [s for s in self._schedules if s.sun_time is None] + resolved
+        self._compile()
+
+    def compute_climate(
+        self, time_of_day: timedelta, day: date | None = None, optimized: bool = True
+    ) -> ComputedClimateData:
+        """Compute the climate settings for a specific time of day.
+
+        Without a day, exception dates and optimized setpoints are ignored and schedules limited to
+        some days of the week are resolved as if it was a Monday.
+        """
+        seconds = int(time_of_day.total_seconds())
+        schedule = self._find_schedule(seconds, day)
+        climate = self._default_climate if schedule is None else self._climates[schedule]
+
+        segments = self._optimized.get(day) if optimized and day is not None else None
+        if segments is not None and climate.hvac_mode in (HVACMode.HEAT, HVACMode.HEAT_COOL):
+            index = bisect_right(segments[0], seconds) - 1
+            setpoint = segments[1][index] if index >= 0 else None
+            if setpoint is not None:
+                key = (climate, setpoint)
+                optimized_climate = self._optimized_climates.get(key)
+                if optimized_climate is None:
+                    optimized_climate = self._optimized_climates[key] = climate._replace(min_temp=setpoint)
+                return optimized_climate
+
+        return climate
+
+    def compute_climates(
+        self, seconds: Sequence[int], day: date | None = None, optimized: bool = True
+    ) -> list[ComputedClimateData]:
+        """Compute the climate settings for many times of the same day, in seconds since midnight.
+
+        Times must be sorted. The result matches calling compute_climate for each time, but the
+        climate is only computed once per segment of the day and repeated for the times within it.
+        """
+        starts = self.get_segment_starts(day, optimized)
+        indexes = [bisect_left(seconds, start) for start in starts] + [len(seconds)]
+        climates: list[ComputedClimateData] = []
+        for start, first, last in zip(starts, indexes, indexes[1:]):
+            if last > first:
+                climate = self.compute_climate(timedelta(seconds=start), day, optimized)
+                climates.extend(repeat(climate, last - first))
+        return climates
+
+    def get_segment_starts(self, day: date | None = None, optimized: bool = True) -> list[int]:
+        """Return the start times of the compiled segments of a day, in seconds since midnight.
 
-    def _find_schedule(self, time_of_day: timedelta) -> ClimateSchedulerSchedule | None:
-        if len(self._schedules) == 0:
+        Midnight always starts a segment. Regular segments overridden by an exception date are
+        still included, the climate may be the same on both sides of some of the times.
+        """
+        offset = (0 if day is None else day.weekday()) * SECONDS_PER_DAY
+        starts = {0}
+        starts.update(s - offset for s in self._week_starts if offset <= s < offset + SECONDS_PER_DAY)
+        if day is not None:
+            if day in self._overrides:
+                starts.update(self._overrides[day][0])
+            if optimized and day in self._optimized:
+                starts.update(self._optimized[day][0])
+        return sorted(starts)
+
+    def set_optimized_setpoints(self, segments: list[tuple[datetime, float | None]]) -> None:
+        """Replace the heating temperature of the schedule with setpoints starting at local times.
+
+        Each setpoint applies until the start of the next one, a None setpoint ends the replacement.
+        """
+        optimized: dict[date, tuple[list[int], list[float | None]]] = {}
+        for start, setpoint in segments:
+            times, setpoints = optimized.setdefault(start.date(), ([], []))
+            times.append(start.hour * 3600 + start.minute * 60 + start.second)
+            setpoints.append(setpoint)
+
+        # Segments running past midnight carry on at the start of the next day
+        previous = None
+        for day in sorted(optimized):
+            times, setpoints = optimized[day]
+            if previous is not None and times[0] > 0:
+                times.insert(0, 0)
+                setpoints.insert(0, previous)
+            previous = setpoints[-1]
+
+        self._optimized = optimized
+        self._optimized_climates.clear()
+        self._plans.clear()
+        self._timeline = None
+
+    def get_segment(self, time_of_day: timedelta, day: date | None = None) -> timedelta | None:
+        """Return the start time of the schedule in effect at a time of day, None for the defaults."""
+        schedule = self._find_schedule(int(time_of_day.total_seconds()), day)
+        return None if schedule is None else schedule.time
+
+    def get_next_transition(
+        self, time_of_day: timedelta, day: date | None = None
+    ) -> tuple[timedelta, ComputedClimateData] | None:
+        """Return the time and climate settings of the next schedule change after a time of day.
+
+        The time is relative to the start of the day and may be more than a day away.
+        """
+        seconds = int(time_of_day.total_seconds())
+
+        override = None if day is None else self._overrides.get(day)
+        if override is not None and seconds >= override[0][0]:
+            # The exception applies until the end of the day, then the regular schedule resumes
+            index = bisect_right(override[0], seconds)
+            if index == len(override[0]):
+                return timedelta(days=1), self.compute_climate(timedelta(), day + timedelta(days=1))
+            return timedelta(seconds=override[0][index]), self._climates[override[1][index]]
+
+        candidates: list[tuple[int, ClimateSchedulerSchedule]] = []
+
+        if len(self._week_starts) > 1:
+            position = (0 if day is None else day.weekday()) * SECONDS_PER_DAY + seconds
+            index = bisect_right(self._week_starts, position) % len(self._week_starts)
+            delay = (self._week_starts[index] - position) % SECONDS_PER_WEEK
+            candidates.append((seconds + delay, self._week_schedules[index]))
+
+        if day is not None:
+            # Regular changes falling on a later exception date are only reached if they happen
+            # before the first entry of that date, which is also a candidate here.
+            index = bisect_left(self._override_dates, day)
+            if index < len(self._override_dates):
+                next_date = self._override_dates[index]
+                times, schedules = self._overrides[next_date]
+                candidates.append(((next_date - day).days * SECONDS_PER_DAY + times[0], schedules[0]))
+
+        if not candidates:
             return None
 
-        if len(self._schedules) == 1:
-            return self._schedules[0]
+        # On a tie the exception date comes last and takes precedence, as it does in _find_schedule
+        start, schedule = min(reversed(candidates), key=lambda x: x[0])
+        return timedelta(seconds=start), self._climates[schedule]
+
+    def get_daily_plan(self, day: date, time_zone: tzinfo) -> list[datetime]:
+        """Return the UTC times of the schedule changes of a local day.
+
+        The plans of the two days planned last, usually today and tomorrow, are cached until the
+        schedule changes.
+        """
+        plan = self._plans.get((day, time_zone))
+        if plan is not None:
+            return plan
+
+        # Only the changes of the weekday, until the first entry of an exception date which then
+        # replaces them. Exception dates end at midnight, when the regular schedule resumes.
+        seconds = set()
+        if len(self._week_starts) > 1:
+            offset = day.weekday() * SECONDS_PER_DAY
+            seconds.update(s - offset for s in self._week_starts if offset <= s < offset + SECONDS_PER_DAY)
+        override = self._overrides.get(day)
+        if override is not None:
+            seconds = {s for s in seconds if s < override[0][0]}
+            seconds.update(override[0])
+        if override is not None or day - timedelta(days=1) in self._overrides:
+            seconds.add(0)
+        if day in self._optimized:
+            seconds.update(self._optimized[day][0])
+        plan = sorted({local_time_to_utc(day, timedelta(seconds=s), time_zone) for s in seconds})
+        if len(self._plans) == PLAN_CACHE_SIZE:
+            del self._plans[next(iter(self._plans))]
+        self._plans[(day, time_zone)] = plan
+        return plan
 
-        # If the current time is earlier than the first schedule, wrap around and
-        # return the last schedule of the day
-        if time_of_day < self._schedules[0].time:
-            return self._schedules[-1]
+    def get_timeline(self) -> dict:
+        """Return the compiled schedule in a compact form, with a version identifying its content.
 
-        for index, schedule in enumerate(self._schedules):
-            # Search for a schedule starting earlier than the current time of day
-            # which appears right before a schedule which starts later than the
-            # current time of the day or which is the last schedule of the day.
+        Distinct climate settings are listed once as [hvac_mode, fan_mode, swing_mode, min_temp,
+        max_temp] and segments refer to them by index. Week segments start in seconds since Monday
+        00:00, exception dates and optimized setpoints in seconds since midnight.
+        """
+        if self._timeline is not None:
+            return self._timeline
+
+        climates: dict[ComputedClimateData, int] = {}
+
+        def _index(climate: ComputedClimateData) -> int:
+            return climates.setdefault(climate, len(climates))
+
+        default = _index(self._default_climate)
+        week = [[start, _index(self._climates[s])] for start, s in zip(self._week_starts, self._week_schedules)]
+        dates = {
+            day.isoformat(): [[t, _index(self._climates[s])] for t, s in zip(*self._overrides[day])]
+            for day in self._override_dates
+        }
+        optimized = {day.isoformat(): [list(s) for s in zip(*self._optimized[day])] for day in sorted(self._optimized)}
+        timeline = {
+            "profile": self._id,
+            "climates": [list(c) for c in climates],
+            "default": default,
+            "week": week,
+            "dates": dates,
+            "optimized": optimized,
+        }
+        timeline[ATTR_VERSION] = content_version(timeline)
 
-            next_schedule = None
-            if index < len(self._schedules) - 1:
-                next_schedule = self._schedules[index + 1]
+        self._timeline = timeline
+        return timeline
+
+    def get_trigger_times(self) -> list[timedelta]:
+        """Return a list of times of day when the schedule changes."""
+        return list(self._trigger_times)
+
+    def _compile(self) -> None:
+        """Compile schedules into the week-long segment table and the exception date index.
+
+        The week table holds segment start times in seconds since Monday 00:00. Adjacent segments
+        with identical climate settings are merged, so that only actual changes remain.
+        """
+        self._schedules.sort(key=lambda x: x.time.total_seconds())
+        self._plans: dict[tuple[date, tzinfo], list[datetime]] = {}
+        self._timeline: dict | None = None
+
+        segments: list[tuple[int, ClimateSchedulerSchedule]] = []
+        overrides: dict[date, list[tuple[int, ClimateSchedulerSchedule]]] = {}
+        for schedule in self._schedules:
+            seconds = int(schedule.time.total_seconds())
+            if schedule.dates is not None:
+                for day in schedule.dates:
+                    overrides.setdefault(day, []).append((seconds, schedule))
+                continue
+
+            weekdays = schedule.days if schedule.days is not None else range(7)
+            segments.extend((weekday * SECONDS_PER_DAY + seconds, schedule) for weekday in weekdays)
+
+        # Climate settings are computed once per schedule and identical settings share one instance
+        interned = {self._default_climate: self._default_climate}
+        self._climates: dict[ClimateSchedulerSchedule, ComputedClimateData] = {}
+        for schedule in self._schedules:
+            climate = self._compute_schedule_climate(schedule)
+            self._climates[schedule] = interned.setdefault(climate, climate)
+
+        # Segments keeping the settings of the previous one, such as an every day schedule following
+        # itself or an entry only relying on defaults after another one, are merged into it. The
+        # week wraps around, so the first segment also follows the last one.
+        self._week_starts: list[int] = []
+        self._week_schedules: list[ClimateSchedulerSchedule] = []
+        for start, schedule in sorted(segments, key=lambda x: x[0]):
+            if self._week_schedules and self._climates[self._week_schedules[-1]] is self._climates[schedule]:
+                continue
+            self._week_starts.append(start)
+            self._week_schedules.append(schedule)
+        week = self._week_schedules
+        if len(week) > 1 and self._climates[week[0]] is self._climates[week[-1]]:
+            del self._week_starts[0]
+            del self._week_schedules[0]
+
+        # Schedules were sorted by time, so entries of each date already are. The first entry of a
+        # date is always kept, the regular schedule applies before it.
+        self._override_dates: list[date] = sorted(overrides)
+        self._overrides: dict[date, tuple[list[int], list[ClimateSchedulerSchedule]]] = {}
+        for day in self._override_dates:
+            times, schedules = self._overrides[day] = ([], [])
+            for seconds, schedule in overrides[day]:
+                if schedules and self._climates[schedules[-1]] is self._climates[schedule]:
+                    continue
+                times.append(seconds)
+                schedules.append(schedule)
+
+        # A profile with a single segment never changes, otherwise its segments start at actual changes
+        trigger_times = set()
+        if len(self._week_starts) > 1:
+            trigger_times.update(timedelta(seconds=start % SECONDS_PER_DAY) for start in self._week_starts)
+        for times, _ in self._overrides.values():
+            trigger_times.update(timedelta(seconds=seconds) for seconds in times)
+        if self._overrides:
+            # Exception dates end at midnight
+            trigger_times.add(timedelta())
+        self._trigger_times: list[timedelta] = sorted(trigger_times)
+
+        effective = set(self._week_schedules)
+        for _, schedules in self._overrides.values():
+            effective.update(schedules)
+        for schedule in self._schedules:
+            if schedule in effective or schedule.unresolved in self._reported_no_ops:
+                continue
+            self._reported_no_ops.add(schedule.unresolved)
+            _LOGGER.warning(
+                "Profile %s: the schedule entry at %s has no effect, it keeps the settings of the previous entry",
+                self._id,
+                schedule.time,
+            )
+
+    def _compute_schedule_climate(self, schedule: ClimateSchedulerSchedule) -> ComputedClimateData:
+        # A 0.0 setpoint is a valid value, only unset settings fall back to the defaults
+        return ComputedClimateData(
+            schedule.hvac_mode if schedule.hvac_mode is not None else self._default_hvac_mode,
+            schedule.fan_mode if schedule.fan_mode is not None else self._default_fan_mode,
+            schedule.swing_mode if schedule.swing_mode is not None else self._default_swing_mode,
+            schedule.min_temp if schedule.min_temp is not None else self._default_min_temp,
+            schedule.max_temp if schedule.max_temp is not None else self._default_max_temp,
+        )
+
+    def _find_schedule(self, seconds: int, day: date | None) -> ClimateSchedulerSchedule | None:
+        if day is not None:
+            override = self._overrides.get(day)
+            if override is not None and seconds >= override[0][0]:
+                return override[1][bisect_right(override[0], seconds) - 1]
+
+        if len(self._week_schedules) == 0:
+            return None
 
-            if time_of_day >= schedule.time and (next_schedule is None or time_of_day < next_schedule.time):
-                return schedule
+        # If the current time is earlier than the first segment of the week, the index
+        # is -1 which wraps around to the last segment of the week
+        position = (0 if day is None else day.weekday()) * SECONDS_PER_DAY + seconds
+        return self._week_schedules[bisect_right(self._week_starts, position) - 1]
@@ -0,0 +1,129 @@
+"""On demand profiling of Climate Scheduler updates."""
+
+import io
+import logging
+import time
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from datetime import datetime, timedelta
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .const import PROFILING_REPORT_FUNCTIONS
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class UpdateProfiler:
+    """Profiles the next updates of all switches, then writes a report and stops itself.
+
+    Synchronous stages run under cProfile and every stage is timed. Stages which await, such as
+    waiting for service calls, are only timed: profiling them would include unrelated tasks
+    running on the event loop in the meantime.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        path: str,
+        updates: int,
+        timeout: timedelta,
+        on_finish: Callable[["UpdateProfiler"], None],
+    ) -> None:
+        """Start profiling until a number of updates ran or a timeout elapsed."""
+        self._hass = hass
+        self.path = path
+        self._remaining = updates
+        self._on_finish = on_finish
+        # Only loaded once profiling is requested
+        import cProfile
+
+        self._profile = cProfile.Profile()
+        self._profiling = False
+        self._finished = False
+        self._started = dt_util.utcnow()
+        self._stages: dict[str, list[float]] = {}
+        self._updates: list[tuple[str, str, float]] = []
+        self._cancel_timeout: Callable[[], None] | None = async_call_later(hass, timeout, self._async_on_timeout)
+
+    @contextmanager
+    def stage(self, name: str, profiled: bool = True) -> Iterator[None]:
+        """Time a stage, profiling it unless it awaits or runs within another profiled stage."""
+        enable = profiled and not self._profiling
+        if enable:
+            self._profiling = True
+            self._profile.enable()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._stages.setdefault(name, []).append(time.perf_counter() - start)
+            if enable:
+                self._profile.disable()
+                self._profiling = False
+
+    @callback
+    def async_end_update(self, entity_id: str, source: str, duration: float) -> None:
+        """Record a complete update, finishing once enough updates have been profiled."""
+        self._updates.append((entity_id, source, duration))
+        self._remaining -= 1
+        if self._remaining <= 0:
+            self.async_finish()
+
+    @callback
+    def async_finish(self) -> None:
+        """Stop profiling and write the report in the background."""
+        if self._finished:
+            return
+        self._finished = True
+        if self._cancel_timeout is not None:
+            self._cancel_timeout()
+            self._cancel_timeout = None
+        self._on_finish(self)
+        self._hass.async_add_executor_job(self._write_report, dt_util.utcnow())
+
+    @callback
+    def _async_on_timeout(self, _now: datetime) -> None:
+        self._cancel_timeout = None
+        _LOGGER.debug("Profiling timed out after %s updates", len(self._updates))
+        self.async_finish()
+
+    def _write_report(self, finished: datetime) -> None:
+        lines = [
+            f"Climate Scheduler profile from {self._started.isoformat()} to {finished.isoformat()}",
+            f"{len(self._updates)} updates",
+            "",
+            f"{'stage':<12}{'calls':>8}{'total ms':>12}{'mean ms':>12}{'max ms':>12}",
+        ]
+        for name, durations in self._stages.items():
+            total = sum(durations) * 1000
+            lines.append(
+                f"{name:<12}{len(durations):>8}{total:>12.3f}{total / len(durations):>12.3f}"
+                f"{max(durations) * 1000:>12.3f}"
+            )
+
+        lines += ["", "Updates:"]
+        lines += [
+            f"  {entity_id} ({source}): {duration * 1000:.3f} ms" for entity_id, source, duration in self._updates
+        ]
+
+        import pstats
+
+        stats = io.StringIO()
+        try:
+            pstats.Stats(self._profile, stream=stats).sort_stats("cumulative").print_stats(PROFILING_REPORT_FUNCTIONS)
+        except TypeError:
+            # Nothing was profiled
+            stats.write("No profiled calls\n")
+        lines += ["", stats.getvalue()]
+
+        with open(self.path, "w", encoding="utf-8") as report:
+            report.write("\n".join(lines))
+        _LOGGER.info("Climate Scheduler profile written to %s", self.path)
+
+
+def profiling_stage(profiler: UpdateProfiler | None, name: str, profiled: bool = True) -> AbstractContextManager:
+    """Return the stage of a profiler, or a context doing nothing while not profiling."""
+    return nullcontext() if profiler is None else profiler.stage(name, profiled)
@@ -1,12 +1,20 @@
 """Schedule class for Climate Scheduler."""
 
-from datetime import timedelta
+from dataclasses import dataclass, replace
+from datetime import date, timedelta
 
 import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
 from homeassistant.components.climate import HVAC_MODES
+from homeassistant.const import WEEKDAYS
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.sun import get_astral_event_date
+from homeassistant.util import dt as dt_util
 
+from .common import SunRelativeTime
 from .const import (
+    CONF_SCHEDULE_DATES,
+    CONF_SCHEDULE_DAYS,
     CONF_SCHEDULE_FAN_MODE,
     CONF_SCHEDULE_HVAC,
     CONF_SCHEDULE_MAX_TEMP,
@@ -14,63 +22,89 @@ from .const import (
     CONF_SCHEDULE_SWING_MODE,
     CONF_SCHEDULE_TIME,
 )
-from .validation import less_than_24h
-
-SCHEDULE_SCHEMA = vol.Schema(
-    [
-        {
-            vol.Required(CONF_SCHEDULE_TIME): vol.All(
-                cv.positive_time_period,
-                less_than_24h,
-            ),
-            vol.Optional(CONF_SCHEDULE_HVAC): vol.All(cv.string, vol.In(HVAC_MODES)),
-            vol.Optional(CONF_SCHEDULE_MIN_TEMP): vol.Coerce(float),
-            vol.Optional(CONF_SCHEDULE_MAX_TEMP): vol.Coerce(float),
-            vol.Optional(CONF_SCHEDULE_FAN_MODE): cv.string,
-            vol.Optional(CONF_SCHEDULE_SWING_MODE): cv.string,
-        }
-    ]
-)
+from .validation import lazy_schemas, schedule_time
+
+
+def _schedule_schema() -> vol.Schema:
+    return vol.Schema(
+        [
+            {
+                vol.Required(CONF_SCHEDULE_TIME): schedule_time,
+                vol.Optional(CONF_SCHEDULE_HVAC): vol.All(cv.string, vol.In(HVAC_MODES)),
+                vol.Optional(CONF_SCHEDULE_MIN_TEMP): vol.Coerce(float),
+                vol.Optional(CONF_SCHEDULE_MAX_TEMP): vol.Coerce(float),
+                vol.Optional(CONF_SCHEDULE_FAN_MODE): cv.string,
+                vol.Optional(CONF_SCHEDULE_SWING_MODE): cv.string,
+                vol.Exclusive(CONF_SCHEDULE_DAYS, "day_selector"): vol.All(cv.weekdays, vol.Length(min=1)),
+                vol.Exclusive(CONF_SCHEDULE_DATES, "day_selector"): vol.All(
+                    cv.ensure_list, [cv.date], vol.Length(min=1)
+                ),
+            }
+        ]
+    )
 
 
+__getattr__ = lazy_schemas(globals(), SCHEDULE_SCHEMA=_schedule_schema)
+
+
+@dataclass(frozen=True, slots=True)
 class ClimateSchedulerSchedule:
-    """Representation of a single schedule entry."""
+    """Representation of a single schedule entry.
 
-    def __init__(self, config: dict) -> None:
-        """Initialize the schedule."""
-        self._time: timedelta = config.get(CONF_SCHEDULE_TIME)
-        self._hvac_mode: str | None = config.get(CONF_SCHEDULE_HVAC)
-        self._fan_mode: str | None = config.get(CONF_SCHEDULE_FAN_MODE)
-        self._swing_mode: str | None = config.get(CONF_SCHEDULE_SWING_MODE)
-        self._min_temp: int | None = config.get(CONF_SCHEDULE_MIN_TEMP)
-        self._max_temp: int | None = config.get(CONF_SCHEDULE_MAX_TEMP)
+    Schedules are immutable values, so identical entries can be shared between profiles.
+    """
 
-    @property
-    def time(self) -> timedelta:
-        """Return the time of the schedule."""
-        return self._time
+    # Time of day, None if relative to the sun and not resolved yet
+    time: timedelta | None
+    # Time relative to sunrise or sunset, if any
+    sun_time: SunRelativeTime | None
+    hvac_mode: str | None
+    fan_mode: str | None
+    swing_mode: str | None
+    min_temp: float | None
+    max_temp: float | None
+    # Weekdays (Monday is 0) the schedule applies to, or None for every day
+    days: frozenset[int] | None
+    # Dates the schedule replaces the regular schedule on, if it is an exception
+    dates: frozenset[date] | None
 
-    @property
-    def hvac_mode(self) -> str | None:
-        """Return the hvac mode."""
-        return self._hvac_mode
+    @classmethod
+    def from_config(cls, config: dict) -> "ClimateSchedulerSchedule":
+        """Create a schedule from a schedule entry of the configuration."""
+        time = config.get(CONF_SCHEDULE_TIME)
+        sun_time = time if isinstance(time, SunRelativeTime) else None
+        days = config.get(CONF_SCHEDULE_DAYS)
+        dates = config.get(CONF_SCHEDULE_DATES)
+        return cls(
+            # Sun relative times are unknown until resolved for a specific day
+            time=None if sun_time else time,
+            sun_time=sun_time,
+            hvac_mode=config.get(CONF_SCHEDULE_HVAC),
+            fan_mode=config.get(CONF_SCHEDULE_FAN_MODE),
+            swing_mode=config.get(CONF_SCHEDULE_SWING_MODE),
+            min_temp=config.get(CONF_SCHEDULE_MIN_TEMP),
+            max_temp=config.get(CONF_SCHEDULE_MAX_TEMP),
+            days=None if days is None else frozenset(WEEKDAYS.index(d) for d in days),
+            dates=None if dates is None else frozenset(dates),
+        )
 
     @property
-    def fan_mode(self) -> str | None:
-        """Return the fan mode."""
-        return self._fan_mode
+    def unresolved(self) -> "ClimateSchedulerSchedule":
+        """Return the schedule as configured, before a sun relative time was resolved."""
+        return self if self.sun_time is None else replace(self, time=None)
 
-    @property
-    def swing_mode(self) -> str | None:
-        """Return the swing mode."""
-        return self._swing_mode
+    def resolve(self, time: timedelta) -> "ClimateSchedulerSchedule":
+        """Return a copy of a sun relative schedule resolved to a time of day."""
+        return replace(self, time=time)
 
-    @property
-    def min_temp(self) -> float | None:
-        """Return the min temp."""
-        return self._min_temp
 
-    @property
-    def max_temp(self) -> float | None:
-        """Return the max temp."""
-        return self._max_temp
+def resolve_sun_time(hass: HomeAssistant, sun_time: SunRelativeTime, day: date) -> timedelta | None:
+    """Resolve a sun relative time to a time of day, None if there is no such event that day."""
+    event = get_astral_event_date(hass, sun_time.event, day)
+    if event is None:
+        return None
+
+    event = dt_util.as_local(event)
+    time = timedelta(hours=event.hour, minutes=event.minute, seconds=event.second) + sun_time.offset
+    # Offsets must not move the schedule to another day
+    return min(max(time, timedelta()), timedelta(days=1, seconds=-1))
@@ -1,19 +1,215 @@
 """Climate Scheduler Implementation"""
 
-from datetime import timedelta
+from __future__ import annotations
 
+import logging
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
+
+from homeassistant.const import ATTR_ENTITY_ID, ATTR_OPTION, SERVICE_SELECT_OPTION
 from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .common import ComputedClimateData, Hold
+from .const import CONF_CALLBACK_BUDGET, CONF_CONFIRM_TIMEOUT, CONF_UPDATE_INTERVAL
+from .dispatch import async_dispatch_commands
+from .profiling import UpdateProfiler
+from .snapshot import ProfileSnapshots
+from .watchdog import CallbackWatchdog
+
+if TYPE_CHECKING:
+    from .ack import CommandAcknowledgements
+    from .switch import ClimateSchedulerSwitch
 
-from .const import CONF_UPDATE_INTERVAL
+_LOGGER = logging.getLogger(__name__)
 
 
 class ClimateScheduler:
     """Climate Scheduler Implementation"""
 
-    def __init__(self, hass: HomeAssistant, config: dict) -> None:
+    def __init__(self, hass: HomeAssistant, config: dict, hass_config: dict) -> None:
         self.hass = hass
+        # Top level configuration, needed to load platforms on behalf of switches
+        self.hass_config = hass_config
         self._update_interval: timedelta = config.get(CONF_UPDATE_INTERVAL, timedelta(minutes=15))
 
+        self._switches: dict[str, ClimateSchedulerSwitch] = {}
+        # Switches controlling each climate entity, by decreasing priority
+        self._entity_owners: dict[str, list[ClimateSchedulerSwitch]] = {}
+        # Active or idle phase and settings last sent to each climate entity
+        self._entity_phases: dict[str, tuple[bool, ComputedClimateData]] = {}
+        self._profiler: UpdateProfiler | None = None
+        self._watchdog = CallbackWatchdog(hass, config.get(CONF_CALLBACK_BUDGET, 1.0))
+        self._profile_snapshots = ProfileSnapshots(hass)
+
+        # Confirmation of the commands sent to climate entities, only when a timeout is configured
+        self._acknowledgements: CommandAcknowledgements | None = None
+        if config.get(CONF_CONFIRM_TIMEOUT) is not None:
+            from .ack import CommandAcknowledgements
+
+            self._acknowledgements = CommandAcknowledgements(hass, config[CONF_CONFIRM_TIMEOUT], self.forget_phase)
+
     @property
     def update_interval(self) -> timedelta:
         return self._update_interval
+
+    @property
+    def watchdog(self) -> CallbackWatchdog:
+        return self._watchdog
+
+    @property
+    def profile_snapshots(self) -> ProfileSnapshots:
+        return self._profile_snapshots
+
+    @property
+    def acknowledgements(self) -> CommandAcknowledgements | None:
+        """Return the confirmation tracking of climate commands, None unless configured"""
+        return self._acknowledgements
+
+    @property
+    def profiler(self) -> UpdateProfiler | None:
+        """Return the profiler of switch updates, None unless profiling was requested"""
+        return self._profiler
+
+    def start_profiling(self, updates: int, timeout: timedelta) -> str | None:
+        """Profile the next updates of all switches, returning the report path or None if already profiling"""
+        if self._profiler is not None:
+            return None
+
+        path = self.hass.config.path(f"climate_scheduler_profile_{dt_util.utcnow():%Y%m%d_%H%M%S}.txt")
+        self._profiler = UpdateProfiler(self.hass, path, updates, timeout, self._on_profiling_finished)
+        return path
+
+    def _on_profiling_finished(self, profiler: UpdateProfiler) -> None:
+        if self._profiler is profiler:
+            self._profiler = None
+
+    def register_switch(self, switch: ClimateSchedulerSwitch, entity_ids: list[str]) -> None:
+        """Record the climate entities of a switch and report entities shared with other switches"""
+        self._switches[switch.entity_id] = switch
+        for entity_id in entity_ids:
+            owners = self._entity_owners.setdefault(entity_id, [])
+            owners.append(switch)
+            # Stable sort, switches registered first win between equal priorities
+            owners.sort(key=lambda s: -s.priority)
+
+            if len(owners) > 1:
+                _LOGGER.warning(
+                    "%s is controlled by several climate schedulers, only the active one with the highest "
+                    "priority will update it: %s",
+                    entity_id,
+                    ", ".join(f"{s.entity_id} (priority {s.priority})" for s in owners),
+                )
+
+    def unregister_switch(self, switch: ClimateSchedulerSwitch) -> None:
+        """Forget the climate entities of a switch"""
+        self._switches.pop(switch.entity_id, None)
+        for entity_id, owners in list(self._entity_owners.items()):
+            if switch in owners:
+                owners.remove(switch)
+            if not owners:
+                del self._entity_owners[entity_id]
+
+    def is_controller(self, switch: ClimateSchedulerSwitch, entity_id: str) -> bool:
+        """Return whether a switch is the active owner of a climate entity with the highest priority"""
+        for owner in self._entity_owners.get(entity_id, ()):
+            if owner.is_on:
+                return owner is switch
+        return False
+
+    def update_phase(self, entity_id: str, active: bool, data: ComputedClimateData) -> bool:
+        """Record the phase and settings sent to a climate entity, returning whether they changed"""
+        phase = (active, data)
+        if self._entity_phases.get(entity_id) == phase:
+            return False
+        self._entity_phases[entity_id] = phase
+        return True
+
+    def forget_phase(self, entity_id: str) -> None:
+        """Forget what was sent to a climate entity, so that the next update sends everything again"""
+        self._entity_phases.pop(entity_id, None)
+
+    async def async_release(self, switch: ClimateSchedulerSwitch) -> None:
+        """Let other active owners take over the climate entities of a switch which turned off"""
+        controllers = []
+        for entity_id, owners in self._entity_owners.items():
+            if switch not in owners:
+                continue
+            # Entities may be changed by hand while not scheduled, send everything again later on
+            self.forget_phase(entity_id)
+            if self._acknowledgements is not None:
+                self._acknowledgements.forget(entity_id)
+            controller = next((o for o in owners if o.is_on), None)
+            if controller is not None and controller not in controllers:
+                controllers.append(controller)
+
+        for controller in controllers:
+            await controller.async_update_climate(source="release")
+
+    def get_switch(self, entity_id: str) -> ClimateSchedulerSwitch | None:
+        """Return a switch by entity ID"""
+        return self._switches.get(entity_id)
+
+    def get_switches(self, entity_ids: set[str]) -> list[ClimateSchedulerSwitch]:
+        """Return the switches among entities, or controlling any of the climate entities"""
+        switches = [s for entity_id, s in self._switches.items() if entity_id in entity_ids]
+        for entity_id in entity_ids:
+            switches.extend(s for s in self._entity_owners.get(entity_id, ()) if s not in switches)
+        return switches
+
+    async def async_set_profile(self, switches: list[ClimateSchedulerSwitch], profile_id: str) -> None:
+        """Switch several switches to a profile at once.
+
+        Every switch changes profile before any command is sent, then the resulting commands of
+        all switches are sent as a single batch.
+        """
+        changed = [s for s in switches if s.current_profile_id != profile_id and s.set_profile(profile_id)]
+        if not changed:
+            return
+
+        await self._async_update_switches(changed, "set_profile")
+
+        # Keep profile selectors in sync. They ignore changes to the profile already in use.
+        selectors = [s.profile_selector_entity_id for s in changed if s.profile_selector_entity_id]
+        if selectors:
+            from homeassistant.components.input_select import DOMAIN as INPUT_SELECT_DOMAIN
+
+            await self.hass.services.async_call(
+                INPUT_SELECT_DOMAIN,
+                SERVICE_SELECT_OPTION,
+                {ATTR_ENTITY_ID: selectors, ATTR_OPTION: profile_id},
+            )
+
+    async def async_hold(
+        self,
+        switches: list[ClimateSchedulerSwitch],
+        until: datetime | None,
+        profile_id: str | None,
+        climate: ComputedClimateData,
+    ) -> None:
+        """Hold a profile or climate settings on several switches at once.
+
+        Switches hold until the given time, or each until the next change of its current profile
+        when None. Every switch starts holding before any command is sent, as for profile switches.
+        """
+        held = []
+        for switch in switches:
+            end = until or switch.next_transition
+            if end is not None and switch.set_hold(Hold(dt_util.as_utc(end), profile_id, climate)):
+                held.append(switch)
+
+        await self._async_update_switches(held, "hold")
+
+    async def async_cancel_hold(self, switches: list[ClimateSchedulerSwitch]) -> None:
+        """End the holds of several switches at once, applying their schedules again"""
+        await self._async_update_switches([s for s in switches if s.end_hold()], "hold_cancelled")
+
+    async def _async_update_switches(self, switches: list[ClimateSchedulerSwitch], source: str) -> None:
+        """Send the commands of several switches as a single batch, then write their states"""
+        if not switches:
+            return
+
+        await async_dispatch_commands(self.hass, [c for s in switches for c in s.plan_climate(source=source)])
+
+        for switch in switches:
+            switch.async_write_state_if_changed()
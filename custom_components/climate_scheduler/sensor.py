@@ -0,0 +1,202 @@
+"""
+Sensors of Climate Scheduler for Home-Assistant.
+"""
+
+from abc import abstractmethod
+from collections.abc import Callable, Iterable
+from datetime import datetime
+
+from homeassistant.components.climate import (
+    ATTR_FAN_MODE,
+    ATTR_HVAC_MODE,
+    ATTR_SWING_MODE,
+    ATTR_TARGET_TEMP_HIGH,
+    ATTR_TARGET_TEMP_LOW,
+    HVACMode,
+)
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorStateClass
+from homeassistant.const import ATTR_ENTITY_ID, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity import Entity
+from homeassistant.util import dt as dt_util
+
+from .common import ComputedClimateData, ScheduleStatus
+from .const import (
+    CONF_LOOP_LAG_SENSOR,
+    DATA_CLIMATE_SCHEDULER,
+    SIGNAL_SCHEDULE_STATUS_UPDATED,
+    SIGNAL_WATCHDOG_UPDATED,
+)
+from .scheduler import ClimateScheduler
+from .switch import ClimateSchedulerSwitch
+from .watchdog import CallbackWatchdog
+
+
+def _target_temperature(data: ComputedClimateData | None) -> float | None:
+    """Return the temperature a climate aims for, the high target only when cooling"""
+    if data is None:
+        return None
+    if data.hvac_mode == HVACMode.COOL or data.min_temp is None:
+        return data.max_temp
+    return data.min_temp
+
+
+def _climate_attributes(data: ComputedClimateData | None) -> dict | None:
+    if data is None:
+        return None
+    return {
+        ATTR_HVAC_MODE: data.hvac_mode,
+        ATTR_FAN_MODE: data.fan_mode,
+        ATTR_SWING_MODE: data.swing_mode,
+        ATTR_TARGET_TEMP_LOW: data.min_temp,
+        ATTR_TARGET_TEMP_HIGH: data.max_temp,
+    }
+
+
+class ClimateScheduleSensor(SensorEntity):
+    """Sensor following part of the schedule status of a switch, written only when it changes"""
+
+    _attr_should_poll = False
+    _key: str
+    _label: str
+
+    def __init__(self, switch: ClimateSchedulerSwitch) -> None:
+        self._switch = switch
+        self.entity_id = f"sensor.{switch.entity_id_suffix}_{self._key}"
+        self._attr_name = f"{switch.name} {self._label}"
+        self._snapshot = None
+
+    @abstractmethod
+    def _status_value(self, status: ScheduleStatus) -> ComputedClimateData | datetime | None:
+        """Return the part of the schedule status followed by the sensor"""
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the schedule status of the switch"""
+        self.async_on_remove(
+            async_dispatcher_connect(self.hass, SIGNAL_SCHEDULE_STATUS_UPDATED, self._async_on_status_update)
+        )
+        self._refresh()
+
+    @callback
+    def _async_on_status_update(self, entity_id: str) -> None:
+        if entity_id == self._switch.entity_id and self._refresh():
+            self.async_write_ha_state()
+
+    def _refresh(self) -> bool:
+        """Update the sensor from the status of the switch, return whether its value changed"""
+        status = self._switch.schedule_status
+        snapshot = None if status is None else self._status_value(status)
+        if snapshot == self._snapshot:
+            return False
+        self._snapshot = snapshot
+        return True
+
+
+class ClimateScheduleTargetSensor(ClimateScheduleSensor):
+    """Target temperature of a schedule, with its other climate settings as attributes"""
+
+    _attr_device_class = SensorDeviceClass.TEMPERATURE
+
+    @property
+    def native_unit_of_measurement(self) -> str:
+        return self.hass.config.units.temperature_unit
+
+    @property
+    def native_value(self) -> float | None:
+        return _target_temperature(self._snapshot)
+
+    @property
+    def extra_state_attributes(self) -> dict | None:
+        return _climate_attributes(self._snapshot)
+
+
+class CurrentTargetSensor(ClimateScheduleTargetSensor):
+    """Climate currently scheduled by the profile"""
+
+    _key = "current_target"
+    _label = "Current Target"
+
+    def _status_value(self, status: ScheduleStatus) -> ComputedClimateData | None:
+        return status.current
+
+
+class NextTargetSensor(ClimateScheduleTargetSensor):
+    """Climate of the next change of the schedule"""
+
+    _key = "next_target"
+    _label = "Next Target"
+
+    def _status_value(self, status: ScheduleStatus) -> ComputedClimateData | None:
+        return status.next_climate
+
+
+class NextTransitionSensor(ClimateScheduleSensor):
+    """Time of the next change of the schedule"""
+
+    _key = "next_transition"
+    _label = "Next Transition"
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+
+    def _status_value(self, status: ScheduleStatus) -> datetime | None:
+        return status.next_time
+
+    @property
+    def native_value(self) -> datetime | None:
+        return self._snapshot
+
+
+class LoopLagSensor(SensorEntity):
+    """Lateness of the timers of the latest schedule boundary, with slow callbacks as attributes"""
+
+    _attr_should_poll = False
+    _attr_name = "Climate Scheduler Loop Lag"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_icon = "mdi:timer-alert-outline"
+
+    def __init__(self, watchdog: CallbackWatchdog) -> None:
+        self._watchdog = watchdog
+        self.entity_id = "sensor.climate_scheduler_loop_lag"
+
+    @property
+    def native_value(self) -> float | None:
+        return None if self._watchdog.lag is None else round(self._watchdog.lag * 1000, 1)
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        watchdog = self._watchdog
+        return {
+            "boundary": None if watchdog.boundary is None else dt_util.as_local(watchdog.boundary).isoformat(),
+            "max_lag": round(watchdog.max_lag * 1000, 1),
+            "slow_callbacks": watchdog.slow_callbacks,
+            "last_slow_callback": watchdog.last_slow_callback,
+        }
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the watchdog"""
+        self.async_on_remove(async_dispatcher_connect(self.hass, SIGNAL_WATCHDOG_UPDATED, self.async_write_ha_state))
+
+
+async def async_setup_platform(
+    hass: HomeAssistant,
+    config: dict,
+    async_add_entities: Callable[[Iterable[Entity], bool], None],
+    discovery_info=None,
+):
+    """Set up the schedule sensors of a Climate Scheduler switch"""
+    cs: ClimateScheduler = hass.data.get(DATA_CLIMATE_SCHEDULER)
+    if discovery_info is None or cs is None:
+        return False
+
+    if discovery_info.get(CONF_LOOP_LAG_SENSOR):
+        async_add_entities([LoopLagSensor(cs.watchdog)])
+        return True
+
+    switch = cs.get_switch(discovery_info[ATTR_ENTITY_ID])
+    if switch is None:
+        return False
+
+    async_add_entities([CurrentTargetSensor(switch), NextTargetSensor(switch), NextTransitionSensor(switch)])
+    return True
@@ -0,0 +1,149 @@
+"""Services of Climate Scheduler."""
+
+import homeassistant.helpers.config_validation as cv
+import voluptuous as vol
+from homeassistant.components.climate import HVAC_MODES
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.target import TargetSelection, async_extract_referenced_entity_ids
+from homeassistant.util import dt as dt_util
+
+from .common import ComputedClimateData
+from .const import (
+    ATTR_DURATION,
+    ATTR_PROFILE_ID,
+    ATTR_TIMEOUT,
+    ATTR_UPDATES,
+    CONF_SCHEDULE_FAN_MODE,
+    CONF_SCHEDULE_HVAC,
+    CONF_SCHEDULE_MAX_TEMP,
+    CONF_SCHEDULE_MIN_TEMP,
+    CONF_SCHEDULE_SWING_MODE,
+    SERVICE_CANCEL_HOLD,
+    SERVICE_GET_COMMAND_LATENCY,
+    SERVICE_GET_TRACE,
+    SERVICE_HOLD,
+    SERVICE_PROFILE_UPDATES,
+    SERVICE_SET_PROFILE,
+)
+from .scheduler import ClimateScheduler
+
+SET_PROFILE_SCHEMA = vol.Schema(
+    {
+        **cv.ENTITY_SERVICE_FIELDS,
+        vol.Required(ATTR_PROFILE_ID): cv.string,
+    }
+)
+
+HOLD_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            **cv.ENTITY_SERVICE_FIELDS,
+            vol.Optional(ATTR_PROFILE_ID): cv.string,
+            vol.Optional(CONF_SCHEDULE_HVAC): vol.All(cv.string, vol.In(HVAC_MODES)),
+            vol.Optional(CONF_SCHEDULE_MIN_TEMP): vol.Coerce(float),
+            vol.Optional(CONF_SCHEDULE_MAX_TEMP): vol.Coerce(float),
+            vol.Optional(CONF_SCHEDULE_FAN_MODE): cv.string,
+            vol.Optional(CONF_SCHEDULE_SWING_MODE): cv.string,
+            vol.Optional(ATTR_DURATION): cv.positive_time_period,
+        }
+    ),
+    cv.has_at_least_one_key(
+        ATTR_PROFILE_ID,
+        CONF_SCHEDULE_HVAC,
+        CONF_SCHEDULE_MIN_TEMP,
+        CONF_SCHEDULE_MAX_TEMP,
+        CONF_SCHEDULE_FAN_MODE,
+        CONF_SCHEDULE_SWING_MODE,
+    ),
+)
+
+CANCEL_HOLD_SCHEMA = vol.Schema(cv.ENTITY_SERVICE_FIELDS)
+
+GET_TRACE_SCHEMA = vol.Schema(cv.ENTITY_SERVICE_FIELDS)
+
+GET_COMMAND_LATENCY_SCHEMA = vol.Schema(cv.ENTITY_SERVICE_FIELDS)
+
+PROFILE_UPDATES_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_UPDATES, default=20): vol.All(vol.Coerce(int), vol.Range(min=1, max=1000)),
+        vol.Optional(ATTR_TIMEOUT, default="00:10:00"): cv.positive_time_period,
+    }
+)
+
+
+def async_setup_services(hass: HomeAssistant, domain: str, cs: ClimateScheduler) -> None:
+    """Register the services of the component."""
+
+    def _selected_switches(call: ServiceCall):
+        # Targets can be switches, or climate entities, areas and labels which are resolved
+        # to the switches controlling the climate entities
+        selected = async_extract_referenced_entity_ids(hass, TargetSelection(call.data))
+        return cs.get_switches(selected.referenced | selected.indirectly_referenced)
+
+    async def async_set_profile(call: ServiceCall) -> None:
+        await cs.async_set_profile(_selected_switches(call), call.data[ATTR_PROFILE_ID])
+
+    async def async_hold(call: ServiceCall) -> None:
+        switches = _selected_switches(call)
+        until = None
+        if ATTR_DURATION in call.data:
+            until = dt_util.utcnow() + call.data[ATTR_DURATION]
+        else:
+            unscheduled = [s.entity_id for s in switches if s.next_transition is None]
+            if unscheduled:
+                raise HomeAssistantError(
+                    f"No upcoming schedule change to hold until for {', '.join(unscheduled)}, set a duration"
+                )
+
+        climate = ComputedClimateData(
+            call.data.get(CONF_SCHEDULE_HVAC),
+            call.data.get(CONF_SCHEDULE_FAN_MODE),
+            call.data.get(CONF_SCHEDULE_SWING_MODE),
+            call.data.get(CONF_SCHEDULE_MIN_TEMP),
+            call.data.get(CONF_SCHEDULE_MAX_TEMP),
+        )
+        await cs.async_hold(switches, until, call.data.get(ATTR_PROFILE_ID), climate)
+
+    async def async_cancel_hold(call: ServiceCall) -> None:
+        await cs.async_cancel_hold(_selected_switches(call))
+
+    async def async_get_trace(call: ServiceCall) -> ServiceResponse:
+        return {switch.entity_id: switch.trace.as_list() for switch in _selected_switches(call)}
+
+    async def async_get_command_latency(call: ServiceCall) -> ServiceResponse:
+        if cs.acknowledgements is None:
+            raise HomeAssistantError("Climate Scheduler commands are only confirmed with a confirm_timeout")
+        entity_ids = list(dict.fromkeys(e for s in _selected_switches(call) for e in s.climate_entities))
+        return cs.acknowledgements.as_dict(entity_ids)
+
+    async def async_profile_updates(call: ServiceCall) -> ServiceResponse:
+        path = cs.start_profiling(call.data[ATTR_UPDATES], call.data[ATTR_TIMEOUT])
+        if path is None:
+            raise HomeAssistantError("Climate Scheduler updates are already being profiled")
+        return {"path": path}
+
+    hass.services.async_register(domain, SERVICE_SET_PROFILE, async_set_profile, schema=SET_PROFILE_SCHEMA)
+    hass.services.async_register(domain, SERVICE_HOLD, async_hold, schema=HOLD_SCHEMA)
+    hass.services.async_register(domain, SERVICE_CANCEL_HOLD, async_cancel_hold, schema=CANCEL_HOLD_SCHEMA)
+    hass.services.async_register(
+        domain,
+        SERVICE_PROFILE_UPDATES,
+        async_profile_updates,
+        schema=PROFILE_UPDATES_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        domain,
+        SERVICE_GET_TRACE,
+        async_get_trace,
+        schema=GET_TRACE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        domain,
+        SERVICE_GET_COMMAND_LATENCY,
+        async_get_command_latency,
+        schema=GET_COMMAND_LATENCY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
@@ -0,0 +1,116 @@
+"""Validated profile snapshots for Climate Scheduler."""
+
+import asyncio
+import hashlib
+import json
+import logging
+from datetime import date, timedelta
+
+import voluptuous as vol
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .common import SunRelativeTime
+from .const import (
+    CONF_PROFILE_SCHEDULE,
+    CONF_SCHEDULE_DATES,
+    CONF_SCHEDULE_TIME,
+    SNAPSHOT_FORMAT,
+    SNAPSHOT_SAVE_DELAY,
+    SNAPSHOT_STORAGE_KEY,
+    SNAPSHOT_STORAGE_VERSION,
+)
+from .validation import resolve_profile_extends, unique_profiles
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def config_hash(profiles: list) -> str:
+    """Return a hash of the profiles configuration of a scheduler."""
+    content = json.dumps([SNAPSHOT_FORMAT, profiles], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(content.encode()).hexdigest()
+
+
+def validate_profiles(profiles: list) -> list[dict]:
+    """Validate the profiles of a scheduler, raising vol.Invalid if they are invalid."""
+    from .profile import PROFILES_SCHEMA
+
+    return vol.All(PROFILES_SCHEMA, unique_profiles, resolve_profile_extends, vol.Length(min=1))(profiles)
+
+
+def dump_profiles(profiles: list[dict]) -> list[dict]:
+    """Return validated profiles in a JSON serializable form."""
+    return [{**p, CONF_PROFILE_SCHEDULE: [_dump_schedule(s) for s in p[CONF_PROFILE_SCHEDULE]]} for p in profiles]
+
+
+def load_profiles(data: list[dict]) -> list[dict]:
+    """Return validated profiles from their JSON serializable form."""
+    return [{**p, CONF_PROFILE_SCHEDULE: [_load_schedule(s) for s in p[CONF_PROFILE_SCHEDULE]]} for p in data]
+
+
+def _dump_schedule(schedule: dict) -> dict:
+    time = schedule[CONF_SCHEDULE_TIME]
+    data = {
+        **schedule,
+        CONF_SCHEDULE_TIME: [time.event, time.offset.total_seconds()]
+        if isinstance(time, SunRelativeTime)
+        else time.total_seconds(),
+    }
+    if CONF_SCHEDULE_DATES in schedule:
+        data[CONF_SCHEDULE_DATES] = [d.isoformat() for d in schedule[CONF_SCHEDULE_DATES]]
+    return data
+
+
+def _load_schedule(data: dict) -> dict:
+    time = data[CONF_SCHEDULE_TIME]
+    schedule = {
+        **data,
+        CONF_SCHEDULE_TIME: SunRelativeTime(time[0], timedelta(seconds=time[1]))
+        if isinstance(time, list)
+        else timedelta(seconds=time),
+    }
+    if CONF_SCHEDULE_DATES in data:
+        schedule[CONF_SCHEDULE_DATES] = [date.fromisoformat(d) for d in data[CONF_SCHEDULE_DATES]]
+    return schedule
+
+
+class ProfileSnapshots:
+    """Validated profiles of schedulers, stored across restarts by hash of their configuration.
+
+    A scheduler whose profiles configuration is unchanged since the last validation loads them from
+    the snapshot instead of validating them again. Snapshots of configurations which were not used
+    since the last restart are dropped whenever a new one is stored.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the snapshots."""
+        self._store: Store[dict] = Store(hass, SNAPSHOT_STORAGE_VERSION, SNAPSHOT_STORAGE_KEY)
+        self._load_lock = asyncio.Lock()
+        self._snapshots: dict[str, list[dict]] | None = None
+        self._used: dict[str, list[dict]] = {}
+
+    async def async_validate(self, profiles: list) -> list[dict]:
+        """Return the validated profiles of a scheduler, raising vol.Invalid if they are invalid."""
+        key = config_hash(profiles)
+        async with self._load_lock:
+            if self._snapshots is None:
+                data = await self._store.async_load()
+                self._snapshots = {} if data is None else data.get("profiles", {})
+
+        snapshot = self._snapshots.get(key)
+        if snapshot is not None:
+            try:
+                validated = load_profiles(snapshot)
+            except (KeyError, TypeError, ValueError):
+                _LOGGER.warning("Ignoring invalid profiles snapshot %s", key)
+            else:
+                self._used[key] = snapshot
+                return validated
+
+        validated = validate_profiles(profiles)
+        self._used[key] = self._snapshots[key] = dump_profiles(validated)
+        self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+        return validated
+
+    def _data_to_save(self) -> dict:
+        return {"profiles": self._used}
@@ -2,14 +2,19 @@
 Climate Scheduler Switch for Home-Assistant.
 """
 
-import asyncio
+from __future__ import annotations
+
 import logging
+import time
 from collections.abc import Callable, Iterable
-from datetime import timedelta
+from datetime import date, datetime, timedelta
+from functools import partial
+from typing import TYPE_CHECKING
 
 import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
 from homeassistant.components.climate import (
+    ATTR_CURRENT_TEMPERATURE,
     ATTR_FAN_MODE,
     ATTR_HVAC_MODE,
     ATTR_SWING_MODE,
@@ -19,63 +24,127 @@ from homeassistant.components.climate import (
     SERVICE_SET_HVAC_MODE,
     SERVICE_SET_SWING_MODE,
     SERVICE_SET_TEMPERATURE,
+    HVACMode,
 )
-from homeassistant.components.climate import DOMAIN as CLIMATE_DOMAIN
-from homeassistant.components.input_select import (
-    CONF_INITIAL,
-    CONF_OPTIONS,
-    InputSelect,
-)
-from homeassistant.components.input_select import DOMAIN as INPUT_SELECT_DOMAIN
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.const import (
     ATTR_ENTITY_ID,
     ATTR_OPTION,
     ATTR_TEMPERATURE,
+    CONF_ENTITY_ID,
     CONF_ICON,
     CONF_ID,
     CONF_NAME,
     CONF_PLATFORM,
+    EVENT_CORE_CONFIG_UPDATE,
     SERVICE_SELECT_OPTION,
     STATE_OFF,
     STATE_ON,
+    Platform,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.discovery import async_load_platform
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.entity_platform import EntityPlatform, async_get_platforms
 from homeassistant.helpers.event import (
+    async_track_point_in_time,
+    async_track_point_in_utc_time,
     async_track_state_change_event,
-    async_track_time_change,
     async_track_time_interval,
 )
 from homeassistant.helpers.restore_state import RestoreEntity
+from homeassistant.helpers.start import async_at_started
+from homeassistant.util import dt as dt_util
 from homeassistant.util import slugify
 from homeassistant.util.dt import now
-
-from .common import ComputedClimateData
+from voluptuous.humanize import humanize_error
+
+from . import DOMAIN
+from .common import (
+    ClimateAdjustment,
+    ClimateCommand,
+    ComputedClimateData,
+    Hold,
+    ScheduleStatus,
+    adjust_climate,
+    hold_climate,
+)
 from .const import (
+    ATTR_HOLD,
+    ATTR_OPTIMAL_START_RATES,
+    ATTR_OPTIMAL_START_TIME,
+    ATTR_PAUSED,
     ATTR_PROFILE,
+    ATTR_PROFILE_ID,
     ATTR_PROFILE_OPTIONS,
+    ATTR_UNTIL,
+    ATTR_VERSION,
     CONF_CLIMATE_ENTITIES,
+    CONF_CLIMATE_ENTITY_OFFSET,
     CONF_DEFAULT_PROFILE,
     CONF_DEFAULT_STATE,
+    CONF_HYSTERESIS,
+    CONF_MIN_CYCLE_TIME,
+    CONF_OCCUPANCY_SENSORS,
+    CONF_OCCUPANCY_TIMEOUT,
+    CONF_OPTIMAL_START,
+    CONF_OPTIMAL_START_MAX_LEAD,
+    CONF_PRIORITY,
     CONF_PROFILE_ID,
     CONF_PROFILES,
+    CONF_SCHEDULE_FAN_MODE,
+    CONF_SCHEDULE_HVAC,
+    CONF_SCHEDULE_SWING_MODE,
+    CONF_SENSORS,
+    CONF_TARIFF_ATTRIBUTE,
+    CONF_TARIFF_HEATING_RATE,
+    CONF_TARIFF_LOSS_RATE,
+    CONF_TARIFF_PREHEAT_MARGIN,
+    CONF_TARIFF_SENSOR,
+    CONF_TEMPERATURE_SENSOR,
+    CONF_WINDOW_DELAY,
+    CONF_WINDOW_SENSORS,
     DATA_CLIMATE_SCHEDULER,
     ICON,
+    SIGNAL_SCHEDULE_STATUS_UPDATED,
+    SIGNAL_TIMELINE_UPDATED,
+    TARIFF_STEP,
 )
-from .profile import PROFILES_SCHEMA, ClimateSchedulerProfile
+from .dispatch import async_dispatch_commands, async_send_rounds, group_commands
+from .profile import ClimateSchedulerProfile, content_version, local_time_to_utc
+from .profiling import profiling_stage
+from .schedule import resolve_sun_time
 from .scheduler import ClimateScheduler
-from .validation import unique_profiles
+from .trace import DecisionTrace
+from .validation import climate_entity
+
+if TYPE_CHECKING:
+    from homeassistant.components.input_select import InputSelect
+
+    from .hysteresis import HysteresisController
+    from .optimal_start import OptimalStartModel
+    from .pause import PauseMonitor
 
 PLATFORM_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_PLATFORM): "climate_scheduler",
-        vol.Required(CONF_PROFILES): vol.All(PROFILES_SCHEMA, unique_profiles, vol.Length(min=1)),
+        # Validated on setup, unless unchanged since the last validation
+        vol.Required(CONF_PROFILES): vol.All(cv.ensure_list, vol.Length(min=1)),
         vol.Optional(CONF_NAME, default="Climate Scheduler"): cv.string,
         vol.Optional(CONF_DEFAULT_STATE, default=False): cv.boolean,
         vol.Optional(CONF_DEFAULT_PROFILE): cv.string,
-        vol.Optional(CONF_CLIMATE_ENTITIES): cv.entity_ids,
+        vol.Optional(CONF_CLIMATE_ENTITIES, default=[]): vol.All(cv.ensure_list_csv, [climate_entity]),
+        vol.Optional(CONF_PRIORITY, default=0): vol.Coerce(int),
+        vol.Optional(CONF_OPTIMAL_START, default=False): cv.boolean,
+        vol.Optional(CONF_OPTIMAL_START_MAX_LEAD, default="03:00:00"): cv.positive_time_period,
+        vol.Optional(CONF_HYSTERESIS): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(CONF_MIN_CYCLE_TIME, default="00:05:00"): cv.positive_time_period,
+        vol.Optional(CONF_WINDOW_SENSORS, default=[]): cv.entity_ids,
+        vol.Optional(CONF_WINDOW_DELAY, default="00:00:30"): cv.positive_time_period,
+        vol.Optional(CONF_OCCUPANCY_SENSORS, default=[]): cv.entity_ids,
+        vol.Optional(CONF_OCCUPANCY_TIMEOUT, default="00:30:00"): cv.positive_time_period,
+        vol.Optional(CONF_SENSORS, default=False): cv.boolean,
     },
     extra=vol.ALLOW_EXTRA,
 )
@@ -86,6 +155,11 @@ _LOGGER = logging.getLogger(__name__)
 class ClimateSchedulerSwitch(SwitchEntity, RestoreEntity):
     """Representation of a Climate Scheduler swith."""
 
+    # Static or bulky attributes, kept out of the recorder database
+    _unrecorded_attributes = frozenset({ATTR_PROFILE_OPTIONS, ATTR_OPTIMAL_START_RATES})
+    # State only changes through the scheduler itself, which writes it when needed
+    _attr_should_poll = False
+
     def __init__(self, hass: HomeAssistant, cs: ClimateScheduler, config: dict) -> None:
         """Initialize the Climate Scheduler swith."""
         self._hass = hass
@@ -97,23 +171,35 @@ class ClimateSchedulerSwitch(SwitchEntity, RestoreEntity):
         # Simple configs
         self._name: str = config.get(CONF_NAME)
 
-        _LOGGER.info(f"Initializing Climate Scheduler switch {self.entity_id}")
-        self._climate_entities: list[str] = config.get(CONF_CLIMATE_ENTITIES)
+        _LOGGER.debug("Initializing Climate Scheduler switch %s", self.entity_id)
+        self._climate_entities: list[str] = [e[CONF_ENTITY_ID] for e in config.get(CONF_CLIMATE_ENTITIES)]
+        self._adjustments: dict[str, ClimateAdjustment] = {
+            e[CONF_ENTITY_ID]: ClimateAdjustment(
+                e[CONF_CLIMATE_ENTITY_OFFSET],
+                e.get(CONF_SCHEDULE_HVAC),
+                e.get(CONF_SCHEDULE_FAN_MODE),
+                e.get(CONF_SCHEDULE_SWING_MODE),
+            )
+            for e in config.get(CONF_CLIMATE_ENTITIES)
+        }
+        self._priority: int = config.get(CONF_PRIORITY, 0)
+        self._cs.register_switch(self, self._climate_entities)
 
         # Setup state
         self._state: str | None = None
         self._default_state: str | None = STATE_ON if config.get(CONF_DEFAULT_STATE) else STATE_OFF
 
         # Setup profiles
+        schedule_cache = {}
         self._profiles: dict[str, ClimateSchedulerProfile] = {
-            profile_conf[CONF_PROFILE_ID]: ClimateSchedulerProfile(profile_conf)
+            profile_conf[CONF_PROFILE_ID]: ClimateSchedulerProfile(profile_conf, schedule_cache)
             for profile_conf in config.get(CONF_PROFILES)
         }
 
         # Setup default profile
         self._default_profile_id: str | None = config.get(CONF_DEFAULT_PROFILE)
         if self._default_profile_id not in self._profiles:
-            _LOGGER.info(f"Ignoring invalid default profile id {self._default_profile_id}")
+            _LOGGER.info("Ignoring invalid default profile id %s", self._default_profile_id)
             self._default_profile_id = None
 
         # Setup current profile
@@ -123,14 +209,86 @@ class ClimateSchedulerSwitch(SwitchEntity, RestoreEntity):
             self.current_profile_id
         )
 
+        # Setup optimal start
+        self._optimal_start: OptimalStartModel | None = None
+        if config.get(CONF_OPTIMAL_START):
+            from .optimal_start import OptimalStartModel
+
+            # The estimates are state attributes, written as they are learned
+            self._optimal_start = OptimalStartModel(
+                hass,
+                self._climate_entities,
+                config.get(CONF_OPTIMAL_START_MAX_LEAD, timedelta(hours=3)),
+                self.async_write_state_if_changed,
+            )
+        self._optimal_start_time: datetime | None = None
+        self._optimal_start_until: datetime | None = None
+        self._optimal_start_remove_callback: Callable[[], None] | None = None
+
+        # Setup temperature band control, following an external sensor or the entity itself
+        self._hysteresis: HysteresisController | None = None
+        if config.get(CONF_HYSTERESIS) is not None:
+            from .hysteresis import HysteresisController
+
+            self._hysteresis = HysteresisController(
+                hass,
+                {
+                    e[CONF_ENTITY_ID]: e.get(CONF_TEMPERATURE_SENSOR, e[CONF_ENTITY_ID])
+                    for e in config[CONF_CLIMATE_ENTITIES]
+                },
+                config[CONF_HYSTERESIS],
+                config.get(CONF_MIN_CYCLE_TIME, timedelta(minutes=5)),
+                self._async_on_demand_change,
+            )
+
+        # Setup window and occupancy pause
+        self._pause: PauseMonitor | None = None
+        if config.get(CONF_WINDOW_SENSORS) or config.get(CONF_OCCUPANCY_SENSORS):
+            from .pause import PauseMonitor
+
+            self._pause = PauseMonitor(
+                hass,
+                config.get(CONF_WINDOW_SENSORS, []),
+                config.get(CONF_WINDOW_DELAY, timedelta(seconds=30)),
+                config.get(CONF_OCCUPANCY_SENSORS, []),
+                config.get(CONF_OCCUPANCY_TIMEOUT, timedelta(minutes=30)),
+                self._async_on_pause_change,
+            )
+
+        # Setup tariff cost optimization, solved again whenever its inputs change
+        self._tariff_sensors: list[str] = sorted(
+            {p.cost_optimization[CONF_TARIFF_SENSOR] for p in self._profiles.values() if p.cost_optimization}
+        )
+        self._tariff_inputs: tuple | None = None
+
+        # Setup sun relative schedules, resolved once a day or when the location changes
+        self._sun_tracker_remove_callbacks: list[Callable[[], None]] = []
+        if any(profile.has_sun_times for profile in self._profiles.values()):
+            self._resolve_sun_times(now().date())
+            self._sun_tracker_remove_callbacks.append(
+                hass.bus.async_listen(EVENT_CORE_CONFIG_UPDATE, self._async_on_location_change)
+            )
+
+        # Setup temporary hold of a profile or climate settings, expiring on a single timer
+        self._hold: Hold | None = None
+        self._hold_remove_callback: Callable[[], None] | None = None
+        # Time the latest hold expired at, transitions at the same time don't update again
+        self._hold_expired_at: datetime | None = None
+
+        self._profile_selector: InputSelect | None = None
+        self._schedule_status: ScheduleStatus | None = None
+        # State and attributes last written to the state machine
+        self._written_state: tuple[str | None, dict] | None = None
+        self._trace = DecisionTrace()
+
         # Setup time trackers
         self._interval_tracker_remove_callbacks = async_track_time_interval(
-            hass, self.async_update_climate, self._update_interval
+            hass, partial(self.async_update_climate, source="interval"), self._update_interval
         )
         self._schedule_tracker_remove_callbacks: list[Callable[[], None]] = []
         self._update_schedule_trackers()
 
-        logging.info(f"Initialized Climate Scheduler switch {self.entity_id}")
+        _LOGGER.debug("Initialized Climate Scheduler switch %s", self.entity_id)
 
     @property
     def entity_id(self) -> str:
@@ -152,6 +310,18 @@ class ClimateSchedulerSwitch(SwitchEntity, RestoreEntity):
     def icon(self) -> str:
         return ICON
 
+    @property
+    def priority(self) -> int:
+        return self._priority
+
+    @property
+    def is_paused(self) -> bool:
+        return self._pause is not None and self._pause.paused
+
+    @property
+    def climate_entities(self) -> list[str]:
+        return self._climate_entities
+
     @property
     def profile_options(self) -> list[str]:
         return list(self._profiles.keys())
@@ -168,21 +338,110 @@ class ClimateSchedulerSwitch(SwitchEntity, RestoreEntity):
             return self._default_profile_id or list(self._profiles.keys())[0]
         return self._current_profile.profile_id
 
+    @property
+    def active_profile_id(self) -> str | None:
+        """Return the id of the profile being applied, which is the held profile during a hold"""
+        if self._hold is not None and self._hold.profile_id is not None:
+            return self._hold.profile_id
+        return self.current_profile_id
+
+    @property
+    def _active_profile(self) -> ClimateSchedulerProfile | None:
+        if self._hold is not None and self._hold.profile_id is not None:
+            return self._profiles[self._hold.profile_id]
+        return self._current_profile
+
+    @property
+    def _idle_climate(self) -> ComputedClimateData:
+        """Return the settings of idle rooms, from the profile being applied"""
+        profile = self._active_profile or next(iter(self._profiles.values()))
+        return profile.idle_climate
+
+    @property
+    def hold(self) -> Hold | None:
+        """Return the temporary override of the schedule, if any"""
+        return self._hold
+
+    @property
+    def next_transition(self) -> datetime | None:
+        """Return the time of the next change of the current profile, regardless of any hold"""
+        if self._current_profile is None:
+            return None
+        return self._profile_status(self._current_profile, now()).next_time
+
+    @property
+    def profile_selector_entity_id(self) -> str | None:
+        return self._profile_selector.entity_id if self._profile_selector else None
+
+    @property
+    def schedule_status(self) -> ScheduleStatus | None:
+        """Return the current climate of the profile and its next change"""
+        return self._schedule_status
+
+    @property
+    def trace(self) -> DecisionTrace:
+        """Return the latest decisions of the switch"""
+        return self._trace
+
+    @property
+    def timeline(self) -> dict:
+        """Return the compiled schedule of the profile being applied, along with the hold overriding it"""
+        timeline = self._profiles[self.active_profile_id].get_timeline()
+        if self._hold is None:
+            return {**timeline, ATTR_HOLD: None}
+
+        hold = {
+            ATTR_UNTIL: dt_util.as_local(self._hold.until).isoformat(),
+            ATTR_PROFILE_ID: self._hold.profile_id,
+            "climate": list(self._hold.climate),
+        }
+        return {**timeline, ATTR_HOLD: hold, ATTR_VERSION: content_version([timeline[ATTR_VERSION], hold])}
+
     @property
     def state_attributes(self):
-        return {
+        attributes = {
             ATTR_PROFILE: self.current_profile_id,
             ATTR_PROFILE_OPTIONS: self.profile_options,
         }
+        if self._optimal_start is not None:
+            attributes[ATTR_OPTIMAL_START_RATES] = self._optimal_start.as_dict()
+            attributes[ATTR_OPTIMAL_START_TIME] = (
+                dt_util.as_local(self._optimal_start_time).isoformat() if self._optimal_start_time else None
+            )
+        if self._pause is not None:
+            attributes[ATTR_PAUSED] = self._pause.paused
+        attributes[ATTR_HOLD] = None
+        if self._hold is not None:
+            attributes[ATTR_HOLD] = {
+                ATTR_UNTIL: dt_util.as_local(self._hold.until).isoformat(),
+                ATTR_PROFILE_ID: self._hold.profile_id,
+                **{k: v for k, v in self._hold.climate._asdict().items() if v is not None},
+            }
+        return attributes
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state to the state machine, remembering what was written"""
+        self._written_state = (self.state, self.state_attributes)
+        super().async_write_ha_state()
+
+    @callback
+    def async_write_state_if_changed(self) -> None:
+        """Write the state only if the on/off state or an attribute changed since the last write"""
+        if self.hass is None or (self.state, self.state_attributes) == self._written_state:
+            return
+        self.async_write_ha_state()
 
     async def async_create_profile_selector(
         self,
     ) -> None:
         """Create input_select entity for picking profiles"""
+        from homeassistant.components.input_select import CONF_INITIAL, CONF_OPTIONS, InputSelect
+        from homeassistant.components.input_select import DOMAIN as INPUT_SELECT_DOMAIN
 
         platforms = async_get_platforms(self._hass, INPUT_SELECT_DOMAIN)
         if len(platforms) == 0:
-            logging.error("No input select platform, not adding selectors")
+            _LOGGER.error("No input select platform, not adding selectors")
             return
         input_select_platform: EntityPlatform = platforms[0]
 
@@ -210,9 +469,36 @@ class ClimateSchedulerSwitch(SwitchEntity, RestoreEntity):
         """Call when entity about to be added to hass. Used to restore state."""
         # If not None, we got an initial value.
         await super().async_added_to_hass()
-        if self._state is not None:
-            return
+        self.async_on_remove(lambda: self._cs.unregister_switch(self))
+        self.async_on_remove(self._cancel_hold_timer)
+
+        if self._optimal_start is not None:
+            self.async_on_remove(self._optimal_start.async_stop)
+            self._hass.async_create_task(self._optimal_start.async_start())
+
+        if self._pause is not None:
+            self.async_on_remove(self._pause.async_stop)
+            self._pause.async_start()
+
+        if self._hysteresis is not None:
+            self.async_on_remove(self._hysteresis.async_stop)
+            self._hysteresis.async_start()
+
+        if self._tariff_sensors:
+            self.async_on_remove(
+                async_track_state_change_event(self._hass, self._tariff_sensors, self._async_on_tariff_change)
+            )
+
+        if self._state is None:
+            await self._async_restore_state()
+        if self._state is None:
+            self._state = self._default_state
 
+        # Apply the current schedule as soon as Home Assistant is running, which also applies
+        # any transition missed while it was down, rather than waiting for the next interval.
+        self.async_on_remove(async_at_started(self._hass, self._async_on_started))
+
+    async def _async_restore_state(self) -> None:
         previous_state = await self.async_get_last_state()
         if previous_state is None:
             return
@@ -223,17 +509,36 @@ class ClimateSchedulerSwitch(SwitchEntity, RestoreEntity):
             self._state = previous_state.state
 
         if ATTR_PROFILE in previous_attributes:
-            await self._async_update_profile(previous_attributes[ATTR_PROFILE])
-            await self._hass.services.async_call(
-                INPUT_SELECT_DOMAIN,
-                SERVICE_SELECT_OPTION,
-                {
-                    ATTR_ENTITY_ID: self._profile_selector.entity_id,
-                    ATTR_OPTION: self.current_profile_id,
-                },
-            )
+            from homeassistant.components.input_select import DOMAIN as INPUT_SELECT_DOMAIN
+
+            self.set_profile(previous_attributes[ATTR_PROFILE])
+            # The selector is usually created after the switch is added, starting from the restored profile
+            if self._profile_selector is not None:
+                await self._hass.services.async_call(
+                    INPUT_SELECT_DOMAIN,
+                    SERVICE_SELECT_OPTION,
+                    {
+                        ATTR_ENTITY_ID: self._profile_selector.entity_id,
+                        ATTR_OPTION: self.current_profile_id,
+                    },
+                )
+
+        if previous_attributes.get(ATTR_HOLD):
+            self._restore_hold(previous_attributes[ATTR_HOLD])
 
-        self.async_schedule_update_ha_state()
+    def _restore_hold(self, attributes: dict) -> None:
+        """Resume a hold from before the restart, unless it expired in the meantime"""
+        try:
+            until = dt_util.parse_datetime(attributes[ATTR_UNTIL])
+            climate = ComputedClimateData(*(attributes.get(field) for field in ComputedClimateData._fields))
+        except (KeyError, TypeError, ValueError):
+            _LOGGER.warning("%s: Ignoring invalid hold %s", self.entity_id, attributes)
+            return
+
+        if until is None or until <= dt_util.utcnow():
+            _LOGGER.debug("%s: Hold expired while stopped", self.entity_id)
+            return
+        self.set_hold(Hold(dt_util.as_utc(until), attributes.get(ATTR_PROFILE_ID), climate))
 
     async def _async_on_profile_selector_change(self, event) -> None:
         """Invoked when a different profile has been chosen via input select"""
@@ -241,141 +546,550 @@ class ClimateSchedulerSwitch(SwitchEntity, RestoreEntity):
         if new_state is None:
             return
 
-        _LOGGER.info(f"Profile selector changed to {new_state.state}")
+        if new_state.state == self.current_profile_id:
+            return
+
+        _LOGGER.info("%s: Profile selector changed to %s", self.entity_id, new_state.state)
         await self._async_update_profile(new_state.state)
 
+    async def _async_on_started(self, hass: HomeAssistant) -> None:
+        await self._async_optimize_cost()
+        await self.async_update_climate(source="started")
+
     async def _async_update_profile(self, new_profile_id: str) -> None:
-        if new_profile_id not in self._profiles:
-            logging.warning(f"Ignoring invalid profile with id={new_profile_id}")
+        if not self.set_profile(new_profile_id):
             return
 
+        await self.async_update_climate(source="profile")
+
+        self.async_write_state_if_changed()
+
+    def set_profile(self, new_profile_id: str) -> bool:
+        """Switch to a profile without updating climate entities, return whether it was valid"""
+        if new_profile_id not in self._profiles:
+            _LOGGER.warning("%s: Ignoring invalid profile with id=%s", self.entity_id, new_profile_id)
+            return False
+
         self._current_profile = self._profiles.get(new_profile_id)
+        self._optimal_start_until = None
+        if self._current_profile.cost_optimization is not None:
+            self._tariff_inputs = None
+            self._hass.async_create_task(self._async_on_tariff_change())
 
         self._update_schedule_trackers()
-        await self.async_update_climate()
+        return True
+
+    def set_hold(self, hold: Hold) -> bool:
+        """Hold a profile or climate settings without updating climate entities, return whether it was valid"""
+        if hold.profile_id is not None and hold.profile_id not in self._profiles:
+            _LOGGER.warning("%s: Ignoring hold of invalid profile with id=%s", self.entity_id, hold.profile_id)
+            return False
+
+        _LOGGER.info("%s: Holding until %s", self.entity_id, dt_util.as_local(hold.until))
+        active = self._active_profile
+        self._cancel_hold_timer()
+        self._hold = hold
+        self._hold_remove_callback = async_track_point_in_utc_time(self._hass, self._async_on_hold_expired, hold.until)
+        if self._active_profile is not active:
+            self._update_schedule_trackers()
+        else:
+            # The hold is part of the timeline
+            async_dispatcher_send(self._hass, SIGNAL_TIMELINE_UPDATED, self.entity_id)
+        return True
+
+    def end_hold(self, event_time: datetime | None = None) -> bool:
+        """Resume the schedule without updating climate entities, return whether a hold was ended"""
+        if self._hold is None:
+            return False
+
+        _LOGGER.info("%s: Hold ended", self.entity_id)
+        active = self._active_profile
+        self._cancel_hold_timer()
+        self._hold = None
+        if self._active_profile is not active:
+            self._update_schedule_trackers(event_time)
+        else:
+            # The hold is part of the timeline
+            async_dispatcher_send(self._hass, SIGNAL_TIMELINE_UPDATED, self.entity_id)
+        return True
+
+    @callback
+    def _cancel_hold_timer(self) -> None:
+        if self._hold_remove_callback is not None:
+            self._hold_remove_callback()
+            self._hold_remove_callback = None
+
+    async def _async_on_hold_expired(self, event_time: datetime) -> None:
+        if self._hold is None or self._hold.until != event_time:
+            # Already ended by a transition at the same time, or replaced
+            return
 
-        self.async_schedule_update_ha_state()
+        self._hold_remove_callback = None
+        self.end_hold(event_time)
+        self._hold_expired_at = event_time
+        self.async_write_state_if_changed()
+        await self.async_update_climate(event_time, source="hold_expired")
 
-    def _update_schedule_trackers(self):
-        """Update time intervals and schedule times tracked by the scheduler"""
-        if self._current_profile is None:
+    def _update_schedule_trackers(self, event_time: datetime | None = None, new_day: bool = False):
+        """Track the schedule changes planned by the applied profile for the rest of the day
+
+        When planning a new day from its midnight, changes at midnight itself are tracked too.
+        """
+        if self._active_profile is None:
             return
 
         # Clear any previous schedule trackers
         for remove_callback in self._schedule_tracker_remove_callbacks:
             remove_callback()
 
-        # Register new trackers
-        self._schedule_tracker_remove_callbacks = []
-        for schedule in self._current_profile.get_trigger_times():
-            self._schedule_tracker_remove_callbacks.append(
-                async_track_time_change(
-                    self._hass,
-                    self.async_update_climate,
-                    hour=schedule.seconds // 3600,
-                    minute=schedule.seconds // 60 % 60,
-                    second=schedule.seconds % 60,
+        dt = now() if event_time is None else dt_util.as_local(event_time)
+        day = dt.date()
+        plan = self._active_profile.get_daily_plan(day, dt.tzinfo)
+
+        # Register new trackers. They are concrete points in time rather than wall clock times
+        # so that changes of the clock, such as daylight saving time, neither skip nor repeat them.
+        self._schedule_tracker_remove_callbacks = [
+            async_track_point_in_utc_time(self._hass, self._async_on_transition, transition)
+            for transition in plan
+            if transition > dt or (new_day and transition == dt)
+        ]
+
+        # Plan the next day at midnight
+        self._schedule_tracker_remove_callbacks.append(
+            async_track_point_in_utc_time(
+                self._hass,
+                self._async_on_new_day,
+                local_time_to_utc(day + timedelta(days=1), timedelta(), dt.tzinfo),
+            )
+        )
+
+        # The schedule may have changed, let timeline subscribers and sensors know
+        async_dispatcher_send(self._hass, SIGNAL_TIMELINE_UPDATED, self.entity_id)
+        self._update_schedule_status(dt)
+
+    def _update_schedule_status(self, dt: datetime) -> None:
+        """Look up the current climate and the next change in the profile, notifying sensors of changes"""
+        status = self._profile_status(self._active_profile, dt)
+        if status == self._schedule_status:
+            return
+        self._schedule_status = status
+        async_dispatcher_send(self._hass, SIGNAL_SCHEDULE_STATUS_UPDATED, self.entity_id)
+
+    def _profile_status(self, profile: ClimateSchedulerProfile, dt: datetime) -> ScheduleStatus:
+        """Return the climate of a profile at a time and its next change"""
+        time_of_day = timedelta(hours=dt.hour, minutes=dt.minute, seconds=dt.second)
+        current = profile.compute_climate(time_of_day, dt.date())
+
+        # Skip transitions which don't change anything, such as the end of an exception date
+        # matching the regular schedule, looking into tomorrow if nothing changes today.
+        next_time = next_climate = None
+        for day in (dt.date(), dt.date() + timedelta(days=1)):
+            for transition in profile.get_daily_plan(day, dt.tzinfo):
+                local = dt_util.as_local(transition)
+                if local <= dt:
+                    continue
+                climate = profile.compute_climate(
+                    timedelta(hours=local.hour, minutes=local.minute, seconds=local.second), local.date()
                 )
+                if climate != current:
+                    next_time, next_climate = local, climate
+                    break
+            if next_time is not None:
+                break
+
+        return ScheduleStatus(current, next_time, next_climate)
+
+    async def _async_on_transition(self, event_time: datetime) -> None:
+        self._cs.watchdog.sample_lag(event_time)
+        with profiling_stage(self._cs.profiler, "trackers"):
+            if self._hold is not None and self._hold.until <= event_time:
+                # The hold ends with this transition, which applies the schedule in a single update
+                self.end_hold(event_time)
+                self.async_write_state_if_changed()
+            self._update_schedule_status(dt_util.as_local(event_time))
+        if event_time == self._hold_expired_at:
+            # Already applied when the hold expired at the same time
+            return
+        await self.async_update_climate(event_time, source="transition")
+
+    def _resolve_sun_times(self, day: date) -> None:
+        """Resolve sun relative schedules of every profile for a day"""
+        resolver = partial(resolve_sun_time, self._hass, day=day)
+        for profile in self._profiles.values():
+            if profile.has_sun_times:
+                profile.resolve_sun_times(resolver)
+
+    @callback
+    def _async_on_new_day(self, event_time: datetime) -> None:
+        self._cs.watchdog.sample_lag(event_time)
+        with self._cs.watchdog.monitor(self.entity_id, "new_day"), profiling_stage(self._cs.profiler, "trackers"):
+            if self._sun_tracker_remove_callbacks:
+                self._resolve_sun_times(dt_util.as_local(event_time).date())
+            self._update_schedule_trackers(event_time, new_day=True)
+        if self._tariff_sensors:
+            self._hass.async_create_task(self._async_on_tariff_change())
+
+    @callback
+    def _async_on_location_change(self, event) -> None:
+        self._resolve_sun_times(now().date())
+        self._update_schedule_trackers()
+
+    async def _async_on_tariff_change(self, event=None) -> None:
+        if await self._async_optimize_cost():
+            await self.async_update_climate(source="tariff")
+
+    async def _async_optimize_cost(self) -> bool:
+        """Plan cost optimal heating setpoints of the current profile, return whether they changed"""
+        profile = self._current_profile
+        conf = None if profile is None else profile.cost_optimization
+        if conf is None:
+            return False
+
+        from .tariff import parse_forecast, solve_setpoints
+
+        start = now()
+        prices = parse_forecast(self._hass.states.get(conf[CONF_TARIFF_SENSOR]), conf[CONF_TARIFF_ATTRIBUTE], start)
+        first_hour = dt_util.as_utc(start).replace(minute=0, second=0, microsecond=0)
+        hours = [dt_util.as_local(first_hour + timedelta(hours=h)) for h in range(len(prices) + 1)]
+
+        # Comfort bounds of each hour, only hours heated by the schedule are optimized
+        lower, upper = [], []
+        for hour in hours[:-1]:
+            time_of_day = timedelta(hours=hour.hour, minutes=hour.minute, seconds=hour.second)
+            data = profile.compute_climate(time_of_day, hour.date(), optimized=False)
+            heated = data.hvac_mode in (HVACMode.HEAT, HVACMode.HEAT_COOL) and data.min_temp is not None
+            lower.append(data.min_temp if heated else None)
+            upper.append(data.max_temp if heated else None)
+
+        if all(t is None for t in lower):
+            inputs = None
+        else:
+            # Without a max temperature, rooms may be pre-heated a bit above the warmest target
+            ceiling = max(t for t in lower if t is not None) + conf[CONF_TARIFF_PREHEAT_MARGIN]
+            upper = [None if lo is None else (up if up is not None else ceiling) for lo, up in zip(lower, upper)]
+            inputs = (
+                prices,
+                tuple(lower),
+                tuple(upper),
+                self._current_temperature(lower),
+                self._heating_rate(conf),
+                conf[CONF_TARIFF_LOSS_RATE],
             )
 
+        if inputs == self._tariff_inputs:
+            return False
+        self._tariff_inputs = inputs
+
+        if inputs is None:
+            profile.set_optimized_setpoints([])
+        else:
+            setpoints = await self._hass.async_add_executor_job(solve_setpoints, *inputs)
+            if profile is not self._current_profile:
+                return False
+            profile.set_optimized_setpoints([*zip(hours, setpoints), (hours[-1], None)])
+
+        _LOGGER.debug("%s: Optimized setpoints for the next %s hours", self.entity_id, len(prices))
+        self._update_schedule_trackers()
+        return True
+
+    def _current_temperature(self, lower: list[float | None]) -> float:
+        """Return the mean temperature of the climate entities, rounded for the solver cache"""
+        temperatures = []
+        for entity in self._climate_entities:
+            state = self._hass.states.get(entity)
+            try:
+                temperatures.append(float(state.attributes[ATTR_CURRENT_TEMPERATURE]))
+            except (AttributeError, KeyError, TypeError, ValueError):
+                continue
+        if not temperatures:
+            return next(t for t in lower if t is not None)
+        return round(sum(temperatures) / len(temperatures) / TARIFF_STEP) * TARIFF_STEP
+
+    def _heating_rate(self, conf: dict) -> float:
+        """Return the learnt heating rate of the slowest entity, or the configured one"""
+        rate = None if self._optimal_start is None else self._optimal_start.heating_rate
+        return max(round(rate, 1), 0.1) if rate else conf[CONF_TARIFF_HEATING_RATE]
+
     async def async_turn_on(self, **kwargs) -> None:
-        _LOGGER.info(self.entity_id + ": Turn on")
+        _LOGGER.info("%s: Turn on", self.entity_id)
 
         self._state = STATE_ON
-        await self.async_update_climate()
-        self.async_schedule_update_ha_state()
+        if self.is_paused:
+            with self._cs.watchdog.monitor(self.entity_id, "turn_on") as run:
+                run.call = await async_dispatch_commands(self._hass, self._plan_idle("turn_on"))
+        else:
+            await self.async_update_climate(source="turn_on")
+        self.async_write_state_if_changed()
 
     async def async_turn_off(self, **kwargs) -> None:
-        _LOGGER.info(self.entity_id + ": Turn off")
+        _LOGGER.info("%s: Turn off", self.entity_id)
 
         self._state = STATE_OFF
-        self.async_schedule_update_ha_state()
-
-    async def async_update_climate(self, *args, **kwargs) -> None:
-        """Update all climate entities controlled by the swtich"""
-        _LOGGER.info(self.entity_id + ": Updating climate")
-
+        self.async_write_state_if_changed()
+        await self._cs.async_release(self)
+
+    async def async_update_climate(self, event_time: datetime | None = None, source: str = "update") -> None:
+        """Update all climate entities controlled by the swtich.
+
+        Time trackers pass the time they were planned for, which is used instead of the current time.
+        The source of the update is recorded in the decision trace.
+        """
+        _LOGGER.debug("%s: Updating climate (%s)", self.entity_id, source)
+        with self._cs.watchdog.monitor(self.entity_id, source) as run:
+            profiler = self._cs.profiler
+            if profiler is None:
+                run.call = await async_dispatch_commands(self._hass, self.plan_climate(event_time, source))
+                return
+
+            started = time.perf_counter()
+            commands = self.plan_climate(event_time, source)
+            with profiler.stage("dispatch"):
+                rounds = group_commands(commands)
+            with profiler.stage("await", profiled=False):
+                run.call = await async_send_rounds(self._hass, rounds)
+            profiler.async_end_update(self.entity_id, source, time.perf_counter() - started)
+
+    async def _async_on_pause_change(self) -> None:
+        """Turn the climate entities off when paused and resume the schedule afterwards"""
+        self.async_write_state_if_changed()
         if not self.is_on:
-            _LOGGER.info(self.entity_id + ": Disabled")
             return
 
-        if self._current_profile is None:
-            _LOGGER.info(self.entity_id + ": No profile")
+        if self.is_paused:
+            _LOGGER.info("%s: Pausing", self.entity_id)
+            with self._cs.watchdog.monitor(self.entity_id, "pause") as run:
+                run.call = await async_dispatch_commands(self._hass, self._plan_idle("pause"))
+        else:
+            _LOGGER.info("%s: Resuming", self.entity_id)
+            await self.async_update_climate(source="resume")
+
+    def _plan_idle(self, source: str) -> list[ClimateCommand]:
+        started = time.perf_counter()
+        commands, skipped = [], 0
+        for entity in self._climate_entities:
+            if not self._cs.is_controller(self, entity):
+                skipped += 1
+                continue
+            entity_commands = self._plan_entity_phase(entity, False, None)
+            skipped += not entity_commands
+            commands.extend(entity_commands)
+
+        self._trace.record(
+            source,
+            self.active_profile_id,
+            target=self._idle_climate,
+            commands=len(commands),
+            skipped=skipped,
+            reason="paused",
+            duration=time.perf_counter() - started,
+        )
+        return commands
+
+    def plan_climate(self, event_time: datetime | None = None, source: str = "update") -> list[ClimateCommand]:
+        """Return the commands bringing the climate entities controlled by the switch to the schedule"""
+        started = time.perf_counter()
+        segment = climate_data = reason = None
+        commands, skipped = [], 0
+        profile = self._active_profile
+        if not self.is_on:
+            reason = "off"
+        elif profile is None:
+            reason = "no_profile"
+        elif self.is_paused:
+            reason = "paused"
+        else:
+            profiler = self._cs.profiler
+            with profiling_stage(profiler, "compute"):
+                dt = now() if event_time is None else dt_util.as_local(event_time)
+                time_of_day = timedelta(hours=dt.hour, minutes=dt.minute, seconds=dt.second)
+                segment = profile.get_segment(time_of_day, dt.date())
+                climate_data = profile.compute_climate(time_of_day, dt.date())
+                if self._hold is not None:
+                    climate_data = hold_climate(climate_data, self._hold.climate)
+                elif self._optimal_start is not None and climate_data is not None:
+                    climate_data = self._apply_optimal_start(dt, time_of_day, climate_data)
+            if climate_data is None:
+                reason = "no_climate"
+            else:
+                with profiling_stage(profiler, "plan"):
+                    commands, skipped = self._plan_entities(climate_data)
+
+        if reason is not None:
+            _LOGGER.debug("%s: Not updating climate (%s)", self.entity_id, reason)
+        self._trace.record(
+            source,
+            self.active_profile_id,
+            segment,
+            climate_data,
+            len(commands),
+            skipped,
+            reason,
+            time.perf_counter() - started,
+        )
+        return commands
+
+    def _plan_entities(self, climate_data: ComputedClimateData) -> tuple[list[ClimateCommand], int]:
+        """Plan the commands of every controlled entity, also returning how many entities were skipped"""
+        # The profile is evaluated once, entities sharing an adjustment share its result
+        adjusted: dict[ClimateAdjustment, ComputedClimateData] = {}
+        commands, skipped = [], 0
+        for entity in self._climate_entities:
+            # Climate entities shared with other switches are only updated by the active one with the
+            # highest priority
+            if not self._cs.is_controller(self, entity):
+                skipped += 1
+                continue
+
+            adjustment = self._adjustments[entity]
+            entity_data = adjusted.get(adjustment)
+            if entity_data is None:
+                entity_data = adjusted[adjustment] = adjust_climate(climate_data, adjustment)
+            entity_commands = self._plan_regulated_entity(entity, entity_data)
+            skipped += not entity_commands
+            commands.extend(entity_commands)
+
+        return commands, skipped
+
+    def _plan_regulated_entity(self, entity: str, data: ComputedClimateData) -> list[ClimateCommand]:
+        """Plan the schedule of an entity, or idle it while its temperature is within the band"""
+        active = self._hysteresis is None or self._hysteresis.update_target(entity, data)
+        return self._plan_entity_phase(entity, active, data)
+
+    def _plan_entity_phase(self, entity: str, active: bool, data: ComputedClimateData | None) -> list[ClimateCommand]:
+        """Plan the active or idle commands of an entity, only when its phase or settings changed"""
+        if not active:
+            data = self._idle_climate
+        if not self._cs.update_phase(entity, active, data):
+            return []
+        commands = self._plan_climate_entity(entity, data)
+        if self._cs.acknowledgements is not None:
+            self._cs.acknowledgements.expect(entity, commands)
+        return commands
+
+    async def _async_on_demand_change(self, entity: str, data: ComputedClimateData) -> None:
+        """Start or stop an entity when its temperature leaves the band"""
+        if not self.is_on or self.is_paused or not self._cs.is_controller(self, entity):
             return
 
-        # TODO: Track temperature of entities. Only heat/cool if under/above threshold
-        # TODO: Allow specifying a desired idle mode (e.g. fan-only for allergies,
-        # forest fire, etc.)
-
-        dt = now()
-        time_of_day = timedelta(hours=dt.hour, minutes=dt.minute, seconds=dt.second)
-        climate_data = self._current_profile.compute_climate(time_of_day)
+        with self._cs.watchdog.monitor(self.entity_id, "hysteresis") as run:
+            started = time.perf_counter()
+            commands = self._plan_regulated_entity(entity, data)
+            self._trace.record(
+                "hysteresis",
+                self.active_profile_id,
+                target=data,
+                commands=len(commands),
+                skipped=not commands,
+                duration=time.perf_counter() - started,
+            )
+            run.call = await async_dispatch_commands(self._hass, commands)
+
+    def _apply_optimal_start(
+        self, dt: datetime, time_of_day: timedelta, climate_data: ComputedClimateData
+    ) -> ComputedClimateData:
+        """Apply the next schedule early when the climate entities need time to reach it"""
+        transition = self._current_profile.get_next_transition(time_of_day, dt.date())
+        if transition is None:
+            self._track_optimal_start(None)
+            return climate_data
+
+        next_time, next_data = transition
+        transition_dt = local_time_to_utc(dt.date(), next_time, dt.tzinfo)
+
+        # Once started early, stick to the next schedule until it begins even if the
+        # predicted lead time shrinks as the rooms get closer to their target.
+        if self._optimal_start_until == transition_dt:
+            return next_data
+
+        lead = self._optimal_start.lead_time(next_data)
+        if not lead:
+            self._track_optimal_start(None)
+            return climate_data
+
+        start = transition_dt - lead
+        if dt < start:
+            self._track_optimal_start(start)
+            return climate_data
+
+        _LOGGER.debug("%s: Optimal start of schedule at %s", self.entity_id, next_time)
+        self._track_optimal_start(start, arm=False)
+        self._optimal_start_until = transition_dt
+        return next_data
+
+    def _track_optimal_start(self, start: datetime | None, arm: bool = True) -> None:
+        """Schedule an update at the time the next schedule must start early"""
+        if self._optimal_start_remove_callback is not None:
+            self._optimal_start_remove_callback()
+            self._optimal_start_remove_callback = None
+
+        if start is not None and arm:
+            self._optimal_start_remove_callback = async_track_point_in_time(
+                self._hass, partial(self.async_update_climate, source="optimal_start"), start
+            )
 
-        update_tasks = [
-            asyncio.create_task(self._async_update_climate_entity(entity, climate_data))
-            for entity in self._climate_entities
-        ]
-        await asyncio.gather(*update_tasks)
+        if start != self._optimal_start_time:
+            self._optimal_start_time = start
+            self.async_write_state_if_changed()
 
-    async def _async_update_climate_entity(self, entity: str, data: ComputedClimateData | None) -> None:
+    def _plan_climate_entity(self, entity: str, data: ComputedClimateData | None) -> list[ClimateCommand]:
         if data is None:
-            return
+            return []
 
-        await self._async_set_climate_hvac_mode(entity, data.hvac_mode)
-        await self._async_set_climate_fan_mode(entity, data.fan_mode)
-        await self._async_set_climate_swing_mode(entity, data.swing_mode)
-        await self._async_set_climate_temperature(entity, data.hvac_mode, data.min_temp, data.max_temp)
+        commands = [
+            self._plan_climate_hvac_mode(entity, data.hvac_mode),
+            self._plan_climate_fan_mode(entity, data.fan_mode),
+            self._plan_climate_swing_mode(entity, data.swing_mode),
+            self._plan_climate_temperature(entity, data.hvac_mode, data.min_temp, data.max_temp),
+        ]
+        return [c for c in commands if c is not None]
 
-    async def _async_set_climate_hvac_mode(
+    def _plan_climate_hvac_mode(
         self,
         entity: str,
         hvac_mode: str,
-    ):
+    ) -> ClimateCommand | None:
         if hvac_mode is None:
-            _LOGGER.info(self.entity_id + ": No HVAC mode")
-            return
+            _LOGGER.debug("%s: No HVAC mode", self.entity_id)
+            return None
 
-        data = {ATTR_ENTITY_ID: entity, ATTR_HVAC_MODE: hvac_mode}
-        await self._hass.services.async_call(CLIMATE_DOMAIN, SERVICE_SET_HVAC_MODE, data)
+        return ClimateCommand(SERVICE_SET_HVAC_MODE, entity, ((ATTR_HVAC_MODE, hvac_mode),))
 
-    async def _async_set_climate_temperature(
+    def _plan_climate_temperature(
         self,
         entity: str,
         hvac_mode: str,
         min_temperature: float | None,
         max_temperature: float | None,
-    ):
+    ) -> ClimateCommand | None:
         if hvac_mode is None:
-            return
+            return None
 
         if min_temperature is None and max_temperature is None:
-            return
+            return None
 
         # TODO: Validation could be more robust here
-        data = {ATTR_ENTITY_ID: entity, ATTR_HVAC_MODE: hvac_mode}
+        data = [(ATTR_HVAC_MODE, hvac_mode)]
         if hvac_mode == "heat":
-            data[ATTR_TEMPERATURE] = min_temperature
+            data.append((ATTR_TEMPERATURE, min_temperature))
         elif hvac_mode == "cool":
-            data[ATTR_TEMPERATURE] = max_temperature
+            data.append((ATTR_TEMPERATURE, max_temperature))
         elif hvac_mode == "heat_cool":
-            data[ATTR_TARGET_TEMP_LOW] = min_temperature
-            data[ATTR_TARGET_TEMP_HIGH] = max_temperature
+            data.append((ATTR_TARGET_TEMP_LOW, min_temperature))
+            data.append((ATTR_TARGET_TEMP_HIGH, max_temperature))
 
-        await self._hass.services.async_call(CLIMATE_DOMAIN, SERVICE_SET_TEMPERATURE, data)
+        return ClimateCommand(SERVICE_SET_TEMPERATURE, entity, tuple(data))
 
-    async def _async_set_climate_fan_mode(self, entity: str, fan_mode: str):
+    def _plan_climate_fan_mode(self, entity: str, fan_mode: str) -> ClimateCommand | None:
         if fan_mode is None:
-            return
+            return None
 
-        data = {ATTR_ENTITY_ID: entity, ATTR_FAN_MODE: fan_mode}
-        await self._hass.services.async_call(CLIMATE_DOMAIN, SERVICE_SET_FAN_MODE, data)
+        return ClimateCommand(SERVICE_SET_FAN_MODE, entity, ((ATTR_FAN_MODE, fan_mode),))
 
-    async def _async_set_climate_swing_mode(self, entity: str, swing_mode: str):
+    def _plan_climate_swing_mode(self, entity: str, swing_mode: str) -> ClimateCommand | None:
         if swing_mode is None:
-            return
+            return None
 
-        data = {ATTR_ENTITY_ID: entity, ATTR_SWING_MODE: swing_mode}
-        await self._hass.services.async_call(CLIMATE_DOMAIN, SERVICE_SET_SWING_MODE, data)
+        return ClimateCommand(SERVICE_SET_SWING_MODE, entity, ((ATTR_SWING_MODE, swing_mode),))
 
 
 async def async_setup_platform(
@@ -390,9 +1104,22 @@ async def async_setup_platform(
     if cs is None:
         return False
 
-    cs_switch = ClimateSchedulerSwitch(hass, cs, config)
+    try:
+        profiles = await cs.profile_snapshots.async_validate(config[CONF_PROFILES])
+    except vol.Invalid as err:
+        _LOGGER.error(
+            "Invalid profiles for climate scheduler %s: %s",
+            config.get(CONF_NAME),
+            humanize_error(config[CONF_PROFILES], err),
+        )
+        return False
+
+    cs_switch = ClimateSchedulerSwitch(hass, cs, {**config, CONF_PROFILES: profiles})
     async_add_entities([cs_switch], True)
 
     await cs_switch.async_create_profile_selector()
 
+    if config.get(CONF_SENSORS):
+        await async_load_platform(hass, Platform.SENSOR, DOMAIN, {ATTR_ENTITY_ID: cs_switch.entity_id}, cs.hass_config)
+
     return True
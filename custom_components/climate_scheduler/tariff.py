@@ -0,0 +1,140 @@
+"""Tariff aware setpoint optimization for Climate Scheduler."""
+
+import logging
+import math
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+import homeassistant.helpers.config_validation as cv
+import voluptuous as vol
+from homeassistant.core import State
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CONF_TARIFF_ATTRIBUTE,
+    CONF_TARIFF_HEATING_RATE,
+    CONF_TARIFF_LOSS_RATE,
+    CONF_TARIFF_PREHEAT_MARGIN,
+    CONF_TARIFF_SENSOR,
+    TARIFF_HORIZON,
+    TARIFF_MAX_STATES,
+    TARIFF_SOLVER_CACHE_SIZE,
+    TARIFF_STEP,
+)
+from .validation import lazy_schemas
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _cost_optimization_schema() -> vol.Schema:
+    return vol.Schema(
+        {
+            vol.Required(CONF_TARIFF_SENSOR): cv.entity_id,
+            vol.Optional(CONF_TARIFF_ATTRIBUTE, default="forecast"): cv.string,
+            vol.Optional(CONF_TARIFF_HEATING_RATE, default=1.0): vol.All(vol.Coerce(float), vol.Range(min=0.1)),
+            vol.Optional(CONF_TARIFF_LOSS_RATE, default=0.5): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Optional(CONF_TARIFF_PREHEAT_MARGIN, default=2.0): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        }
+    )
+
+
+__getattr__ = lazy_schemas(globals(), COST_OPTIMIZATION_SCHEMA=_cost_optimization_schema)
+
+# Cost of each degree below or above the comfort bounds, large enough to only be paid when unavoidable
+_DISCOMFORT_COST = 1e6
+
+
+def parse_forecast(state: State | None, attribute: str, start: datetime) -> tuple[float, ...]:
+    """Return the hourly prices of a tariff sensor, starting with the hour of a time.
+
+    The forecast attribute is a list of entries with a start time and a price or value. Each hour
+    costs the price of the latest entry started by then. Prices stop at the end of the forecast.
+    """
+    if state is None:
+        return ()
+
+    entries = []
+    for entry in state.attributes.get(attribute) or ():
+        try:
+            entry_start = dt_util.parse_datetime(str(entry["start"]))
+            price = float(entry["price"] if "price" in entry else entry["value"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if entry_start is not None:
+            entries.append((dt_util.as_utc(entry_start), price))
+    if not entries:
+        return ()
+
+    entries.sort()
+    hour = dt_util.as_utc(start).replace(minute=0, second=0, microsecond=0)
+    last_start = entries[-1][0]
+    prices = []
+    index = 0
+    for _ in range(TARIFF_HORIZON):
+        while index < len(entries) and entries[index][0] <= hour:
+            index += 1
+        if index == 0 or (index == len(entries) and hour >= last_start + timedelta(hours=1)):
+            break
+        prices.append(entries[index - 1][1])
+        hour += timedelta(hours=1)
+    return tuple(prices)
+
+
+@lru_cache(maxsize=TARIFF_SOLVER_CACHE_SIZE)
+def solve_setpoints(
+    prices: tuple[float, ...],
+    lower: tuple[float | None, ...],
+    upper: tuple[float | None, ...],
+    start: float,
+    heating_rate: float,
+    loss_rate: float,
+) -> tuple[float | None, ...]:
+    """Return the temperature to reach by the end of each hour at the lowest cost.
+
+    The room loses loss_rate degrees per hour and heating at full power adds heating_rate degrees
+    per hour at the price of that hour. Temperatures must stay within the comfort bounds of each
+    hour, hours without a lower bound aren't heated for comfort and get no setpoint.
+
+    Dynamic programming over discretized temperatures, with a bounded number of temperatures so
+    that the solve time doesn't depend on the bounds.
+    """
+    hours = len(prices)
+    bounds = [t for t in (*lower, *upper, start) if t is not None]
+    low, high = min(bounds), max(bounds)
+    step = max(TARIFF_STEP, (high - low) / (TARIFF_MAX_STATES - 1))
+    grid = [low + i * step for i in range(int(math.ceil((high - low) / step)) + 1)]
+
+    costs = [math.inf] * len(grid)
+    costs[min(range(len(grid)), key=lambda i: abs(grid[i] - start))] = 0.0
+    choices: list[list[int]] = []
+    for hour in range(hours):
+        next_costs = [math.inf] * len(grid)
+        next_choices = [0] * len(grid)
+        for i, cost in enumerate(costs):
+            if cost == math.inf:
+                continue
+            coasting = grid[i] - loss_rate
+            for j, temperature in enumerate(grid):
+                # Rounding to the grid may let a coasting room settle one step above its drift
+                if temperature < coasting - step or temperature > coasting + heating_rate + 1e-9:
+                    continue
+                duty = max(0.0, temperature - coasting) / heating_rate
+                total = cost + prices[hour] * duty
+                if lower[hour] is not None and temperature < lower[hour]:
+                    total += _DISCOMFORT_COST * (lower[hour] - temperature)
+                if upper[hour] is not None and temperature > upper[hour]:
+                    total += _DISCOMFORT_COST * (temperature - upper[hour])
+                if total < next_costs[j]:
+                    next_costs[j] = total
+                    next_choices[j] = i
+        costs = next_costs
+        choices.append(next_choices)
+
+    # Walk the cheapest path back from the end of the horizon
+    index = min(range(len(grid)), key=lambda i: costs[i])
+    setpoints: list[float | None] = [None] * hours
+    for hour in range(hours - 1, -1, -1):
+        if lower[hour] is not None:
+            setpoints[hour] = round(grid[index], 2)
+        index = choices[hour][index]
+    return tuple(setpoints)
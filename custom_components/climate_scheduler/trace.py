@@ -0,0 +1,67 @@
+"""Decision trace of Climate Scheduler switches."""
+
+from collections import deque, namedtuple
+from datetime import datetime, timedelta
+
+from homeassistant.util import dt as dt_util
+
+from .common import ComputedClimateData
+from .const import TRACE_SIZE
+
+# A single decision of a switch. The target is the climate computed by the profile before
+# per entity adjustments, commands counts the service calls planned and skipped the controlled
+# entities which were already up to date. Reason explains decisions which planned nothing at all.
+TraceEntry = namedtuple(
+    "TraceEntry",
+    ["time", "source", "profile", "segment", "target", "commands", "skipped", "reason", "duration"],
+)
+
+
+class DecisionTrace:
+    """Fixed size history of the latest decisions of a switch, oldest first."""
+
+    __slots__ = ("_entries",)
+
+    def __init__(self, size: int = TRACE_SIZE) -> None:
+        self._entries: deque[TraceEntry] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def record(
+        self,
+        source: str,
+        profile: str | None,
+        segment: timedelta | None = None,
+        target: ComputedClimateData | None = None,
+        commands: int = 0,
+        skipped: int = 0,
+        reason: str | None = None,
+        duration: float = 0.0,
+    ) -> None:
+        """Add a decision, dropping the oldest one once the trace is full."""
+        self._entries.append(
+            TraceEntry(dt_util.utcnow(), source, profile, segment, target, commands, skipped, reason, duration)
+        )
+
+    def as_list(self) -> list[dict]:
+        """Return the decisions in a JSON friendly form."""
+        return [_entry_as_dict(entry) for entry in self._entries]
+
+
+def _entry_as_dict(entry: TraceEntry) -> dict:
+    return {
+        "time": _isoformat(entry.time),
+        "source": entry.source,
+        "profile": entry.profile,
+        "segment": None if entry.segment is None else str(entry.segment),
+        "target": None if entry.target is None else entry.target._asdict(),
+        "commands": entry.commands,
+        "skipped": entry.skipped,
+        "reason": entry.reason,
+        "duration_ms": round(entry.duration * 1000, 3),
+    }
+
+
+def _isoformat(time: datetime) -> str:
+    return dt_util.as_local(time).isoformat()
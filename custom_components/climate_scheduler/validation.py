@@ -1,10 +1,57 @@
 """Validation logic for Climate Scheduler."""
 
+import re
+from collections.abc import Callable
 from datetime import timedelta
+from typing import Any
 
+import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
+from homeassistant.components.climate import HVAC_MODES
+from homeassistant.const import CONF_ENTITY_ID, SUN_EVENT_SUNRISE, SUN_EVENT_SUNSET, WEEKDAYS
 
-from .const import CONF_PROFILE_ID, CONF_SCHEDULE_TIME
+from .common import SunRelativeTime
+from .const import (
+    CONF_CLIMATE_ENTITY_OFFSET,
+    CONF_PROFILE_EXTENDS,
+    CONF_PROFILE_ID,
+    CONF_PROFILE_SCHEDULE,
+    CONF_SCHEDULE_DATES,
+    CONF_SCHEDULE_DAYS,
+    CONF_SCHEDULE_FAN_MODE,
+    CONF_SCHEDULE_HVAC,
+    CONF_SCHEDULE_SWING_MODE,
+    CONF_SCHEDULE_TIME,
+    CONF_TEMPERATURE_SENSOR,
+)
+
+CLIMATE_ENTITY_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_ENTITY_ID): cv.entity_id,
+        vol.Optional(CONF_CLIMATE_ENTITY_OFFSET, default=0.0): vol.Coerce(float),
+        vol.Optional(CONF_SCHEDULE_HVAC): vol.All(cv.string, vol.In(HVAC_MODES)),
+        vol.Optional(CONF_SCHEDULE_FAN_MODE): cv.string,
+        vol.Optional(CONF_SCHEDULE_SWING_MODE): cv.string,
+        vol.Optional(CONF_TEMPERATURE_SENSOR): cv.entity_id,
+    }
+)
+
+
+def lazy_schemas(module_globals: dict, **builders: Callable[[], Any]) -> Callable[[str], Any]:
+    """Return a module __getattr__ building schemas on first use.
+
+    Schemas of profiles are only needed when a configuration changed since its last validation, so
+    modules don't build them on import.
+    """
+
+    def __getattr__(name: str) -> Any:
+        builder = builders.get(name)
+        if builder is None:
+            raise AttributeError(f"module {module_globals['__name__']!r} has no attribute {name!r}")
+        schema = module_globals[name] = builder()
+        return schema
+
+    return __getattr__
 
 
 def less_than_24h(delta: timedelta) -> timedelta:
@@ -14,6 +61,28 @@ def less_than_24h(delta: timedelta) -> timedelta:
     return delta
 
 
+SUN_TIME_PATTERN = re.compile(rf"^\s*({SUN_EVENT_SUNRISE}|{SUN_EVENT_SUNSET})\s*(?:([+-])\s*(\S+))?\s*$")
+
+
+def schedule_time(value) -> timedelta | SunRelativeTime:
+    """Validate a schedule time, either a time of day or a time relative to sunrise or sunset."""
+    if isinstance(value, str):
+        match = SUN_TIME_PATTERN.match(value.lower())
+        if match:
+            event, sign, offset = match.groups()
+            offset = cv.positive_time_period(offset) if offset else timedelta()
+            return SunRelativeTime(event, -offset if sign == "-" else offset)
+
+    return less_than_24h(cv.positive_time_period(value))
+
+
+def climate_entity(value) -> dict:
+    """Validate a climate entity of a scheduler, given either as an entity ID or with adjustments."""
+    if isinstance(value, str):
+        value = {CONF_ENTITY_ID: value}
+    return CLIMATE_ENTITY_SCHEMA(value)
+
+
 def unique_profiles(profiles: dict) -> dict:
     """Validate that profile IDs are unique."""
     names = [p.get(CONF_PROFILE_ID) for p in profiles]
@@ -22,9 +91,67 @@ def unique_profiles(profiles: dict) -> dict:
     return profiles
 
 
+def _schedule_slot(schedule: dict) -> tuple:
+    """Return the time and days a schedule entry applies to."""
+    days = schedule.get(CONF_SCHEDULE_DAYS)
+    dates = schedule.get(CONF_SCHEDULE_DATES)
+    return (
+        schedule.get(CONF_SCHEDULE_TIME),
+        None if days is None else frozenset(days),
+        None if dates is None else frozenset(dates),
+    )
+
+
+def resolve_profile_extends(profiles: list) -> list:
+    """Flatten profiles extending another profile of the scheduler.
+
+    An extending profile inherits the defaults and schedule of its base. Its own defaults take
+    precedence and its schedule entries replace base entries with the same time and days. Inherited
+    entries are shared with the base profile rather than copied.
+    """
+    configs = {p[CONF_PROFILE_ID]: p for p in profiles}
+    resolved: dict[str, dict] = {}
+
+    def _resolve(profile_id: str, chain: tuple[str, ...]) -> dict:
+        if profile_id in resolved:
+            return resolved[profile_id]
+
+        config = configs[profile_id]
+        base_id = config.get(CONF_PROFILE_EXTENDS)
+        if base_id is None:
+            resolved[profile_id] = config
+            return config
+
+        if base_id not in configs:
+            raise vol.Invalid(f"Profile {profile_id} extends unknown profile {base_id}")
+        if base_id in chain:
+            raise vol.Invalid(f"Profile {profile_id} extends itself through {' -> '.join(chain)}")
+
+        base = _resolve(base_id, (*chain, profile_id))
+        schedule = {_schedule_slot(s): s for s in base.get(CONF_PROFILE_SCHEDULE, [])}
+        schedule.update((_schedule_slot(s), s) for s in config.get(CONF_PROFILE_SCHEDULE, []))
+
+        flattened = {**base, **config, CONF_PROFILE_SCHEDULE: list(schedule.values())}
+        del flattened[CONF_PROFILE_EXTENDS]
+        try:
+            unique_schedule_times(flattened[CONF_PROFILE_SCHEDULE])
+        except vol.Invalid as err:
+            raise vol.Invalid(f"Profile {profile_id}: {err}") from err
+
+        resolved[profile_id] = flattened
+        return flattened
+
+    return [_resolve(p[CONF_PROFILE_ID], ()) for p in profiles]
+
+
 def unique_schedule_times(schedules: dict) -> dict:
-    """Validate that schedule times are unique within a profile."""
-    times = [s.get(CONF_SCHEDULE_TIME).total_seconds() for s in schedules]
-    if (len(times)) != len(set(times)):
+    """Validate that schedule times are unique within a profile for any given day."""
+    slots = []
+    for s in schedules:
+        time = s.get(CONF_SCHEDULE_TIME)
+        seconds = time.total_seconds() if isinstance(time, timedelta) else time
+        days = s.get(CONF_SCHEDULE_DATES) or s.get(CONF_SCHEDULE_DAYS) or WEEKDAYS
+        slots.extend((day, seconds) for day in days)
+    if len(slots) != len(set(slots)):
         raise vol.Invalid("Schedule times must be unique within a profile")
     return schedules
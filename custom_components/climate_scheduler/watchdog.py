@@ -0,0 +1,115 @@
+"""Callback duration and event loop lag watchdog for Climate Scheduler."""
+
+import logging
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import datetime
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .common import ServiceCallTiming
+from .const import SIGNAL_WATCHDOG_UPDATED, WATCHDOG_LAG_WINDOW
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CallbackRun:
+    """A monitored callback, told about the slowest service call it made."""
+
+    __slots__ = ("call",)
+
+    def __init__(self) -> None:
+        self.call: ServiceCallTiming | None = None
+
+
+class CallbackWatchdog:
+    """Flags scheduler callbacks running over a time budget and samples event loop lag.
+
+    Lag is how late the timers of a schedule boundary fire, which is when every switch updates at
+    once. The worst lag of a boundary is published once all its timers had a chance to run.
+    """
+
+    def __init__(self, hass: HomeAssistant, budget: float) -> None:
+        """Initialize the watchdog with a budget in seconds."""
+        self._hass = hass
+        self._budget = budget
+        self.slow_callbacks = 0
+        self.last_slow_callback: dict | None = None
+        self.boundary: datetime | None = None
+        self.lag: float | None = None
+        self.max_lag = 0.0
+        self._pending: tuple[datetime, float] | None = None
+        self._cancel_publish: Callable[[], None] | None = None
+
+    @contextmanager
+    def monitor(self, entity_id: str, name: str) -> Iterator[CallbackRun]:
+        """Time a callback, flagging it when it runs over budget."""
+        run = CallbackRun()
+        start = time.perf_counter()
+        try:
+            yield run
+        finally:
+            duration = time.perf_counter() - start
+            if duration > self._budget:
+                self._flag(entity_id, name, duration, run.call)
+
+    def _flag(self, entity_id: str, name: str, duration: float, call: ServiceCallTiming | None) -> None:
+        self.slow_callbacks += 1
+        self.last_slow_callback = {
+            "entity_id": entity_id,
+            "callback": name,
+            "duration_ms": round(duration * 1000, 1),
+            "time": dt_util.now().isoformat(),
+            "service": None if call is None else f"climate.{call.service}",
+            "target": None if call is None else call.entity_id,
+            "service_duration_ms": None if call is None else round(call.duration * 1000, 1),
+        }
+        if call is None:
+            _LOGGER.warning("%s: %s took %.2f s, over the %.2f s budget", entity_id, name, duration, self._budget)
+        else:
+            _LOGGER.warning(
+                "%s: %s took %.2f s, over the %.2f s budget, the slowest call was climate.%s for %s (%.2f s)",
+                entity_id,
+                name,
+                duration,
+                self._budget,
+                call.service,
+                call.entity_id,
+                call.duration,
+            )
+        async_dispatcher_send(self._hass, SIGNAL_WATCHDOG_UPDATED)
+
+    @callback
+    def sample_lag(self, scheduled: datetime) -> None:
+        """Record how late the timer of a schedule boundary fired."""
+        lag = max((dt_util.utcnow() - scheduled).total_seconds(), 0.0)
+        if self._pending is not None and self._pending[0] == scheduled:
+            self._pending = (scheduled, max(lag, self._pending[1]))
+            return
+
+        self._async_publish_lag()
+        self._pending = (scheduled, lag)
+        self._cancel_publish = async_call_later(self._hass, WATCHDOG_LAG_WINDOW, self._async_on_window_end)
+
+    @callback
+    def _async_on_window_end(self, _now: datetime) -> None:
+        self._cancel_publish = None
+        self._async_publish_lag()
+
+    @callback
+    def _async_publish_lag(self) -> None:
+        if self._cancel_publish is not None:
+            self._cancel_publish()
+            self._cancel_publish = None
+        if self._pending is None:
+            return
+
+        self.boundary, self.lag = self._pending
+        self._pending = None
+        self.max_lag = max(self.max_lag, self.lag)
+        _LOGGER.debug("Schedule boundary %s fired %.3f s late", self.boundary, self.lag)
+        async_dispatcher_send(self._hass, SIGNAL_WATCHDOG_UPDATED)
@@ -0,0 +1,71 @@
+"""Websocket API of Climate Scheduler."""
+
+import homeassistant.helpers.config_validation as cv
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import ATTR_VERSION, DATA_CLIMATE_SCHEDULER, SIGNAL_TIMELINE_UPDATED
+
+
+@callback
+def async_setup_websocket_api(hass: HomeAssistant, domain: str) -> None:
+    """Register the websocket commands of the component."""
+
+    @websocket_api.websocket_command(
+        {
+            vol.Required("type"): f"{domain}/timeline",
+            vol.Required("entity_id"): cv.entity_id,
+            vol.Optional(ATTR_VERSION): cv.string,
+        }
+    )
+    @callback
+    def websocket_timeline(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict) -> None:
+        """Return the timeline of a switch, or nothing if the client already has its version."""
+        switch = hass.data[DATA_CLIMATE_SCHEDULER].get_switch(msg["entity_id"])
+        if switch is None:
+            connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "Climate scheduler not found")
+            return
+
+        timeline = switch.timeline
+        connection.send_result(msg["id"], {} if timeline[ATTR_VERSION] == msg.get(ATTR_VERSION) else timeline)
+
+    @websocket_api.websocket_command(
+        {
+            vol.Required("type"): f"{domain}/subscribe_timeline",
+            vol.Required("entity_id"): cv.entity_id,
+        }
+    )
+    @callback
+    def websocket_subscribe_timeline(
+        hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+    ) -> None:
+        """Send the timeline of a switch, then again each time it changes."""
+        switch = hass.data[DATA_CLIMATE_SCHEDULER].get_switch(msg["entity_id"])
+        if switch is None:
+            connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "Climate scheduler not found")
+            return
+
+        sent_version = None
+
+        @callback
+        def _async_send_timeline(entity_id: str | None = None) -> None:
+            nonlocal sent_version
+            if entity_id not in (None, msg["entity_id"]):
+                return
+
+            timeline = switch.timeline
+            if timeline[ATTR_VERSION] == sent_version:
+                return
+            sent_version = timeline[ATTR_VERSION]
+            connection.send_message(websocket_api.event_message(msg["id"], timeline))
+
+        connection.subscriptions[msg["id"]] = async_dispatcher_connect(
+            hass, SIGNAL_TIMELINE_UPDATED, _async_send_timeline
+        )
+        connection.send_result(msg["id"])
+        _async_send_timeline()
+
+    websocket_api.async_register_command(hass, websocket_timeline)
+    websocket_api.async_register_command(hass, websocket_subscribe_timeline)
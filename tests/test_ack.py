@@ -0,0 +1,134 @@
+from datetime import timedelta
+
+import pytest
+from homeassistant.components.climate import (
+    ATTR_HVAC_MODE,
+    SERVICE_SET_HVAC_MODE,
+    SERVICE_SET_TEMPERATURE,
+    HVACMode,
+)
+from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
+from homeassistant.const import ATTR_ENTITY_ID, ATTR_TEMPERATURE, CONF_NAME, CONF_PLATFORM
+from homeassistant.core import HomeAssistant, State
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed, async_mock_service, mock_component
+
+from custom_components.climate_scheduler import DOMAIN
+from custom_components.climate_scheduler.ack import state_matches
+from custom_components.climate_scheduler.const import (
+    CONF_CLIMATE_ENTITIES,
+    CONF_CONFIRM_TIMEOUT,
+    CONF_DEFAULT_STATE,
+    CONF_PROFILE_DEFAULT_HVAC_MODE,
+    CONF_PROFILE_DEFAULT_MIN_TEMP,
+    CONF_PROFILE_ID,
+    CONF_PROFILES,
+    SERVICE_GET_COMMAND_LATENCY,
+)
+
+ENTITY_ID = "switch.climate_scheduler_bedroom"
+
+
+async def _setup(hass: HomeAssistant, **options):
+    config = {
+        CONF_PLATFORM: "climate_scheduler",
+        CONF_NAME: "Bedroom",
+        CONF_DEFAULT_STATE: True,
+        CONF_CLIMATE_ENTITIES: ["climate.radiator", "climate.trv"],
+        CONF_PROFILES: [
+            {
+                CONF_PROFILE_ID: "Default",
+                CONF_PROFILE_DEFAULT_HVAC_MODE: HVACMode.HEAT,
+                CONF_PROFILE_DEFAULT_MIN_TEMP: 21,
+            }
+        ],
+    }
+    mock_component(hass, "climate")
+    hass.states.async_set("climate.radiator", HVACMode.OFF)
+    hass.states.async_set("climate.trv", HVACMode.OFF)
+    mock_set_hvac = async_mock_service(hass, "climate", SERVICE_SET_HVAC_MODE)
+    mock_set_temp = async_mock_service(hass, "climate", SERVICE_SET_TEMPERATURE)
+    full_config = {DOMAIN: options, SWITCH_DOMAIN: [config]}
+    assert await async_setup_component(hass, DOMAIN, full_config)
+    assert await async_setup_component(hass, SWITCH_DOMAIN, full_config)
+    await hass.async_block_till_done()
+    return mock_set_hvac, mock_set_temp
+
+
+async def _wait(hass: HomeAssistant, freezer, delay: timedelta):
+    freezer.tick(delay)
+    async_fire_time_changed(hass, dt_util.utcnow())
+    await hass.async_block_till_done()
+
+
+def _targets(calls) -> list:
+    return [c.data[ATTR_ENTITY_ID] for c in calls]
+
+
+def test_state_matches():
+    expected = {ATTR_HVAC_MODE: HVACMode.HEAT, ATTR_TEMPERATURE: 21.0}
+
+    assert state_matches(State("climate.trv", HVACMode.HEAT, {ATTR_TEMPERATURE: 21}), expected)
+    # Setpoints rounded by the device still confirm
+    assert state_matches(State("climate.trv", HVACMode.HEAT, {ATTR_TEMPERATURE: 21.2}), expected)
+    assert not state_matches(State("climate.trv", HVACMode.HEAT, {ATTR_TEMPERATURE: 20.5}), expected)
+    assert not state_matches(State("climate.trv", HVACMode.OFF, {ATTR_TEMPERATURE: 21}), expected)
+    assert not state_matches(State("climate.trv", HVACMode.HEAT, {}), expected)
+    assert not state_matches(None, expected)
+
+
+async def test_only_unconfirmed_entities_are_sent_again(hass: HomeAssistant, freezer, caplog):
+    mock_set_hvac, mock_set_temp = await _setup(hass, **{CONF_CONFIRM_TIMEOUT: "00:01:00"})
+    # Identical commands are merged into a single call
+    assert _targets(mock_set_hvac) == [["climate.radiator", "climate.trv"]]
+    mock_set_hvac.clear()
+    mock_set_temp.clear()
+
+    # The radiator applies its settings, the TRV ignores them
+    await _wait(hass, freezer, timedelta(seconds=2))
+    hass.states.async_set("climate.radiator", HVACMode.HEAT, {ATTR_TEMPERATURE: 21})
+    await hass.async_block_till_done()
+
+    await _wait(hass, freezer, timedelta(minutes=1))
+    assert _targets(mock_set_hvac) == ["climate.trv"]
+    assert _targets(mock_set_temp) == ["climate.trv"]
+
+    # After the last retry, the next update sends everything to the TRV again
+    await _wait(hass, freezer, timedelta(minutes=1))
+    await _wait(hass, freezer, timedelta(minutes=1))
+    assert "climate.trv didn't confirm" in caplog.text
+    assert _targets(mock_set_hvac) == ["climate.trv"] * 2
+    await _wait(hass, freezer, timedelta(minutes=15))
+    assert _targets(mock_set_hvac) == ["climate.trv"] * 3
+
+    response = await hass.services.async_call(
+        DOMAIN, SERVICE_GET_COMMAND_LATENCY, {ATTR_ENTITY_ID: ENTITY_ID}, blocking=True, return_response=True
+    )
+    radiator, trv = response["climate.radiator"], response["climate.trv"]
+    assert (radiator["sent"], radiator["confirmed"], radiator["pending"]) == (1, 1, False)
+    assert radiator["latency_ms"]["samples"] == 1
+    assert radiator["latency_ms"]["max"] >= 2000
+    assert (trv["sent"], trv["confirmed"], trv["retries"], trv["unconfirmed"], trv["pending"]) == (2, 0, 2, 1, True)
+    assert trv["latency_ms"] is None
+
+
+async def test_confirmed_entities_are_not_sent_again(hass: HomeAssistant, freezer):
+    mock_set_hvac, _ = await _setup(hass, **{CONF_CONFIRM_TIMEOUT: "00:01:00"})
+    mock_set_hvac.clear()
+
+    hass.states.async_set("climate.radiator", HVACMode.HEAT, {ATTR_TEMPERATURE: 21})
+    hass.states.async_set("climate.trv", HVACMode.HEAT, {ATTR_TEMPERATURE: 21})
+    await hass.async_block_till_done()
+    await _wait(hass, freezer, timedelta(minutes=5))
+    assert len(mock_set_hvac) == 0
+
+
+async def test_command_latency_needs_confirm_timeout(hass: HomeAssistant):
+    await _setup(hass)
+
+    with pytest.raises(HomeAssistantError, match="confirm_timeout"):
+        await hass.services.async_call(
+            DOMAIN, SERVICE_GET_COMMAND_LATENCY, {ATTR_ENTITY_ID: ENTITY_ID}, blocking=True, return_response=True
+        )
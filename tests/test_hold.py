@@ -0,0 +1,221 @@
+from datetime import timedelta
+
+import pytest
+from homeassistant.components.climate import (
+    ATTR_HVAC_MODE,
+    SERVICE_SET_HVAC_MODE,
+    SERVICE_SET_TEMPERATURE,
+    HVACMode,
+)
+from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
+from homeassistant.const import ATTR_ENTITY_ID, ATTR_TEMPERATURE, CONF_NAME, CONF_PLATFORM, STATE_ON
+from homeassistant.core import HomeAssistant, State
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    async_fire_time_changed,
+    async_mock_service,
+    mock_component,
+    mock_restore_cache,
+)
+
+from custom_components.climate_scheduler import DOMAIN
+from custom_components.climate_scheduler.const import (
+    ATTR_DURATION,
+    ATTR_HOLD,
+    ATTR_PROFILE,
+    ATTR_PROFILE_ID,
+    ATTR_UNTIL,
+    CONF_CLIMATE_ENTITIES,
+    CONF_DEFAULT_STATE,
+    CONF_PROFILE_DEFAULT_HVAC_MODE,
+    CONF_PROFILE_DEFAULT_MIN_TEMP,
+    CONF_PROFILE_ID,
+    CONF_PROFILE_SCHEDULE,
+    CONF_PROFILES,
+    CONF_SCHEDULE_HVAC,
+    CONF_SCHEDULE_MIN_TEMP,
+    CONF_SCHEDULE_TIME,
+    SERVICE_CANCEL_HOLD,
+    SERVICE_HOLD,
+)
+
+ENTITY_ID = "switch.climate_scheduler_bedroom"
+
+
+def _profiles(schedule=None):
+    return [
+        {
+            CONF_PROFILE_ID: "Default",
+            CONF_PROFILE_DEFAULT_HVAC_MODE: HVACMode.HEAT,
+            CONF_PROFILE_DEFAULT_MIN_TEMP: 20,
+            CONF_PROFILE_SCHEDULE: schedule
+            if schedule is not None
+            else [
+                {CONF_SCHEDULE_TIME: timedelta(hours=12), CONF_SCHEDULE_MIN_TEMP: 19},
+                {CONF_SCHEDULE_TIME: timedelta(hours=18), CONF_SCHEDULE_MIN_TEMP: 21},
+            ],
+        },
+        {CONF_PROFILE_ID: "Away", CONF_PROFILE_DEFAULT_HVAC_MODE: HVACMode.OFF},
+    ]
+
+
+async def _setup(hass: HomeAssistant, schedule=None):
+    config = {
+        CONF_PLATFORM: "climate_scheduler",
+        CONF_NAME: "Bedroom",
+        CONF_DEFAULT_STATE: True,
+        CONF_CLIMATE_ENTITIES: ["climate.bedroom"],
+        CONF_PROFILES: _profiles(schedule),
+    }
+    mock_component(hass, "climate")
+    mock_set_hvac = async_mock_service(hass, "climate", SERVICE_SET_HVAC_MODE)
+    mock_set_temp = async_mock_service(hass, "climate", SERVICE_SET_TEMPERATURE)
+    full_config = {DOMAIN: {}, SWITCH_DOMAIN: [config]}
+    assert await async_setup_component(hass, DOMAIN, full_config)
+    assert await async_setup_component(hass, SWITCH_DOMAIN, full_config)
+    await hass.async_block_till_done()
+    return mock_set_hvac, mock_set_temp
+
+
+async def _move_to(hass: HomeAssistant, freezer, when):
+    freezer.move_to(when)
+    async_fire_time_changed(hass, when)
+    # Interval updates landing on the same time as a transition run as background tasks
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+
+def _updates(hass: HomeAssistant, *sources: str) -> list[dict]:
+    entity = hass.data[SWITCH_DOMAIN].get_entity(ENTITY_ID)
+    return [entry for entry in entity.trace.as_list() if entry["source"] in sources]
+
+
+@pytest.fixture
+def morning(freezer):
+    start = dt_util.start_of_local_day() + timedelta(days=1, hours=10)
+    freezer.move_to(start)
+    return start
+
+
+async def test_hold_for_duration(hass: HomeAssistant, freezer, morning):
+    _, mock_set_temp = await _setup(hass)
+    mock_set_temp.clear()
+
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_HOLD,
+        {ATTR_ENTITY_ID: ENTITY_ID, CONF_SCHEDULE_MIN_TEMP: 23, ATTR_DURATION: "01:00:00"},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+    assert [c.data[ATTR_TEMPERATURE] for c in mock_set_temp] == [23]
+    hold = hass.states.get(ENTITY_ID).attributes[ATTR_HOLD]
+    assert dt_util.parse_datetime(hold[ATTR_UNTIL]) == morning + timedelta(hours=1)
+    assert hold[CONF_SCHEDULE_MIN_TEMP] == 23
+
+    # Interval updates keep the held temperature
+    await _move_to(hass, freezer, morning + timedelta(minutes=30))
+    assert [c.data[ATTR_TEMPERATURE] for c in mock_set_temp] == [23]
+
+    # The schedule is restored by a single update when the hold expires
+    await _move_to(hass, freezer, morning + timedelta(hours=1))
+    assert [c.data[ATTR_TEMPERATURE] for c in mock_set_temp] == [23, 21]
+    assert len(_updates(hass, "hold_expired", "transition")) == 1
+    assert hass.states.get(ENTITY_ID).attributes[ATTR_HOLD] is None
+
+
+async def test_hold_until_next_transition_updates_once(hass: HomeAssistant, freezer, morning):
+    mock_set_hvac, mock_set_temp = await _setup(hass)
+    mock_set_hvac.clear()
+    mock_set_temp.clear()
+
+    # Holding a profile, until the next change of the current one at noon
+    await hass.services.async_call(
+        DOMAIN, SERVICE_HOLD, {ATTR_ENTITY_ID: ENTITY_ID, ATTR_PROFILE_ID: "Away"}, blocking=True
+    )
+    await hass.async_block_till_done()
+    assert [c.data[ATTR_HVAC_MODE] for c in mock_set_hvac] == [HVACMode.OFF]
+    state = hass.states.get(ENTITY_ID)
+    assert state.attributes[ATTR_PROFILE] == "Default"
+    assert state.attributes[ATTR_HOLD][ATTR_PROFILE_ID] == "Away"
+    assert _updates(hass, "hold")[-1]["profile"] == "Away"
+
+    # The hold ends with the transition, in a single update
+    await _move_to(hass, freezer, morning + timedelta(hours=2))
+    assert [c.data[ATTR_TEMPERATURE] for c in mock_set_temp] == [19]
+    assert len(_updates(hass, "hold_expired", "transition")) == 1
+    assert hass.states.get(ENTITY_ID).attributes[ATTR_HOLD] is None
+
+    # The next transition is tracked as usual
+    await _move_to(hass, freezer, morning + timedelta(hours=8))
+    assert [c.data[ATTR_TEMPERATURE] for c in mock_set_temp] == [19, 21]
+
+
+async def test_cancel_hold(hass: HomeAssistant, freezer, morning):
+    _, mock_set_temp = await _setup(hass)
+    mock_set_temp.clear()
+
+    await hass.services.async_call(
+        DOMAIN, SERVICE_HOLD, {ATTR_ENTITY_ID: "climate.bedroom", CONF_SCHEDULE_MIN_TEMP: 23}, blocking=True
+    )
+    await hass.services.async_call(DOMAIN, SERVICE_CANCEL_HOLD, {ATTR_ENTITY_ID: ENTITY_ID}, blocking=True)
+    await hass.async_block_till_done()
+    assert [c.data[ATTR_TEMPERATURE] for c in mock_set_temp] == [23, 21]
+    assert hass.states.get(ENTITY_ID).attributes[ATTR_HOLD] is None
+
+    # The expiry timer went away with the hold
+    await _move_to(hass, freezer, morning + timedelta(hours=2))
+    assert len(_updates(hass, "hold_expired")) == 0
+
+
+async def test_hold_without_duration_needs_a_transition(hass: HomeAssistant, morning):
+    await _setup(hass, schedule=[])
+
+    with pytest.raises(HomeAssistantError, match="No upcoming schedule change"):
+        await hass.services.async_call(
+            DOMAIN, SERVICE_HOLD, {ATTR_ENTITY_ID: ENTITY_ID, CONF_SCHEDULE_HVAC: HVACMode.OFF}, blocking=True
+        )
+    assert hass.states.get(ENTITY_ID).attributes[ATTR_HOLD] is None
+
+
+async def test_hold_restored(hass: HomeAssistant, freezer, morning):
+    until = morning + timedelta(minutes=45)
+    mock_restore_cache(
+        hass,
+        [
+            State(
+                ENTITY_ID,
+                STATE_ON,
+                attributes={
+                    ATTR_PROFILE: "Default",
+                    ATTR_HOLD: {ATTR_UNTIL: until.isoformat(), ATTR_PROFILE_ID: None, CONF_SCHEDULE_MIN_TEMP: 23},
+                },
+            )
+        ],
+    )
+    _, mock_set_temp = await _setup(hass)
+    assert hass.states.get(ENTITY_ID).attributes[ATTR_HOLD][CONF_SCHEDULE_MIN_TEMP] == 23
+
+    await _move_to(hass, freezer, until)
+    assert [c.data[ATTR_TEMPERATURE] for c in mock_set_temp] == [23, 21]
+    assert hass.states.get(ENTITY_ID).attributes[ATTR_HOLD] is None
+
+
+async def test_expired_hold_not_restored(hass: HomeAssistant, morning):
+    mock_restore_cache(
+        hass,
+        [
+            State(
+                ENTITY_ID,
+                STATE_ON,
+                attributes={
+                    ATTR_HOLD: {ATTR_UNTIL: (morning - timedelta(minutes=1)).isoformat(), CONF_SCHEDULE_MIN_TEMP: 23}
+                },
+            )
+        ],
+    )
+    _, mock_set_temp = await _setup(hass)
+
+    assert [c.data[ATTR_TEMPERATURE] for c in mock_set_temp] == [21]
+    assert hass.states.get(ENTITY_ID).attributes[ATTR_HOLD] is None
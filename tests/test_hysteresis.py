@@ -0,0 +1,109 @@
+from datetime import timedelta
+
+from homeassistant.components.climate import (
+    ATTR_CURRENT_TEMPERATURE,
+    ATTR_HVAC_MODE,
+    SERVICE_SET_HVAC_MODE,
+    SERVICE_SET_TEMPERATURE,
+    HVACMode,
+)
+from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
+from homeassistant.const import CONF_NAME, CONF_PLATFORM
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed, async_mock_service, mock_component
+
+from custom_components.climate_scheduler import DOMAIN
+from custom_components.climate_scheduler.common import ComputedClimateData
+from custom_components.climate_scheduler.const import (
+    CONF_CLIMATE_ENTITIES,
+    CONF_DEFAULT_STATE,
+    CONF_HYSTERESIS,
+    CONF_MIN_CYCLE_TIME,
+    CONF_PROFILE_DEFAULT_HVAC_MODE,
+    CONF_PROFILE_DEFAULT_MIN_TEMP,
+    CONF_PROFILE_ID,
+    CONF_PROFILES,
+    CONF_TEMPERATURE_SENSOR,
+)
+from custom_components.climate_scheduler.hysteresis import _band_demand
+
+
+def test_band_demand_heat():
+    heat = ComputedClimateData(HVACMode.HEAT, None, None, 21.0, None)
+    assert _band_demand(heat, 20.4, 0.5) is True
+    assert _band_demand(heat, 20.8, 0.5) is None
+    assert _band_demand(heat, 21.2, 0.5) is None
+    assert _band_demand(heat, 21.5, 0.5) is False
+
+
+def test_band_demand_heat_cool():
+    heat_cool = ComputedClimateData(HVACMode.HEAT_COOL, None, None, 20.0, 24.0)
+    assert _band_demand(heat_cool, 19.0, 0.5) is True
+    assert _band_demand(heat_cool, 25.0, 0.5) is True
+    assert _band_demand(heat_cool, 22.0, 0.5) is False
+    assert _band_demand(heat_cool, 23.8, 0.5) is None
+
+
+def test_band_demand_without_target_follows_schedule():
+    assert _band_demand(ComputedClimateData(HVACMode.OFF, None, None, None, None), 18.0, 0.5) is True
+    assert _band_demand(ComputedClimateData(HVACMode.FAN_ONLY, None, None, 21.0, None), 18.0, 0.5) is True
+
+
+async def test_switch_runs_entities_outside_of_band(hass: HomeAssistant):
+    config = {
+        CONF_PLATFORM: "climate_scheduler",
+        CONF_NAME: "Bedroom",
+        CONF_DEFAULT_STATE: True,
+        CONF_HYSTERESIS: 0.5,
+        CONF_MIN_CYCLE_TIME: timedelta(minutes=5),
+        CONF_CLIMATE_ENTITIES: [
+            "climate.bedroom",
+            {"entity_id": "climate.office", CONF_TEMPERATURE_SENSOR: "sensor.office_temperature"},
+        ],
+        CONF_PROFILES: [
+            {
+                CONF_PROFILE_ID: "Default",
+                CONF_PROFILE_DEFAULT_HVAC_MODE: HVACMode.HEAT,
+                CONF_PROFILE_DEFAULT_MIN_TEMP: 21,
+            }
+        ],
+    }
+    hass.states.async_set("climate.bedroom", HVACMode.HEAT, {ATTR_CURRENT_TEMPERATURE: 20.0})
+    hass.states.async_set("climate.office", HVACMode.HEAT, {ATTR_CURRENT_TEMPERATURE: 15.0})
+    hass.states.async_set("sensor.office_temperature", "22.0")
+    mock_component(hass, "climate")
+    mock_set_hvac = async_mock_service(hass, "climate", SERVICE_SET_HVAC_MODE)
+    async_mock_service(hass, "climate", SERVICE_SET_TEMPERATURE)
+    full_config = {DOMAIN: {}, SWITCH_DOMAIN: [config]}
+    assert await async_setup_component(hass, DOMAIN, full_config)
+    assert await async_setup_component(hass, SWITCH_DOMAIN, full_config)
+    await hass.async_block_till_done()
+
+    def hvac_modes():
+        modes = {c.data["entity_id"]: c.data[ATTR_HVAC_MODE] for c in mock_set_hvac}
+        mock_set_hvac.clear()
+        return modes
+
+    # The office follows its external sensor, already warm enough
+    assert hvac_modes() == {"climate.bedroom": HVACMode.HEAT, "climate.office": HVACMode.OFF}
+
+    # Stops once above the band
+    hass.states.async_set("climate.bedroom", HVACMode.HEAT, {ATTR_CURRENT_TEMPERATURE: 21.6})
+    await hass.async_block_till_done()
+    assert hvac_modes() == {"climate.bedroom": HVACMode.OFF}
+
+    # Nothing happens within the band
+    hass.states.async_set("climate.bedroom", HVACMode.OFF, {ATTR_CURRENT_TEMPERATURE: 20.8})
+    await hass.async_block_till_done()
+    assert hvac_modes() == {}
+
+    # Below the band, but too soon after stopping
+    hass.states.async_set("climate.bedroom", HVACMode.OFF, {ATTR_CURRENT_TEMPERATURE: 20.4})
+    await hass.async_block_till_done()
+    assert hvac_modes() == {}
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=5, seconds=1))
+    await hass.async_block_till_done()
+    assert hvac_modes() == {"climate.bedroom": HVACMode.HEAT}
@@ -0,0 +1,179 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from homeassistant.components.climate import (
+    ATTR_CURRENT_TEMPERATURE,
+    ATTR_HVAC_ACTION,
+    ATTR_TEMPERATURE,
+    SERVICE_SET_HVAC_MODE,
+    SERVICE_SET_TEMPERATURE,
+    HVACAction,
+    HVACMode,
+)
+from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
+from homeassistant.const import ATTR_ENTITY_ID, CONF_NAME, CONF_PLATFORM, SERVICE_TURN_ON
+from homeassistant.core import HomeAssistant, State
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_mock_service, mock_component
+
+from custom_components.climate_scheduler import DOMAIN
+from custom_components.climate_scheduler.common import ComputedClimateData
+from custom_components.climate_scheduler.const import (
+    ATTR_OPTIMAL_START_RATES,
+    ATTR_OPTIMAL_START_TIME,
+    CONF_CLIMATE_ENTITIES,
+    CONF_OPTIMAL_START,
+    CONF_PROFILE_DEFAULT_HVAC_MODE,
+    CONF_PROFILE_ID,
+    CONF_PROFILE_SCHEDULE,
+    CONF_PROFILES,
+    CONF_SCHEDULE_MIN_TEMP,
+    CONF_SCHEDULE_TIME,
+    OPTIMAL_START_MAX_SAMPLES,
+)
+from custom_components.climate_scheduler.optimal_start import OptimalStartModel, ThermalRateEstimator
+
+
+def _state(minutes: int, temperature: float, action: str = HVACAction.HEATING, target: float = 21.0) -> State:
+    when = dt_util.utcnow().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(minutes=minutes)
+    return State(
+        "climate.test",
+        HVACMode.HEAT,
+        {ATTR_CURRENT_TEMPERATURE: temperature, ATTR_HVAC_ACTION: action, ATTR_TEMPERATURE: target},
+        last_changed=when,
+        last_updated=when,
+    )
+
+
+def test_estimator_learns_heating_rate():
+    estimator = ThermalRateEstimator()
+    estimator.observe(_state(0, 18.0))
+    estimator.observe(_state(30, 19.0))
+    estimator.observe(_state(60, 20.0))
+
+    assert estimator.heating_rate == 2.0
+    assert estimator.cooling_rate is None
+    assert estimator.lead_time(18.0, 21.0) == timedelta(hours=1.5)
+
+
+def test_estimator_ignores_idle_periods():
+    estimator = ThermalRateEstimator()
+    estimator.observe(_state(0, 18.0))
+    estimator.observe(_state(30, 19.0, action=HVACAction.IDLE))
+    estimator.observe(_state(60, 20.0))
+
+    assert estimator.heating_rate is None
+    assert estimator.lead_time(18.0, 21.0) is None
+
+
+def test_estimator_accumulates_small_changes():
+    estimator = ThermalRateEstimator()
+    estimator.observe(_state(0, 18.0))
+    # Too close to the previous sample to be meaningful
+    estimator.observe(_state(2, 18.1))
+    estimator.observe(_state(30, 18.5))
+
+    assert estimator.heating_rate == 1.0
+
+
+def test_estimator_memory_is_bounded():
+    estimator = ThermalRateEstimator()
+    for index in range(OPTIMAL_START_MAX_SAMPLES * 3):
+        estimator.observe(_state(index * 10, 15.0 + index * 0.1, target=40.0))
+
+    assert estimator.as_dict()["samples"] == OPTIMAL_START_MAX_SAMPLES
+    assert round(estimator.heating_rate, 6) == 0.6
+
+
+async def test_model_lead_time_uses_slowest_entity(hass: HomeAssistant):
+    model = OptimalStartModel(hass, ["climate.fast", "climate.slow"], timedelta(hours=3), lambda: None)
+    hass.states.async_set("climate.fast", HVACMode.HEAT, {ATTR_CURRENT_TEMPERATURE: 18.0})
+    hass.states.async_set("climate.slow", HVACMode.HEAT, {ATTR_CURRENT_TEMPERATURE: 19.0})
+    model._estimators["climate.fast"]._heating.add(3.0)
+    model._estimators["climate.slow"]._heating.add(1.0)
+
+    heat_to_21 = ComputedClimateData(HVACMode.HEAT, None, None, 21.0, None)
+    assert model.lead_time(heat_to_21) == timedelta(hours=2)
+
+    # Capped by the maximum lead time
+    heat_to_25 = ComputedClimateData(HVACMode.HEAT, None, None, 25.0, None)
+    assert model.lead_time(heat_to_25) == timedelta(hours=3)
+
+    # Nothing to do when rooms are already warm enough
+    heat_to_17 = ComputedClimateData(HVACMode.HEAT, None, None, 17.0, None)
+    assert model.lead_time(heat_to_17) == timedelta()
+
+
+async def test_switch_applies_next_schedule_early(hass: HomeAssistant):
+    config = {
+        CONF_PLATFORM: "climate_scheduler",
+        CONF_NAME: "Optimal",
+        CONF_CLIMATE_ENTITIES: ["climate.test"],
+        CONF_OPTIMAL_START: True,
+        CONF_PROFILES: [
+            {
+                CONF_PROFILE_ID: "Heating",
+                CONF_PROFILE_DEFAULT_HVAC_MODE: HVACMode.HEAT,
+                CONF_PROFILE_SCHEDULE: [
+                    {CONF_SCHEDULE_TIME: timedelta(hours=6), CONF_SCHEDULE_MIN_TEMP: 21},
+                    {CONF_SCHEDULE_TIME: timedelta(hours=22), CONF_SCHEDULE_MIN_TEMP: 17},
+                ],
+            }
+        ],
+    }
+    mock_component(hass, "climate")
+    hass.states.async_set("climate.test", HVACMode.HEAT, {ATTR_CURRENT_TEMPERATURE: 17.0})
+    async_mock_service(hass, "climate", SERVICE_SET_HVAC_MODE)
+    mock_set_temp = async_mock_service(hass, "climate", SERVICE_SET_TEMPERATURE)
+
+    full_config = {DOMAIN: {}, SWITCH_DOMAIN: [config]}
+    assert await async_setup_component(hass, DOMAIN, full_config)
+    assert await async_setup_component(hass, SWITCH_DOMAIN, full_config)
+    await hass.async_block_till_done()
+
+    entity_id = "switch.climate_scheduler_optimal"
+    five_thirty = dt_util.now().replace(hour=5, minute=30, second=0, microsecond=0)
+    with (
+        patch("custom_components.climate_scheduler.switch.now", return_value=five_thirty),
+        patch.object(OptimalStartModel, "lead_time", return_value=timedelta(hours=1)),
+    ):
+        await hass.services.async_call(SWITCH_DOMAIN, SERVICE_TURN_ON, {ATTR_ENTITY_ID: entity_id}, blocking=True)
+        await hass.async_block_till_done()
+
+    # 05:30 is within an hour of the 06:00 schedule, so it is applied early
+    assert mock_set_temp[-1].data[ATTR_TEMPERATURE] == 21
+
+    state = hass.states.get(entity_id)
+    assert state.attributes[ATTR_OPTIMAL_START_TIME] == (five_thirty - timedelta(minutes=30)).isoformat()
+    assert state.attributes[ATTR_OPTIMAL_START_RATES]["climate.test"]["heating_rate"] is None
+
+
+async def test_switch_writes_learned_rates(hass: HomeAssistant, freezer):
+    config = {
+        CONF_PLATFORM: "climate_scheduler",
+        CONF_NAME: "Optimal",
+        CONF_CLIMATE_ENTITIES: ["climate.test"],
+        CONF_OPTIMAL_START: True,
+        CONF_PROFILES: [{CONF_PROFILE_ID: "Heating", CONF_PROFILE_DEFAULT_HVAC_MODE: HVACMode.HEAT}],
+    }
+    mock_component(hass, "climate")
+    heating = {ATTR_HVAC_ACTION: HVACAction.HEATING, ATTR_TEMPERATURE: 21.0}
+    hass.states.async_set("climate.test", HVACMode.HEAT, {ATTR_CURRENT_TEMPERATURE: 18.0, **heating})
+    async_mock_service(hass, "climate", SERVICE_SET_HVAC_MODE)
+    async_mock_service(hass, "climate", SERVICE_SET_TEMPERATURE)
+
+    full_config = {DOMAIN: {}, SWITCH_DOMAIN: [config]}
+    assert await async_setup_component(hass, DOMAIN, full_config)
+    assert await async_setup_component(hass, SWITCH_DOMAIN, full_config)
+    await hass.async_block_till_done()
+
+    entity_id = "switch.climate_scheduler_optimal"
+    assert hass.states.get(entity_id).attributes[ATTR_OPTIMAL_START_RATES]["climate.test"]["heating_rate"] is None
+
+    # The estimate is written as soon as it is learned, without waiting for a scheduler update
+    hass.states.async_set("climate.test", HVACMode.HEAT, {ATTR_CURRENT_TEMPERATURE: 18.5, **heating})
+    freezer.tick(timedelta(minutes=30))
+    hass.states.async_set("climate.test", HVACMode.HEAT, {ATTR_CURRENT_TEMPERATURE: 19.5, **heating})
+    await hass.async_block_till_done()
+    assert hass.states.get(entity_id).attributes[ATTR_OPTIMAL_START_RATES]["climate.test"]["heating_rate"] == 2.0
@@ -0,0 +1,194 @@
+from datetime import timedelta
+
+from homeassistant.components.climate import (
+    ATTR_FAN_MODE,
+    ATTR_HVAC_MODE,
+    SERVICE_SET_FAN_MODE,
+    SERVICE_SET_HVAC_MODE,
+    SERVICE_SET_TEMPERATURE,
+    HVACMode,
+)
+from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
+from homeassistant.const import ATTR_ENTITY_ID, CONF_NAME, CONF_PLATFORM, STATE_OFF, STATE_ON
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed, async_mock_service, mock_component
+
+from custom_components.climate_scheduler import DOMAIN
+from custom_components.climate_scheduler.const import (
+    ATTR_DURATION,
+    ATTR_PAUSED,
+    ATTR_PROFILE_ID,
+    CONF_CLIMATE_ENTITIES,
+    CONF_DEFAULT_STATE,
+    CONF_OCCUPANCY_SENSORS,
+    CONF_OCCUPANCY_TIMEOUT,
+    CONF_PROFILE_DEFAULT_HVAC_MODE,
+    CONF_PROFILE_DEFAULT_MIN_TEMP,
+    CONF_PROFILE_ID,
+    CONF_PROFILE_IDLE_FAN_MODE,
+    CONF_PROFILE_IDLE_HVAC_MODE,
+    CONF_PROFILES,
+    CONF_WINDOW_DELAY,
+    CONF_WINDOW_SENSORS,
+    SERVICE_HOLD,
+)
+
+ENTITY_ID = "switch.climate_scheduler_bedroom"
+
+
+async def _setup(hass: HomeAssistant, profile_options=None, **options):
+    config = {
+        CONF_PLATFORM: "climate_scheduler",
+        CONF_NAME: "Bedroom",
+        CONF_DEFAULT_STATE: True,
+        CONF_CLIMATE_ENTITIES: ["climate.bedroom"],
+        CONF_PROFILES: [
+            {
+                CONF_PROFILE_ID: "Default",
+                CONF_PROFILE_DEFAULT_HVAC_MODE: HVACMode.HEAT,
+                CONF_PROFILE_DEFAULT_MIN_TEMP: 21,
+                **(profile_options or {}),
+            }
+        ],
+        **options,
+    }
+    mock_component(hass, "climate")
+    mock_set_hvac = async_mock_service(hass, "climate", SERVICE_SET_HVAC_MODE)
+    mock_set_temp = async_mock_service(hass, "climate", SERVICE_SET_TEMPERATURE)
+    mock_set_fan = async_mock_service(hass, "climate", SERVICE_SET_FAN_MODE)
+    full_config = {DOMAIN: {}, SWITCH_DOMAIN: [config]}
+    assert await async_setup_component(hass, DOMAIN, full_config)
+    assert await async_setup_component(hass, SWITCH_DOMAIN, full_config)
+    await hass.async_block_till_done()
+    mock_set_hvac.clear()
+    mock_set_temp.clear()
+    return mock_set_hvac, mock_set_temp, mock_set_fan
+
+
+async def _wait(hass: HomeAssistant, delay: timedelta):
+    async_fire_time_changed(hass, dt_util.utcnow() + delay)
+    await hass.async_block_till_done()
+
+
+async def test_open_window_pauses_after_delay(hass: HomeAssistant):
+    hass.states.async_set("binary_sensor.window", STATE_OFF)
+    mock_set_hvac, mock_set_temp, _ = await _setup(
+        hass, **{CONF_WINDOW_SENSORS: ["binary_sensor.window"], CONF_WINDOW_DELAY: timedelta(seconds=30)}
+    )
+
+    # Briefly opened windows are ignored
+    hass.states.async_set("binary_sensor.window", STATE_ON)
+    await hass.async_block_till_done()
+    hass.states.async_set("binary_sensor.window", STATE_OFF)
+    await hass.async_block_till_done()
+    await _wait(hass, timedelta(seconds=31))
+    assert len(mock_set_hvac) == 0
+    assert hass.states.get(ENTITY_ID).attributes[ATTR_PAUSED] is False
+
+    hass.states.async_set("binary_sensor.window", STATE_ON)
+    await hass.async_block_till_done()
+    await _wait(hass, timedelta(seconds=31))
+    assert [c.data[ATTR_HVAC_MODE] for c in mock_set_hvac] == [HVACMode.OFF]
+    assert hass.states.get(ENTITY_ID).attributes[ATTR_PAUSED] is True
+
+    # Updates are skipped while paused
+    mock_set_hvac.clear()
+    await hass.data[SWITCH_DOMAIN].get_entity(ENTITY_ID).async_update_climate()
+    assert len(mock_set_hvac) == 0
+
+    # Closing the window resumes with a single command set
+    hass.states.async_set("binary_sensor.window", STATE_OFF)
+    await hass.async_block_till_done()
+    assert [c.data[ATTR_HVAC_MODE] for c in mock_set_hvac] == [HVACMode.HEAT]
+    assert len(mock_set_temp) == 1
+    assert hass.states.get(ENTITY_ID).attributes[ATTR_PAUSED] is False
+
+
+async def test_vacant_rooms_pause_after_timeout(hass: HomeAssistant):
+    hass.states.async_set("binary_sensor.motion_1", STATE_ON)
+    hass.states.async_set("binary_sensor.motion_2", STATE_OFF)
+    mock_set_hvac, _, _ = await _setup(
+        hass,
+        **{
+            CONF_OCCUPANCY_SENSORS: ["binary_sensor.motion_1", "binary_sensor.motion_2"],
+            CONF_OCCUPANCY_TIMEOUT: timedelta(minutes=10),
+        },
+    )
+
+    hass.states.async_set("binary_sensor.motion_1", STATE_OFF)
+    await hass.async_block_till_done()
+    await _wait(hass, timedelta(minutes=5))
+    assert len(mock_set_hvac) == 0
+
+    await _wait(hass, timedelta(minutes=11))
+    assert [c.data[ATTR_HVAC_MODE] for c in mock_set_hvac] == [HVACMode.OFF]
+
+    mock_set_hvac.clear()
+    hass.states.async_set("binary_sensor.motion_2", STATE_ON)
+    await hass.async_block_till_done()
+    assert [c.data[ATTR_HVAC_MODE] for c in mock_set_hvac] == [HVACMode.HEAT]
+
+
+async def test_idle_mode_sent_only_on_phase_changes(hass: HomeAssistant):
+    hass.states.async_set("binary_sensor.window", STATE_OFF)
+    mock_set_hvac, mock_set_temp, mock_set_fan = await _setup(
+        hass,
+        {CONF_PROFILE_IDLE_HVAC_MODE: HVACMode.FAN_ONLY, CONF_PROFILE_IDLE_FAN_MODE: "low"},
+        **{CONF_WINDOW_SENSORS: ["binary_sensor.window"], CONF_WINDOW_DELAY: timedelta()},
+    )
+    entity = hass.data[SWITCH_DOMAIN].get_entity(ENTITY_ID)
+
+    # Steady state, nothing left to send
+    await entity.async_update_climate()
+    assert len(mock_set_hvac) == 0
+    assert len(mock_set_temp) == 0
+
+    hass.states.async_set("binary_sensor.window", STATE_ON)
+    await hass.async_block_till_done()
+    assert [c.data[ATTR_HVAC_MODE] for c in mock_set_hvac] == [HVACMode.FAN_ONLY]
+    assert [c.data[ATTR_FAN_MODE] for c in mock_set_fan] == ["low"]
+    assert len(mock_set_temp) == 0
+
+    # Turning the switch on again while idle sends nothing new
+    mock_set_hvac.clear()
+    await entity.async_turn_on()
+    assert len(mock_set_hvac) == 0
+
+    hass.states.async_set("binary_sensor.window", STATE_OFF)
+    await hass.async_block_till_done()
+    assert [c.data[ATTR_HVAC_MODE] for c in mock_set_hvac] == [HVACMode.HEAT]
+    assert len(mock_set_temp) == 1
+
+
+async def test_idle_mode_of_held_profile(hass: HomeAssistant):
+    hass.states.async_set("binary_sensor.window", STATE_OFF)
+    profiles = [
+        {CONF_PROFILE_ID: "Default", CONF_PROFILE_DEFAULT_HVAC_MODE: HVACMode.HEAT},
+        {
+            CONF_PROFILE_ID: "Summer",
+            CONF_PROFILE_DEFAULT_HVAC_MODE: HVACMode.COOL,
+            CONF_PROFILE_IDLE_HVAC_MODE: HVACMode.FAN_ONLY,
+        },
+    ]
+    mock_set_hvac, _, _ = await _setup(
+        hass,
+        **{
+            CONF_PROFILES: profiles,
+            CONF_WINDOW_SENSORS: ["binary_sensor.window"],
+            CONF_WINDOW_DELAY: timedelta(),
+        },
+    )
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_HOLD,
+        {ATTR_ENTITY_ID: ENTITY_ID, ATTR_PROFILE_ID: "Summer", ATTR_DURATION: "01:00:00"},
+        blocking=True,
+    )
+    assert [c.data[ATTR_HVAC_MODE] for c in mock_set_hvac] == [HVACMode.COOL]
+
+    # Rooms idle in the mode of the held profile
+    hass.states.async_set("binary_sensor.window", STATE_ON)
+    await hass.async_block_till_done()
+    assert [c.data[ATTR_HVAC_MODE] for c in mock_set_hvac] == [HVACMode.COOL, HVACMode.FAN_ONLY]
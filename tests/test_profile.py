@@ -1,5 +1,7 @@
-from datetime import timedelta
+from datetime import UTC, date, datetime, timedelta
+from zoneinfo import ZoneInfo
 
+from custom_components.climate_scheduler.common import SunRelativeTime
 from custom_components.climate_scheduler.const import (
     CONF_PROFILE_DEFAULT_FAN_MODE,
     CONF_PROFILE_DEFAULT_HVAC_MODE,
@@ -8,10 +10,13 @@ from custom_components.climate_scheduler.const import (
     CONF_PROFILE_DEFAULT_SWING_MODE,
     CONF_PROFILE_ID,
     CONF_PROFILE_SCHEDULE,
+    CONF_SCHEDULE_DATES,
+    CONF_SCHEDULE_DAYS,
     CONF_SCHEDULE_HVAC,
+    CONF_SCHEDULE_MIN_TEMP,
     CONF_SCHEDULE_TIME,
 )
-from custom_components.climate_scheduler.profile import ClimateSchedulerProfile
+from custom_components.climate_scheduler.profile import ClimateSchedulerProfile, local_time_to_utc
 
 
 def test_profile_no_schedule_uses_defaults():
@@ -131,3 +136,367 @@ def test_profile_schedule_fallback_to_defaults():
     data = profile.compute_climate(timedelta(hours=10))
     assert data.hvac_mode == "heat"
     assert data.fan_mode == "low"  # fallback
+
+
+def test_profile_next_transition():
+    config = {
+        CONF_PROFILE_ID: "test",
+        CONF_PROFILE_SCHEDULE: [
+            {CONF_SCHEDULE_TIME: timedelta(hours=8), CONF_SCHEDULE_HVAC: "heat"},
+            {CONF_SCHEDULE_TIME: timedelta(hours=20), CONF_SCHEDULE_HVAC: "cool"},
+        ],
+    }
+    profile = ClimateSchedulerProfile(config)
+
+    next_time, data = profile.get_next_transition(timedelta(hours=12))
+    assert next_time == timedelta(hours=20)
+    assert data.hvac_mode == "cool"
+
+    # Wraps around to the first schedule of the next day
+    next_time, data = profile.get_next_transition(timedelta(hours=21))
+    assert next_time == timedelta(hours=32)
+    assert data.hvac_mode == "heat"
+
+
+def test_profile_next_transition_none_without_changes():
+    config = {
+        CONF_PROFILE_ID: "test",
+        CONF_PROFILE_SCHEDULE: [{CONF_SCHEDULE_TIME: timedelta(hours=8), CONF_SCHEDULE_HVAC: "heat"}],
+    }
+    assert ClimateSchedulerProfile(config).get_next_transition(timedelta(hours=12)) is None
+
+
+# 2026-10-19 is a Monday
+MONDAY = date(2026, 10, 19)
+SATURDAY = date(2026, 10, 24)
+SUNDAY = date(2026, 10, 25)
+CHRISTMAS = date(2026, 12, 25)
+
+
+def _weekly_profile():
+    return ClimateSchedulerProfile(
+        {
+            CONF_PROFILE_ID: "test",
+            CONF_PROFILE_SCHEDULE: [
+                {
+                    CONF_SCHEDULE_TIME: timedelta(hours=6),
+                    CONF_SCHEDULE_HVAC: "heat",
+                    CONF_SCHEDULE_DAYS: ["mon", "tue", "wed", "thu", "fri"],
+                },
+                {
+                    CONF_SCHEDULE_TIME: timedelta(hours=9),
+                    CONF_SCHEDULE_HVAC: "heat_cool",
+                    CONF_SCHEDULE_DAYS: ["sat", "sun"],
+                },
+                {CONF_SCHEDULE_TIME: timedelta(hours=22), CONF_SCHEDULE_HVAC: "off"},
+                {
+                    CONF_SCHEDULE_TIME: timedelta(hours=10),
+                    CONF_SCHEDULE_HVAC: "fan_only",
+                    CONF_SCHEDULE_DATES: [CHRISTMAS],
+                },
+            ],
+        }
+    )
+
+
+def test_profile_weekday_schedules():
+    profile = _weekly_profile()
+
+    assert profile.compute_climate(timedelta(hours=7), MONDAY).hvac_mode == "heat"
+    assert profile.compute_climate(timedelta(hours=7), SATURDAY).hvac_mode == "off"
+    assert profile.compute_climate(timedelta(hours=9), SATURDAY).hvac_mode == "heat_cool"
+    assert profile.compute_climate(timedelta(hours=23), SUNDAY).hvac_mode == "off"
+    # Before the first change of the week, wraps around to the last change of the week
+    assert profile.compute_climate(timedelta(hours=1), MONDAY).hvac_mode == "off"
+
+
+def test_profile_exception_dates():
+    profile = _weekly_profile()
+
+    # Christmas 2026 is a Friday. The regular schedule applies until the first exception entry.
+    assert profile.compute_climate(timedelta(hours=7), CHRISTMAS).hvac_mode == "heat"
+    # Then the exception applies for the rest of the day, skipping the regular 22:00 change
+    assert profile.compute_climate(timedelta(hours=10), CHRISTMAS).hvac_mode == "fan_only"
+    assert profile.compute_climate(timedelta(hours=23), CHRISTMAS).hvac_mode == "fan_only"
+    # And the regular schedule resumes the next day
+    assert profile.compute_climate(timedelta(hours=1), CHRISTMAS + timedelta(days=1)).hvac_mode == "off"
+
+
+def test_profile_weekday_next_transition():
+    profile = _weekly_profile()
+
+    # Friday night to Saturday morning
+    next_time, data = profile.get_next_transition(timedelta(hours=23), SATURDAY - timedelta(days=1))
+    assert next_time == timedelta(hours=33)
+    assert data.hvac_mode == "heat_cool"
+
+    # Sunday night to Monday morning, wrapping around the week
+    next_time, data = profile.get_next_transition(timedelta(hours=23), SUNDAY)
+    assert next_time == timedelta(hours=30)
+    assert data.hvac_mode == "heat"
+
+
+def test_profile_exception_next_transition():
+    profile = _weekly_profile()
+
+    next_time, data = profile.get_next_transition(timedelta(hours=7), CHRISTMAS)
+    assert next_time == timedelta(hours=10)
+    assert data.hvac_mode == "fan_only"
+
+    # The regular schedule resumes at midnight
+    next_time, data = profile.get_next_transition(timedelta(hours=11), CHRISTMAS)
+    assert next_time == timedelta(hours=24)
+    assert data.hvac_mode == "off"
+
+    assert profile.get_trigger_times() == [
+        timedelta(),
+        timedelta(hours=6),
+        timedelta(hours=9),
+        timedelta(hours=10),
+        timedelta(hours=22),
+    ]
+
+
+def test_profile_sun_relative_schedules():
+    config = {
+        CONF_PROFILE_ID: "test",
+        CONF_PROFILE_SCHEDULE: [
+            {CONF_SCHEDULE_TIME: timedelta(hours=8), CONF_SCHEDULE_HVAC: "heat"},
+            {CONF_SCHEDULE_TIME: SunRelativeTime("sunset", timedelta(minutes=-30)), CONF_SCHEDULE_HVAC: "cool"},
+        ],
+    }
+    profile = ClimateSchedulerProfile(config)
+    assert profile.has_sun_times
+
+    # Unresolved sun relative schedules do not apply yet, leaving a schedule which never changes
+    assert profile.get_trigger_times() == []
+    assert profile.compute_climate(timedelta(hours=20)).hvac_mode == "heat"
+
+    profile.resolve_sun_times(lambda sun_time: timedelta(hours=19) + sun_time.offset)
+    assert profile.get_trigger_times() == [timedelta(hours=8), timedelta(hours=18, minutes=30)]
+    assert profile.compute_climate(timedelta(hours=20)).hvac_mode == "cool"
+
+    # Resolving again replaces the previous times, events which do not happen are skipped
+    profile.resolve_sun_times(lambda sun_time: None)
+    assert profile.get_trigger_times() == []
+
+
+def test_profile_coalesces_entries_without_effect(caplog):
+    config = {
+        CONF_PROFILE_ID: "test",
+        CONF_PROFILE_DEFAULT_HVAC_MODE: "heat",
+        CONF_PROFILE_DEFAULT_MIN_TEMP: 21.0,
+        CONF_PROFILE_SCHEDULE: [
+            {CONF_SCHEDULE_TIME: timedelta(hours=6, minutes=30), CONF_SCHEDULE_MIN_TEMP: 19.0},
+            # Relies on the defaults, like the next entry
+            {CONF_SCHEDULE_TIME: timedelta(hours=7, minutes=30)},
+            {CONF_SCHEDULE_TIME: timedelta(hours=8), CONF_SCHEDULE_MIN_TEMP: 21.0},
+            {CONF_SCHEDULE_TIME: timedelta(hours=20, minutes=30), CONF_SCHEDULE_MIN_TEMP: 17.5},
+            # Same as the 20:30 entry, and as the end of the previous day for the exception date
+            {CONF_SCHEDULE_TIME: timedelta(hours=23), CONF_SCHEDULE_MIN_TEMP: 17.5},
+            {CONF_SCHEDULE_TIME: timedelta(hours=10), CONF_SCHEDULE_MIN_TEMP: 17.5, CONF_SCHEDULE_DATES: [CHRISTMAS]},
+            {CONF_SCHEDULE_TIME: timedelta(hours=12), CONF_SCHEDULE_MIN_TEMP: 17.5, CONF_SCHEDULE_DATES: [CHRISTMAS]},
+        ],
+    }
+    profile = ClimateSchedulerProfile(config)
+
+    assert profile.get_trigger_times() == [
+        timedelta(),
+        timedelta(hours=6, minutes=30),
+        timedelta(hours=7, minutes=30),
+        timedelta(hours=10),
+        timedelta(hours=20, minutes=30),
+    ]
+    assert profile.get_segment(timedelta(hours=9), MONDAY) == timedelta(hours=7, minutes=30)
+    assert profile.compute_climate(timedelta(hours=9), MONDAY).min_temp == 21.0
+    assert profile.get_segment(timedelta(hours=23, minutes=30), MONDAY) == timedelta(hours=20, minutes=30)
+    assert profile.get_next_transition(timedelta(hours=21), MONDAY)[0] == timedelta(hours=30, minutes=30)
+    assert profile.get_segment(timedelta(hours=13), CHRISTMAS) == timedelta(hours=10)
+
+    assert "schedule entry at 8:00:00 has no effect" in caplog.text
+    assert "schedule entry at 23:00:00 has no effect" in caplog.text
+    assert "schedule entry at 12:00:00 has no effect" in caplog.text
+    assert "schedule entry at 7:30:00 has no effect" not in caplog.text
+
+    # Recompiling doesn't warn again
+    caplog.clear()
+    profile.resolve_sun_times(lambda sun_time: None)
+    assert "no effect" not in caplog.text
+
+
+def test_profile_sun_relative_entry_without_effect_reported_once(caplog):
+    config = {
+        CONF_PROFILE_ID: "test",
+        CONF_PROFILE_SCHEDULE: [
+            {CONF_SCHEDULE_TIME: timedelta(hours=8), CONF_SCHEDULE_HVAC: "heat"},
+            {CONF_SCHEDULE_TIME: SunRelativeTime("sunset", timedelta()), CONF_SCHEDULE_HVAC: "heat"},
+        ],
+    }
+    profile = ClimateSchedulerProfile(config)
+
+    profile.resolve_sun_times(lambda sun_time: timedelta(hours=19))
+    assert caplog.text.count("no effect") == 1
+
+    # The next day resolves the entry to another time, it was already reported
+    profile.resolve_sun_times(lambda sun_time: timedelta(hours=19, minutes=2))
+    assert caplog.text.count("no effect") == 1
+
+
+def test_profile_coalesces_across_the_week():
+    profile = ClimateSchedulerProfile(
+        {
+            CONF_PROFILE_ID: "test",
+            CONF_PROFILE_SCHEDULE: [
+                {CONF_SCHEDULE_TIME: timedelta(hours=6), CONF_SCHEDULE_HVAC: "heat", CONF_SCHEDULE_DAYS: ["mon"]},
+                {CONF_SCHEDULE_TIME: timedelta(hours=9), CONF_SCHEDULE_HVAC: "off"},
+                {CONF_SCHEDULE_TIME: timedelta(hours=18), CONF_SCHEDULE_HVAC: "heat"},
+            ],
+        }
+    )
+
+    # Monday 06:00 follows Sunday 18:00, which already heats
+    assert profile.get_segment(timedelta(hours=7), MONDAY) == timedelta(hours=18)
+    assert profile.compute_climate(timedelta(hours=7), MONDAY).hvac_mode == "heat"
+    assert profile.get_trigger_times() == [timedelta(hours=9), timedelta(hours=18)]
+
+
+def test_profile_next_transition_prefers_exception_date_on_tie():
+    profile = ClimateSchedulerProfile(
+        {
+            CONF_PROFILE_ID: "test",
+            CONF_PROFILE_SCHEDULE: [
+                {CONF_SCHEDULE_TIME: timedelta(hours=6), CONF_SCHEDULE_MIN_TEMP: 21.0},
+                {CONF_SCHEDULE_TIME: timedelta(hours=22), CONF_SCHEDULE_MIN_TEMP: 17.0},
+                {
+                    CONF_SCHEDULE_TIME: timedelta(hours=22),
+                    CONF_SCHEDULE_MIN_TEMP: 19.0,
+                    CONF_SCHEDULE_DATES: [CHRISTMAS],
+                },
+            ],
+        }
+    )
+
+    transition = profile.get_next_transition(timedelta(hours=12), CHRISTMAS)
+    assert transition[0] == timedelta(hours=22)
+    assert transition[1].min_temp == 19.0
+
+
+def test_profile_compute_climates_matches_compute_climate():
+    profile = _weekly_profile()
+    seconds = list(range(0, 24 * 60 * 60, 900))
+
+    for day in (None, MONDAY, SATURDAY, CHRISTMAS):
+        expected = [profile.compute_climate(timedelta(seconds=s), day) for s in seconds]
+        assert profile.compute_climates(seconds, day) == expected
+
+
+def test_daily_plan_only_holds_changes_of_the_day():
+    profile = _weekly_profile()
+
+    def _plan(day: date) -> list[timedelta]:
+        start = datetime.combine(day, datetime.min.time(), UTC)
+        return [time - start for time in profile.get_daily_plan(day, UTC)]
+
+    # Weekend entries don't wake up weekdays, and midnight is only planned around exception dates
+    assert _plan(MONDAY) == [timedelta(hours=6), timedelta(hours=22)]
+    assert _plan(SATURDAY) == [timedelta(hours=9), timedelta(hours=22)]
+    # Christmas is a Friday, its entry replaces the rest of the day
+    assert _plan(CHRISTMAS) == [timedelta(), timedelta(hours=6), timedelta(hours=10)]
+    assert _plan(CHRISTMAS + timedelta(days=1)) == [timedelta(), timedelta(hours=9), timedelta(hours=22)]
+    assert _plan(CHRISTMAS + timedelta(days=2)) == [timedelta(hours=9), timedelta(hours=22)]
+
+
+NEW_YORK = ZoneInfo("America/New_York")
+
+
+def test_local_time_to_utc_regular_day():
+    assert local_time_to_utc(date(2026, 7, 1), timedelta(hours=8), NEW_YORK) == datetime(2026, 7, 1, 12, tzinfo=UTC)
+    # Times past the end of the day
+    assert local_time_to_utc(date(2026, 7, 1), timedelta(hours=32), NEW_YORK) == datetime(2026, 7, 2, 12, tzinfo=UTC)
+
+
+def test_daily_plan_on_spring_forward():
+    # Clocks jump from 02:00 to 03:00 on 2026-03-08
+    profile = ClimateSchedulerProfile(
+        {
+            CONF_PROFILE_ID: "test",
+            CONF_PROFILE_SCHEDULE: [
+                {CONF_SCHEDULE_TIME: timedelta(hours=2, minutes=15), CONF_SCHEDULE_HVAC: "heat"},
+                {CONF_SCHEDULE_TIME: timedelta(hours=2, minutes=45), CONF_SCHEDULE_HVAC: "cool"},
+                {CONF_SCHEDULE_TIME: timedelta(hours=3, minutes=15), CONF_SCHEDULE_HVAC: "off"},
+            ],
+        }
+    )
+
+    # Skipped schedules happen once, when the clock jumps to 03:00 EDT, and before later ones
+    assert profile.get_daily_plan(date(2026, 3, 8), NEW_YORK) == [
+        datetime(2026, 3, 8, 7, tzinfo=UTC),
+        datetime(2026, 3, 8, 7, 15, tzinfo=UTC),
+    ]
+
+
+def test_daily_plan_on_fall_back():
+    # Clocks go back from 02:00 to 01:00 on 2026-11-01
+    profile = ClimateSchedulerProfile(
+        {
+            CONF_PROFILE_ID: "test",
+            CONF_PROFILE_SCHEDULE: [
+                {CONF_SCHEDULE_TIME: timedelta(hours=1, minutes=30), CONF_SCHEDULE_HVAC: "heat"},
+                {CONF_SCHEDULE_TIME: timedelta(hours=6), CONF_SCHEDULE_HVAC: "cool"},
+            ],
+        }
+    )
+
+    # The repeated schedule only happens the first time, at 01:30 EDT
+    plan = profile.get_daily_plan(date(2026, 11, 1), NEW_YORK)
+    assert plan == [datetime(2026, 11, 1, 5, 30, tzinfo=UTC), datetime(2026, 11, 1, 11, tzinfo=UTC)]
+
+    # Cached alongside the plan of the next day, until a third day is requested
+    assert profile.get_daily_plan(date(2026, 11, 1), NEW_YORK) is plan
+    tomorrow = profile.get_daily_plan(date(2026, 11, 2), NEW_YORK)
+    assert profile.get_daily_plan(date(2026, 11, 1), NEW_YORK) is plan
+    assert profile.get_daily_plan(date(2026, 11, 2), NEW_YORK) is tomorrow
+    profile.get_daily_plan(date(2026, 11, 3), NEW_YORK)
+    assert profile.get_daily_plan(date(2026, 11, 1), NEW_YORK) is not plan
+
+
+def test_profiles_share_identical_schedules():
+    morning = {CONF_SCHEDULE_TIME: timedelta(hours=7), CONF_SCHEDULE_HVAC: "heat"}
+    schedule_cache = {}
+    base = ClimateSchedulerProfile({CONF_PROFILE_ID: "a", CONF_PROFILE_SCHEDULE: [morning]}, schedule_cache)
+    copy = ClimateSchedulerProfile({CONF_PROFILE_ID: "b", CONF_PROFILE_SCHEDULE: [dict(morning)]}, schedule_cache)
+
+    assert len(schedule_cache) == 1
+    assert base._schedules[0] is copy._schedules[0]
+    assert copy.compute_climate(timedelta(hours=8)).hvac_mode == "heat"
+
+
+def test_profile_zero_setpoint_is_not_missing():
+    config = {
+        CONF_PROFILE_ID: "test",
+        CONF_PROFILE_DEFAULT_HVAC_MODE: "cool",
+        CONF_PROFILE_DEFAULT_MIN_TEMP: 20.0,
+        CONF_PROFILE_SCHEDULE: [{CONF_SCHEDULE_TIME: timedelta(hours=8), CONF_SCHEDULE_MIN_TEMP: 0.0}],
+    }
+    profile = ClimateSchedulerProfile(config)
+
+    assert profile.compute_climate(timedelta(hours=9)).min_temp == 0.0
+
+
+def test_profile_returns_cached_climate():
+    config = {
+        CONF_PROFILE_ID: "test",
+        CONF_PROFILE_DEFAULT_HVAC_MODE: "heat",
+        CONF_PROFILE_SCHEDULE: [
+            {CONF_SCHEDULE_TIME: timedelta(hours=8), CONF_SCHEDULE_MIN_TEMP: 21.0},
+            {CONF_SCHEDULE_TIME: timedelta(hours=12), CONF_SCHEDULE_MIN_TEMP: 19.0},
+            {CONF_SCHEDULE_TIME: timedelta(hours=14), CONF_SCHEDULE_MIN_TEMP: 21.0},
+        ],
+    }
+    profile = ClimateSchedulerProfile(config)
+
+    morning = profile.compute_climate(timedelta(hours=9))
+    assert profile.compute_climate(timedelta(hours=10)) is morning
+    # Identical settings of different schedules share one instance
+    assert profile.compute_climate(timedelta(hours=15)) is morning
+    assert profile.get_next_transition(timedelta(hours=13))[1] is morning
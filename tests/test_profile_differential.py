@@ -0,0 +1,287 @@
+"""Differential test of the compiled schedule engine against a straightforward reference model.
+
+Random profiles and hand picked edge cases are evaluated for every second of each day of a week,
+and for the days around exception dates, both by the profile and by the reference model below,
+which works directly from the schedule entries without any compiled tables.
+"""
+
+import random
+from bisect import bisect_right
+from datetime import UTC, date, datetime, timedelta
+
+import pytest
+import voluptuous as vol
+from homeassistant.const import WEEKDAYS
+
+from custom_components.climate_scheduler.common import ComputedClimateData
+from custom_components.climate_scheduler.const import (
+    CONF_PROFILE_DEFAULT_FAN_MODE,
+    CONF_PROFILE_DEFAULT_HVAC_MODE,
+    CONF_PROFILE_DEFAULT_MAX_TEMP,
+    CONF_PROFILE_DEFAULT_MIN_TEMP,
+    CONF_PROFILE_DEFAULT_SWING_MODE,
+    CONF_PROFILE_ID,
+    CONF_PROFILE_SCHEDULE,
+    CONF_SCHEDULE_DATES,
+    CONF_SCHEDULE_DAYS,
+    CONF_SCHEDULE_FAN_MODE,
+    CONF_SCHEDULE_HVAC,
+    CONF_SCHEDULE_MAX_TEMP,
+    CONF_SCHEDULE_MIN_TEMP,
+    CONF_SCHEDULE_SWING_MODE,
+    CONF_SCHEDULE_TIME,
+)
+from custom_components.climate_scheduler.profile import PROFILES_SCHEMA, SECONDS_PER_DAY, ClimateSchedulerProfile
+
+RANDOM_PROFILES = 150
+SEED = 20261019
+
+# Monday of the week every profile is checked on, exception dates fall within it or the next week
+WEEK = date(2026, 10, 19)
+# Days after the checked week over which next changes are searched
+HORIZON = 15
+# Stands for a profile evaluated without a day: a Monday far from any exception date
+NO_DAY = date(2000, 1, 3)
+
+SECONDS = range(SECONDS_PER_DAY)
+
+# Climate settings of the profile defaults and of schedule entries, in ComputedClimateData order
+SETTINGS = (
+    (CONF_PROFILE_DEFAULT_HVAC_MODE, CONF_SCHEDULE_HVAC),
+    (CONF_PROFILE_DEFAULT_FAN_MODE, CONF_SCHEDULE_FAN_MODE),
+    (CONF_PROFILE_DEFAULT_SWING_MODE, CONF_SCHEDULE_SWING_MODE),
+    (CONF_PROFILE_DEFAULT_MIN_TEMP, CONF_SCHEDULE_MIN_TEMP),
+    (CONF_PROFILE_DEFAULT_MAX_TEMP, CONF_SCHEDULE_MAX_TEMP),
+)
+
+# Small pools, so that neighbouring entries often end up with identical settings
+CHOICES = {
+    CONF_SCHEDULE_HVAC: ("heat", "cool", "off"),
+    CONF_SCHEDULE_FAN_MODE: ("auto", "low"),
+    CONF_SCHEDULE_SWING_MODE: ("off",),
+    CONF_SCHEDULE_MIN_TEMP: (0.0, 17.0, 21.0),
+    CONF_SCHEDULE_MAX_TEMP: (0.0, 25.0),
+}
+
+
+def _entry(time: int, days: list[str] | None = None, dates: list[date] | None = None, **settings) -> dict:
+    entry = {CONF_SCHEDULE_TIME: timedelta(seconds=time), **settings}
+    if days is not None:
+        entry[CONF_SCHEDULE_DAYS] = days
+    if dates is not None:
+        entry[CONF_SCHEDULE_DATES] = dates
+    return entry
+
+
+def _profile_config(schedule: list[dict], **defaults) -> dict:
+    return {CONF_PROFILE_ID: "test", CONF_PROFILE_SCHEDULE: schedule, **defaults}
+
+
+EDGE_CASES = {
+    "empty": _profile_config([]),
+    "empty with defaults": _profile_config([], default_hvac_mode="heat", default_min_temp=0.0),
+    "single entry at midnight": _profile_config([_entry(0, min_temp=19.0)]),
+    "single entry before midnight": _profile_config([_entry(SECONDS_PER_DAY - 1, hvac_mode="cool")]),
+    "midnight and before midnight": _profile_config(
+        [_entry(0, min_temp=0.0), _entry(SECONDS_PER_DAY - 1, min_temp=21.0)], default_hvac_mode="heat"
+    ),
+    "zero and unset temperatures": _profile_config(
+        [_entry(3600, min_temp=0.0), _entry(7200), _entry(10800, max_temp=0.0)],
+        default_min_temp=0.0,
+        default_max_temp=25.0,
+    ),
+    "single entry on one day": _profile_config([_entry(43200, days=["wed"], min_temp=18.0)]),
+    "same climate every entry": _profile_config([_entry(0), _entry(3600), _entry(SECONDS_PER_DAY - 1)]),
+    "exception date only": _profile_config(
+        [_entry(0, dates=[WEEK + timedelta(days=2)], hvac_mode="off")], default_hvac_mode="heat"
+    ),
+    "exception dates at the edges of the day": _profile_config(
+        [
+            _entry(3600, min_temp=20.0),
+            _entry(0, dates=[WEEK, WEEK + timedelta(days=6)], min_temp=20.0),
+            _entry(SECONDS_PER_DAY - 1, dates=[WEEK + timedelta(days=6)], min_temp=16.0),
+        ]
+    ),
+}
+
+
+def _random_profile_config(rng: random.Random) -> dict:
+    defaults = {default: rng.choice(CHOICES[setting]) for default, setting in SETTINGS if rng.random() < 0.5}
+    schedule = []
+    for _ in range(rng.randint(0, 8)):
+        time = rng.choice((0, SECONDS_PER_DAY - 1, rng.randrange(SECONDS_PER_DAY), rng.randrange(24) * 3600))
+        settings = {setting: rng.choice(choices) for setting, choices in CHOICES.items() if rng.random() < 0.4}
+        kind = rng.random()
+        if kind < 0.6:
+            schedule.append(_entry(time, **settings))
+        elif kind < 0.85:
+            schedule.append(_entry(time, days=rng.sample(WEEKDAYS, rng.randint(1, 3)), **settings))
+        else:
+            dates = [WEEK + timedelta(days=rng.randrange(14)) for _ in range(rng.randint(1, 2))]
+            schedule.append(_entry(time, dates=dates, **settings))
+    return _profile_config(schedule, **defaults)
+
+
+def _random_profile_configs() -> list[dict]:
+    rng = random.Random(SEED)
+    configs = []
+    while len(configs) < RANDOM_PROFILES:
+        config = _random_profile_config(rng)
+        try:
+            configs.append(PROFILES_SCHEMA([config])[0])
+        except vol.Invalid:
+            # Clashing entry times, which the configuration rejects
+            continue
+    return configs
+
+
+class ReferenceProfile:
+    """The climate of a day and time is set by the latest schedule entry started by then.
+
+    Entries of an exception date take over from the first of them until the end of the date.
+    Otherwise the latest regular entry is searched going back up to a week, and the defaults apply
+    when there is none.
+    """
+
+    def __init__(self, config: dict) -> None:
+        defaults = [config.get(default) for default, _ in SETTINGS]
+        self.defaults = ComputedClimateData(*defaults)
+        self.entries = []
+        for entry in config[CONF_PROFILE_SCHEDULE]:
+            values = [entry.get(setting) for _, setting in SETTINGS]
+            climate = ComputedClimateData(*(d if v is None else v for d, v in zip(defaults, values)))
+            days = entry.get(CONF_SCHEDULE_DAYS)
+            self.entries.append(
+                (
+                    int(entry[CONF_SCHEDULE_TIME].total_seconds()),
+                    None if days is None else {WEEKDAYS.index(d) for d in days},
+                    entry.get(CONF_SCHEDULE_DATES),
+                    climate,
+                )
+            )
+
+    def climate(self, day: date, seconds: int) -> ComputedClimateData:
+        started = [e for e in self.entries if e[2] is not None and day in e[2] and e[0] <= seconds]
+        if started:
+            return max(started, key=lambda e: e[0])[3]
+
+        for days_back in range(8):
+            weekday = (day.weekday() - days_back) % 7
+            started = [
+                e
+                for e in self.entries
+                if e[2] is None and (e[1] is None or weekday in e[1]) and (days_back > 0 or e[0] <= seconds)
+            ]
+            if started:
+                return max(started, key=lambda e: e[0])[3]
+        return self.defaults
+
+    def segments(self, day: date) -> list[tuple[int, ComputedClimateData]]:
+        """Return the start time and climate of the segments of a day, which only change at entries."""
+        starts = {0}
+        for time, days, dates, _ in self.entries:
+            if dates is not None and day in dates or dates is None and (days is None or day.weekday() in days):
+                starts.add(time)
+        return [(start, self.climate(day, start)) for start in sorted(starts)]
+
+
+def _compare_seconds(actual: list[ComputedClimateData], segments: list[tuple[int, ComputedClimateData]]) -> int | None:
+    """Return the first second where the climates differ from the reference segments, if any.
+
+    Every climate within a segment is compared to the first one, which is usually the same object,
+    so that the comparison mostly runs on identity.
+    """
+    if len(actual) != SECONDS_PER_DAY:
+        return min(len(actual), SECONDS_PER_DAY)
+    for (start, climate), (end, _) in zip(segments, [*segments[1:], (SECONDS_PER_DAY, None)]):
+        chunk = actual[start:end]
+        if chunk[0] != climate or chunk.count(chunk[0]) != len(chunk):
+            return start + next(i for i, c in enumerate(chunk) if c != climate)
+    return None
+
+
+def _changes(reference: ReferenceProfile, first_day: date, days: int) -> tuple[list[int], list]:
+    """Return the times, in seconds since the start of the first day, where the climate changes."""
+    times, climates = [], []
+    for index in range(days):
+        for start, climate in reference.segments(first_day + timedelta(days=index)):
+            if not climates or climates[-1] != climate:
+                times.append(index * SECONDS_PER_DAY + start)
+                climates.append(climate)
+    return times, climates
+
+
+def _check_day(profile: ClimateSchedulerProfile, reference: ReferenceProfile, day: date | None) -> None:
+    reference_day = NO_DAY if day is None else day
+    segments = reference.segments(reference_day)
+
+    actual = profile.compute_climates(SECONDS, day)
+    second = _compare_seconds(actual, segments)
+    if second is not None:
+        expected = reference.climate(reference_day, second)
+        pytest.fail(f"{day} {timedelta(seconds=second)}: {actual[second : second + 1]} instead of {expected}")
+
+    # Single lookups around every change of the reference and every segment boundary compiled by the
+    # profile, catching boundaries off by one on either side, and a few more at random
+    rng = random.Random(reference_day.toordinal())
+    queries = {0, SECONDS_PER_DAY - 1, *(rng.randrange(SECONDS_PER_DAY) for _ in range(16))}
+    starts = {start for start, _ in segments} | set(profile.get_segment_starts(day))
+    queries.update(t for start in starts for t in (start - 1, start, start + 1) if 0 <= t < SECONDS_PER_DAY)
+    queries = sorted(queries)
+    for second in queries:
+        expected = reference.climate(reference_day, second)
+        assert profile.compute_climate(timedelta(seconds=second), day) == expected, (day, second)
+
+    if day is not None:
+        # Every change of the day is planned
+        midnight = datetime.combine(day, datetime.min.time(), UTC)
+        planned = {int((t - midnight).total_seconds()) for t in profile.get_daily_plan(day, UTC)}
+        for start, climate in segments:
+            if start == 0:
+                before = reference.climate(day - timedelta(days=1), SECONDS_PER_DAY - 1)
+            else:
+                before = reference.climate(day, start - 1)
+            if climate != before:
+                assert start in planned, (day, start, planned)
+
+    change_times, change_climates = _changes(reference, reference_day, HORIZON)
+    exact = all(dates is None for _, _, dates, _ in reference.entries)
+    for second in queries:
+        index = bisect_right(change_times, second)
+        current = change_climates[index - 1]
+        transition = profile.get_next_transition(timedelta(seconds=second), day)
+        if index == len(change_times):
+            # Never changes again, but the profile may still wake up once at the end of an exception date
+            assert transition is None or transition[1] == current, (day, second, transition)
+            continue
+
+        assert transition is not None, (day, second)
+        next_time = int(transition[0].total_seconds())
+        assert second < next_time <= change_times[index], (day, second, transition)
+        expected_climate = change_climates[index] if next_time == change_times[index] else current
+        assert transition[1] == expected_climate, (day, second, transition)
+        if exact:
+            # Regular schedules are coalesced, so their transitions are all actual changes
+            assert next_time == change_times[index], (day, second, transition)
+
+
+def _check_profile(config: dict) -> None:
+    profile = ClimateSchedulerProfile(config)
+    reference = ReferenceProfile(config)
+
+    days = {WEEK + timedelta(days=i) for i in range(7)}
+    for _, _, dates, _ in reference.entries:
+        # Exception dates, and the day after each to check the regular schedule resumes
+        days.update(d + timedelta(days=i) for d in dates or () for i in (0, 1))
+    for day in [None, *sorted(days)]:
+        _check_day(profile, reference, day)
+
+
+@pytest.mark.parametrize("config", EDGE_CASES.values(), ids=EDGE_CASES.keys())
+def test_profile_matches_reference_edge_cases(config: dict):
+    _check_profile(PROFILES_SCHEMA([config])[0])
+
+
+def test_profile_matches_reference_random_profiles():
+    for config in _random_profile_configs():
+        _check_profile(config)
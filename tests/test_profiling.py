@@ -0,0 +1,88 @@
+from datetime import timedelta
+
+import pytest
+from homeassistant.components.climate import SERVICE_SET_HVAC_MODE, SERVICE_SET_TEMPERATURE, HVACMode
+from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
+from homeassistant.const import ATTR_ENTITY_ID, CONF_NAME, CONF_PLATFORM, SERVICE_TURN_OFF, SERVICE_TURN_ON
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed, async_mock_service, mock_component
+
+from custom_components.climate_scheduler import DOMAIN
+from custom_components.climate_scheduler.const import (
+    CONF_CLIMATE_ENTITIES,
+    CONF_PROFILE_DEFAULT_HVAC_MODE,
+    CONF_PROFILE_DEFAULT_MIN_TEMP,
+    CONF_PROFILE_ID,
+    CONF_PROFILES,
+    DATA_CLIMATE_SCHEDULER,
+    SERVICE_PROFILE_UPDATES,
+)
+
+ENTITY_ID = "switch.climate_scheduler_bedroom"
+
+
+async def _setup(hass: HomeAssistant, tmp_path):
+    hass.config.config_dir = str(tmp_path)
+    config = {
+        CONF_PLATFORM: "climate_scheduler",
+        CONF_NAME: "Bedroom",
+        CONF_CLIMATE_ENTITIES: ["climate.bedroom"],
+        CONF_PROFILES: [
+            {
+                CONF_PROFILE_ID: "Default",
+                CONF_PROFILE_DEFAULT_HVAC_MODE: HVACMode.HEAT,
+                CONF_PROFILE_DEFAULT_MIN_TEMP: 21,
+            }
+        ],
+    }
+    mock_component(hass, "climate")
+    async_mock_service(hass, "climate", SERVICE_SET_HVAC_MODE)
+    async_mock_service(hass, "climate", SERVICE_SET_TEMPERATURE)
+    full_config = {DOMAIN: {}, SWITCH_DOMAIN: [config]}
+    assert await async_setup_component(hass, DOMAIN, full_config)
+    assert await async_setup_component(hass, SWITCH_DOMAIN, full_config)
+    await hass.async_block_till_done()
+
+
+async def test_profile_updates_writes_report(hass: HomeAssistant, tmp_path):
+    await _setup(hass, tmp_path)
+
+    response = await hass.services.async_call(
+        DOMAIN, SERVICE_PROFILE_UPDATES, {"updates": 2}, blocking=True, return_response=True
+    )
+    with pytest.raises(HomeAssistantError):
+        await hass.services.async_call(DOMAIN, SERVICE_PROFILE_UPDATES, {}, blocking=True)
+
+    for service in (SERVICE_TURN_ON, SERVICE_TURN_OFF, SERVICE_TURN_ON):
+        await hass.services.async_call(SWITCH_DOMAIN, service, {ATTR_ENTITY_ID: ENTITY_ID}, blocking=True)
+    await hass.async_block_till_done()
+
+    # Profiling stopped after two updates
+    assert hass.data[DATA_CLIMATE_SCHEDULER].profiler is None
+    report = (tmp_path / response["path"].rsplit("/", 1)[-1]).read_text()
+    assert "2 updates" in report
+    for stage in ("compute", "plan", "dispatch", "await"):
+        assert f"\n{stage} " in report
+    assert f"{ENTITY_ID} (turn_on)" in report
+
+
+async def test_profile_updates_times_out(hass: HomeAssistant, tmp_path):
+    await _setup(hass, tmp_path)
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_PROFILE_UPDATES,
+        {"updates": 100, "timeout": {"minutes": 1}},
+        blocking=True,
+        return_response=True,
+    )
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=2))
+    await hass.async_block_till_done()
+
+    assert hass.data[DATA_CLIMATE_SCHEDULER].profiler is None
+    report = (tmp_path / response["path"].rsplit("/", 1)[-1]).read_text()
+    assert "0 updates" in report
+    assert "No profiled calls" in report
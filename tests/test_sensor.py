@@ -0,0 +1,95 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from homeassistant.components.climate import ATTR_HVAC_MODE, HVACMode
+from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
+from homeassistant.const import CONF_NAME, CONF_PLATFORM
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed, mock_component
+
+from custom_components.climate_scheduler import DOMAIN
+from custom_components.climate_scheduler.const import (
+    CONF_CLIMATE_ENTITIES,
+    CONF_PROFILE_DEFAULT_HVAC_MODE,
+    CONF_PROFILE_DEFAULT_MIN_TEMP,
+    CONF_PROFILE_ID,
+    CONF_PROFILE_SCHEDULE,
+    CONF_PROFILES,
+    CONF_SCHEDULE_MIN_TEMP,
+    CONF_SCHEDULE_TIME,
+    CONF_SENSORS,
+)
+
+SWITCH_ID = "switch.climate_scheduler_bedroom"
+
+
+async def _setup(hass: HomeAssistant, start):
+    config = {
+        CONF_PLATFORM: "climate_scheduler",
+        CONF_NAME: "Bedroom",
+        CONF_CLIMATE_ENTITIES: ["climate.bedroom"],
+        CONF_SENSORS: True,
+        CONF_PROFILES: [
+            {
+                CONF_PROFILE_ID: "Heat",
+                CONF_PROFILE_DEFAULT_HVAC_MODE: HVACMode.HEAT,
+                CONF_PROFILE_DEFAULT_MIN_TEMP: 17,
+                CONF_PROFILE_SCHEDULE: [
+                    {CONF_SCHEDULE_TIME: timedelta(hours=7), CONF_SCHEDULE_MIN_TEMP: 21},
+                    {CONF_SCHEDULE_TIME: timedelta(hours=22), CONF_SCHEDULE_MIN_TEMP: 17.5},
+                ],
+            },
+            {CONF_PROFILE_ID: "Off", CONF_PROFILE_DEFAULT_HVAC_MODE: HVACMode.OFF},
+        ],
+    }
+    mock_component(hass, "climate")
+    full_config = {DOMAIN: {}, SWITCH_DOMAIN: [config]}
+    with patch("custom_components.climate_scheduler.switch.now", return_value=start):
+        assert await async_setup_component(hass, DOMAIN, full_config)
+        assert await async_setup_component(hass, SWITCH_DOMAIN, full_config)
+        await hass.async_block_till_done()
+
+
+async def test_schedule_sensors(hass: HomeAssistant):
+    start = (dt_util.now() + timedelta(days=1)).replace(hour=10, minute=0, second=0, microsecond=0)
+    await _setup(hass, start)
+
+    current = hass.states.get("sensor.climate_scheduler_bedroom_current_target")
+    assert float(current.state) == 21
+    assert current.attributes[ATTR_HVAC_MODE] == HVACMode.HEAT
+    assert float(hass.states.get("sensor.climate_scheduler_bedroom_next_target").state) == 17.5
+    next_transition = hass.states.get("sensor.climate_scheduler_bedroom_next_transition")
+    assert dt_util.parse_datetime(next_transition.state) == start.replace(hour=22)
+
+    # Sensors move on at the transition, to the first schedule of the next day
+    async_fire_time_changed(hass, dt_util.as_utc(start.replace(hour=22)))
+    await hass.async_block_till_done()
+    assert float(hass.states.get("sensor.climate_scheduler_bedroom_current_target").state) == 17.5
+    assert float(hass.states.get("sensor.climate_scheduler_bedroom_next_target").state) == 21
+    next_transition = hass.states.get("sensor.climate_scheduler_bedroom_next_transition")
+    assert dt_util.parse_datetime(next_transition.state) == start.replace(hour=7) + timedelta(days=1)
+
+
+async def test_schedule_sensors_follow_profile(hass: HomeAssistant):
+    start = (dt_util.now() + timedelta(days=1)).replace(hour=10, minute=0, second=0, microsecond=0)
+    await _setup(hass, start)
+
+    current_id = "sensor.climate_scheduler_bedroom_current_target"
+    last_updated = hass.states.get(current_id).last_updated
+    with patch("custom_components.climate_scheduler.switch.now", return_value=start):
+        # Switching to the same profile changes nothing, so nothing is written
+        await hass.services.async_call(
+            DOMAIN, "set_profile", {"entity_id": SWITCH_ID, "profile": "Heat"}, blocking=True
+        )
+        await hass.async_block_till_done()
+        assert hass.states.get(current_id).last_updated == last_updated
+
+        await hass.services.async_call(DOMAIN, "set_profile", {"entity_id": SWITCH_ID, "profile": "Off"}, blocking=True)
+        await hass.async_block_till_done()
+
+    current = hass.states.get(current_id)
+    assert current.attributes[ATTR_HVAC_MODE] == HVACMode.OFF
+    assert current.state == "unknown"
+    assert hass.states.get("sensor.climate_scheduler_bedroom_next_transition").state == "unknown"
@@ -0,0 +1,116 @@
+from datetime import date, timedelta
+from unittest.mock import patch
+
+import pytest
+import voluptuous as vol
+from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
+from homeassistant.const import CONF_NAME, CONF_PLATFORM
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed, mock_component
+
+from custom_components.climate_scheduler import DOMAIN
+from custom_components.climate_scheduler.common import SunRelativeTime
+from custom_components.climate_scheduler.const import (
+    CONF_PROFILE_COST_OPTIMIZATION,
+    CONF_PROFILE_DEFAULT_MIN_TEMP,
+    CONF_PROFILE_EXTENDS,
+    CONF_PROFILE_ID,
+    CONF_PROFILE_SCHEDULE,
+    CONF_PROFILES,
+    CONF_SCHEDULE_DATES,
+    CONF_SCHEDULE_DAYS,
+    CONF_SCHEDULE_MIN_TEMP,
+    CONF_SCHEDULE_TIME,
+    CONF_TARIFF_SENSOR,
+    SNAPSHOT_SAVE_DELAY,
+    SNAPSHOT_STORAGE_KEY,
+    SNAPSHOT_STORAGE_VERSION,
+)
+from custom_components.climate_scheduler.snapshot import (
+    ProfileSnapshots,
+    config_hash,
+    dump_profiles,
+    load_profiles,
+    validate_profiles,
+)
+
+PROFILES = [
+    {
+        CONF_PROFILE_ID: "Base",
+        CONF_PROFILE_DEFAULT_MIN_TEMP: "20",
+        CONF_PROFILE_COST_OPTIMIZATION: {CONF_TARIFF_SENSOR: "sensor.tariff"},
+        CONF_PROFILE_SCHEDULE: [
+            {CONF_SCHEDULE_TIME: "06:30:00", CONF_SCHEDULE_MIN_TEMP: 21},
+            {CONF_SCHEDULE_TIME: "sunset - 00:30", CONF_SCHEDULE_DAYS: ["sat", "sun"]},
+            {CONF_SCHEDULE_TIME: "10:00:00", CONF_SCHEDULE_DATES: ["2026-12-25"]},
+        ],
+    },
+    {
+        CONF_PROFILE_ID: "Extended",
+        CONF_PROFILE_EXTENDS: "Base",
+        CONF_PROFILE_SCHEDULE: [{CONF_SCHEDULE_TIME: "22:00:00", CONF_SCHEDULE_MIN_TEMP: 17}],
+    },
+]
+
+
+def test_snapshot_round_trip():
+    validated = validate_profiles(PROFILES)
+    loaded = load_profiles(dump_profiles(validated))
+
+    assert loaded == validated
+    schedule = loaded[1][CONF_PROFILE_SCHEDULE]
+    assert schedule[0][CONF_SCHEDULE_TIME] == timedelta(hours=6, minutes=30)
+    assert schedule[1][CONF_SCHEDULE_TIME] == SunRelativeTime("sunset", -timedelta(minutes=30))
+    assert schedule[2][CONF_SCHEDULE_DATES] == [date(2026, 12, 25)]
+
+
+async def test_unchanged_profiles_skip_validation(hass: HomeAssistant, hass_storage):
+    snapshot = dump_profiles(validate_profiles(PROFILES))
+    hass_storage[SNAPSHOT_STORAGE_KEY] = {
+        "version": SNAPSHOT_STORAGE_VERSION,
+        "key": SNAPSHOT_STORAGE_KEY,
+        "data": {"profiles": {config_hash(PROFILES): snapshot, "stale": []}},
+    }
+
+    snapshots = ProfileSnapshots(hass)
+    with patch("custom_components.climate_scheduler.snapshot.validate_profiles") as validator:
+        profiles = await snapshots.async_validate(PROFILES)
+    validator.assert_not_called()
+    assert profiles == load_profiles(snapshot)
+
+    # Any change goes through validation again, and only the snapshots in use are kept
+    changed = [{**PROFILES[0], CONF_PROFILE_DEFAULT_MIN_TEMP: "19"}]
+    profiles = await snapshots.async_validate(changed)
+    assert profiles[0][CONF_PROFILE_DEFAULT_MIN_TEMP] == 19.0
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=SNAPSHOT_SAVE_DELAY + 1))
+    await hass.async_block_till_done()
+    assert set(hass_storage[SNAPSHOT_STORAGE_KEY]["data"]["profiles"]) == {config_hash(PROFILES), config_hash(changed)}
+
+
+async def test_invalid_profiles_are_not_stored(hass: HomeAssistant, hass_storage):
+    snapshots = ProfileSnapshots(hass)
+    with pytest.raises(vol.Invalid):
+        await snapshots.async_validate([{CONF_PROFILE_ID: "a"}, {CONF_PROFILE_ID: "a"}])
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=SNAPSHOT_SAVE_DELAY + 1))
+    await hass.async_block_till_done()
+    assert SNAPSHOT_STORAGE_KEY not in hass_storage
+
+
+async def test_switch_with_invalid_profiles_is_not_created(hass: HomeAssistant, caplog):
+    mock_component(hass, "climate")
+    config = {
+        CONF_PLATFORM: "climate_scheduler",
+        CONF_NAME: "Invalid",
+        CONF_PROFILES: [{CONF_PROFILE_ID: "Default", CONF_PROFILE_EXTENDS: "Unknown"}],
+    }
+    full_config = {DOMAIN: {}, SWITCH_DOMAIN: [config]}
+    assert await async_setup_component(hass, DOMAIN, full_config)
+    assert await async_setup_component(hass, SWITCH_DOMAIN, full_config)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("switch.climate_scheduler_invalid") is None
+    assert "Invalid profiles for climate scheduler Invalid" in caplog.text
@@ -53,6 +53,7 @@ from custom_components.climate_scheduler.const import (
     CONF_SCHEDULE_MAX_TEMP,
     CONF_SCHEDULE_TIME,
 )
+from custom_components.climate_scheduler.switch import ClimateSchedulerSwitch
 
 # Fixtures and Helpers
 
@@ -113,6 +114,8 @@ async def test_setup_platform(hass: HomeAssistant, mock_climate_scheduler_config
 
 
 async def test_setup_with_custom_default_state(hass: HomeAssistant, mock_climate_scheduler_config):
+    # Scheduler applies its schedule as soon as it is on
+    async_mock_service(hass, "climate", SERVICE_SET_HVAC_MODE)
     mock_climate_scheduler_config[CONF_DEFAULT_STATE] = True
     await async_setup_scheduler(hass, mock_climate_scheduler_config)
 
@@ -154,6 +157,9 @@ async def test_restore_state(hass: HomeAssistant, mock_climate_scheduler_config)
     state = hass.states.get(entity_id)
     assert state.state == STATE_ON
     assert state.attributes.get(ATTR_PROFILE) == "Weekend"
+    # The profile selector starts from the restored profile
+    selector = hass.states.get("input_select.input_select_climate_scheduler_test_scheduler_profile_selector")
+    assert selector.state == "Weekend"
 
 
 async def test_turn_on_updates_climate(hass: HomeAssistant, mock_climate_scheduler_config):
@@ -175,6 +181,30 @@ async def test_turn_on_updates_climate(hass: HomeAssistant, mock_climate_schedul
     assert state.state == STATE_ON
 
 
+async def test_state_written_only_on_change(hass: HomeAssistant, mock_climate_scheduler_config):
+    async_mock_service(hass, "climate", SERVICE_SET_HVAC_MODE)
+    await async_setup_scheduler(hass, mock_climate_scheduler_config)
+    entity_id = "switch.climate_scheduler_test_scheduler"
+
+    with patch.object(
+        ClimateSchedulerSwitch,
+        "async_write_ha_state",
+        autospec=True,
+        side_effect=ClimateSchedulerSwitch.async_write_ha_state,
+    ) as mock_write:
+        await hass.services.async_call(SWITCH_DOMAIN, SERVICE_TURN_ON, {ATTR_ENTITY_ID: entity_id}, blocking=True)
+        await hass.services.async_call(SWITCH_DOMAIN, SERVICE_TURN_ON, {ATTR_ENTITY_ID: entity_id}, blocking=True)
+        await hass.async_block_till_done()
+        assert mock_write.call_count == 1
+
+        # Selecting the current profile again changes nothing
+        await hass.services.async_call(DOMAIN, "set_profile", {ATTR_ENTITY_ID: entity_id, "profile": "Default"})
+        await hass.async_block_till_done()
+        assert mock_write.call_count == 1
+
+    assert hass.states.get(entity_id).state == STATE_ON
+
+
 async def test_switch_profile(hass: HomeAssistant, mock_climate_scheduler_config):
     mock_set_hvac = async_mock_service(hass, "climate", SERVICE_SET_HVAC_MODE)
     mock_set_temp = async_mock_service(hass, "climate", SERVICE_SET_TEMPERATURE)
@@ -466,3 +496,263 @@ async def test_update_climate_entity_guards(hass: HomeAssistant, mock_climate_sc
         await hass.async_block_till_done()
 
     assert len(mock_set_hvac) == 0
+
+
+async def test_sun_relative_schedule_resolved_for_today(hass: HomeAssistant):
+    from custom_components.climate_scheduler.common import SunRelativeTime
+    from custom_components.climate_scheduler.schedule import resolve_sun_time
+
+    sunset = resolve_sun_time(hass, SunRelativeTime("sunset", timedelta()), dt_util.now().date())
+    early = resolve_sun_time(hass, SunRelativeTime("sunset", timedelta(minutes=-30)), dt_util.now().date())
+    assert timedelta() < sunset < timedelta(days=1)
+    assert sunset - early == timedelta(minutes=30)
+
+    config = {
+        CONF_PLATFORM: "climate_scheduler",
+        CONF_NAME: "Sun Scheduler",
+        CONF_CLIMATE_ENTITIES: ["climate.test_ac"],
+        CONF_PROFILES: [
+            {
+                CONF_PROFILE_ID: "Shade",
+                CONF_PROFILE_SCHEDULE: [
+                    {CONF_SCHEDULE_TIME: timedelta(hours=1), CONF_SCHEDULE_HVAC: HVACMode.OFF},
+                    {CONF_SCHEDULE_TIME: "sunset - 00:30", CONF_SCHEDULE_HVAC: HVACMode.COOL},
+                ],
+            }
+        ],
+    }
+    with patch("custom_components.climate_scheduler.switch.async_track_point_in_utc_time") as track_point_in_time:
+        await async_setup_scheduler(hass, config)
+
+    today = dt_util.start_of_local_day()
+    tracked = {c.args[2] for c in track_point_in_time.call_args_list}
+    # Schedule changes still ahead today, and the next midnight to plan the next day
+    assert today + timedelta(days=1) in tracked
+    assert (today + early in tracked) == (today + early > dt_util.now())
+
+
+async def test_schedule_applied_when_started(hass: HomeAssistant, mock_climate_scheduler_config):
+    # A scheduler which is on applies its schedule right away rather than at the next interval
+    mock_climate_scheduler_config[CONF_DEFAULT_STATE] = True
+    mock_set_hvac = async_mock_service(hass, "climate", SERVICE_SET_HVAC_MODE)
+
+    await async_setup_scheduler(hass, mock_climate_scheduler_config)
+
+    assert len(mock_set_hvac) == 1
+    assert mock_set_hvac[0].data[ATTR_HVAC_MODE] == HVACMode.HEAT
+
+
+async def test_schedule_trigger_uses_planned_time(hass: HomeAssistant, mock_climate_scheduler_config):
+    mock_climate_scheduler_config[CONF_PROFILES][1][CONF_PROFILE_SCHEDULE].append(
+        {CONF_SCHEDULE_TIME: timedelta(hours=18), CONF_SCHEDULE_HVAC: HVACMode.HEAT}
+    )
+    mock_climate_scheduler_config[CONF_DEFAULT_PROFILE] = "Weekend"
+    mock_climate_scheduler_config[CONF_DEFAULT_STATE] = True
+    mock_set_hvac = async_mock_service(hass, "climate", SERVICE_SET_HVAC_MODE)
+    async_mock_service(hass, "climate", SERVICE_SET_TEMPERATURE)
+
+    await async_setup_scheduler(hass, mock_climate_scheduler_config)
+    entity = hass.data["switch"].get_entity("switch.climate_scheduler_test_scheduler")
+
+    # Even if the callback runs late, the planned time decides which schedule applies
+    planned = dt_util.start_of_local_day() + timedelta(hours=9)
+    with patch(
+        "custom_components.climate_scheduler.switch.now",
+        return_value=planned + timedelta(hours=10),
+    ):
+        await entity.async_update_climate(dt_util.as_utc(planned))
+
+    assert mock_set_hvac[-1].data[ATTR_HVAC_MODE] == HVACMode.COOL
+
+
+async def test_schedule_change_at_midnight_applied(hass: HomeAssistant, freezer):
+    config = {
+        CONF_PLATFORM: "climate_scheduler",
+        CONF_NAME: "Night Scheduler",
+        CONF_DEFAULT_STATE: True,
+        CONF_CLIMATE_ENTITIES: ["climate.test_ac"],
+        CONF_PROFILES: [
+            {
+                CONF_PROFILE_ID: "Night",
+                CONF_PROFILE_SCHEDULE: [
+                    {CONF_SCHEDULE_TIME: timedelta(), CONF_SCHEDULE_HVAC: HVACMode.HEAT},
+                    {CONF_SCHEDULE_TIME: timedelta(hours=8), CONF_SCHEDULE_HVAC: HVACMode.OFF},
+                ],
+            }
+        ],
+    }
+    midnight = dt_util.start_of_local_day() + timedelta(days=2)
+    freezer.move_to(midnight - timedelta(minutes=5))
+    mock_set_hvac = async_mock_service(hass, "climate", SERVICE_SET_HVAC_MODE)
+    await async_setup_scheduler(hass, config)
+    assert [c.data[ATTR_HVAC_MODE] for c in mock_set_hvac] == [HVACMode.OFF]
+
+    # The change at midnight is planned by the new day and applied right away
+    freezer.move_to(midnight)
+    async_fire_time_changed(hass, midnight)
+    await hass.async_block_till_done()
+    # The transition tracked when planning the new day is already due
+    async_fire_time_changed(hass, midnight)
+    await hass.async_block_till_done()
+
+    assert [c.data[ATTR_HVAC_MODE] for c in mock_set_hvac] == [HVACMode.OFF, HVACMode.HEAT]
+
+
+async def test_shared_entity_only_updated_by_highest_priority_switch(hass: HomeAssistant, caplog):
+    from custom_components.climate_scheduler.const import CONF_PRIORITY
+
+    def scheduler_config(name, hvac_mode, priority):
+        return {
+            CONF_PLATFORM: "climate_scheduler",
+            CONF_NAME: name,
+            CONF_PRIORITY: priority,
+            CONF_CLIMATE_ENTITIES: ["climate.test_ac"],
+            CONF_PROFILES: [{CONF_PROFILE_ID: "Default", CONF_PROFILE_DEFAULT_HVAC_MODE: hvac_mode}],
+        }
+
+    mock_set_hvac = async_mock_service(hass, "climate", SERVICE_SET_HVAC_MODE)
+    mock_component(hass, "climate")
+    full_config = {
+        DOMAIN: {},
+        SWITCH_DOMAIN: [scheduler_config("Low", HVACMode.HEAT, 0), scheduler_config("High", HVACMode.COOL, 10)],
+    }
+    assert await async_setup_component(hass, DOMAIN, full_config)
+    assert await async_setup_component(hass, SWITCH_DOMAIN, full_config)
+    await hass.async_block_till_done()
+
+    assert "climate.test_ac is controlled by several climate schedulers" in caplog.text
+
+    low, high = "switch.climate_scheduler_low", "switch.climate_scheduler_high"
+    for entity_id in (low, high):
+        await hass.services.async_call(SWITCH_DOMAIN, SERVICE_TURN_ON, {ATTR_ENTITY_ID: entity_id}, blocking=True)
+    await hass.async_block_till_done()
+
+    # Only the high priority switch sends commands once both are on
+    assert [c.data[ATTR_HVAC_MODE] for c in mock_set_hvac] == [HVACMode.HEAT, HVACMode.COOL]
+
+    # Low priority switch doesn't interfere on updates
+    mock_set_hvac.clear()
+    entity = hass.data[SWITCH_DOMAIN].get_entity(low)
+    await entity.async_update_climate()
+    assert len(mock_set_hvac) == 0
+
+    # And takes over as soon as the high priority switch turns off
+    await hass.services.async_call(SWITCH_DOMAIN, SERVICE_TURN_OFF, {ATTR_ENTITY_ID: high}, blocking=True)
+    await hass.async_block_till_done()
+    assert [c.data[ATTR_HVAC_MODE] for c in mock_set_hvac] == [HVACMode.HEAT]
+
+
+async def test_set_profile_service_switches_many_schedulers(hass: HomeAssistant):
+    from custom_components.climate_scheduler.const import ATTR_PROFILE_ID, SERVICE_SET_PROFILE
+
+    def scheduler_config(name, climate_entity):
+        return {
+            CONF_PLATFORM: "climate_scheduler",
+            CONF_NAME: name,
+            CONF_DEFAULT_STATE: True,
+            CONF_CLIMATE_ENTITIES: [climate_entity],
+            CONF_PROFILES: [
+                {CONF_PROFILE_ID: "Home", CONF_PROFILE_DEFAULT_HVAC_MODE: HVACMode.HEAT},
+                {CONF_PROFILE_ID: "Away", CONF_PROFILE_DEFAULT_HVAC_MODE: HVACMode.OFF},
+            ],
+        }
+
+    mock_set_hvac = async_mock_service(hass, "climate", SERVICE_SET_HVAC_MODE)
+    mock_component(hass, "climate")
+    full_config = {
+        DOMAIN: {},
+        SWITCH_DOMAIN: [
+            scheduler_config("Bedroom", "climate.bedroom"),
+            scheduler_config("Office", "climate.office"),
+            scheduler_config("Kitchen", "climate.kitchen"),
+        ],
+    }
+    assert await async_setup_component(hass, DOMAIN, full_config)
+    assert await async_setup_component(hass, SWITCH_DOMAIN, full_config)
+    await hass.async_block_till_done()
+    mock_set_hvac.clear()
+
+    # Switches can be targeted directly or through their climate entities
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SET_PROFILE,
+        {ATTR_ENTITY_ID: ["switch.climate_scheduler_bedroom", "climate.office"], ATTR_PROFILE_ID: "Away"},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+    # Identical commands are merged into a single call
+    assert len(mock_set_hvac) == 1
+    assert sorted(mock_set_hvac[0].data[ATTR_ENTITY_ID]) == ["climate.bedroom", "climate.office"]
+    assert mock_set_hvac[0].data[ATTR_HVAC_MODE] == HVACMode.OFF
+    for name, profile in (("bedroom", "Away"), ("office", "Away"), ("kitchen", "Home")):
+        assert hass.states.get(f"switch.climate_scheduler_{name}").attributes[ATTR_PROFILE] == profile
+        selector = f"input_select.input_select_climate_scheduler_{name}_profile_selector"
+        assert hass.states.get(selector).state == profile
+
+    # Already using the profile, nothing to send
+    mock_set_hvac.clear()
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SET_PROFILE,
+        {ATTR_ENTITY_ID: "switch.climate_scheduler_bedroom", ATTR_PROFILE_ID: "Away"},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+    assert len(mock_set_hvac) == 0
+
+
+def _targets(call):
+    entity_ids = call.data[ATTR_ENTITY_ID]
+    return tuple(entity_ids) if isinstance(entity_ids, list) else entity_ids
+
+
+async def test_entity_offsets_and_overrides(hass: HomeAssistant):
+    config = {
+        CONF_PLATFORM: "climate_scheduler",
+        CONF_NAME: "House",
+        CONF_DEFAULT_STATE: True,
+        CONF_CLIMATE_ENTITIES: [
+            "climate.living_room",
+            "climate.kitchen",
+            {"entity_id": "climate.bedroom", "offset": -1.5},
+            {"entity_id": "climate.nursery", "offset": 1, CONF_SCHEDULE_HVAC: HVACMode.HEAT, "fan_mode": "low"},
+        ],
+        CONF_PROFILES: [
+            {
+                CONF_PROFILE_ID: "Default",
+                CONF_PROFILE_DEFAULT_HVAC_MODE: HVACMode.HEAT_COOL,
+                CONF_PROFILE_DEFAULT_MIN_TEMP: 20,
+                CONF_PROFILE_DEFAULT_MAX_TEMP: 24,
+            }
+        ],
+    }
+    mock_set_hvac = async_mock_service(hass, "climate", SERVICE_SET_HVAC_MODE)
+    mock_set_fan = async_mock_service(hass, "climate", SERVICE_SET_FAN_MODE)
+    mock_set_temp = async_mock_service(hass, "climate", SERVICE_SET_TEMPERATURE)
+    mock_component(hass, "climate")
+    full_config = {DOMAIN: {}, SWITCH_DOMAIN: [config]}
+    assert await async_setup_component(hass, DOMAIN, full_config)
+    assert await async_setup_component(hass, SWITCH_DOMAIN, full_config)
+    await hass.async_block_till_done()
+
+    hvac_calls = {_targets(c): c.data[ATTR_HVAC_MODE] for c in mock_set_hvac}
+    assert hvac_calls == {
+        ("climate.living_room", "climate.kitchen", "climate.bedroom"): HVACMode.HEAT_COOL,
+        "climate.nursery": HVACMode.HEAT,
+    }
+    assert [(c.data[ATTR_ENTITY_ID], c.data[ATTR_FAN_MODE]) for c in mock_set_fan] == [("climate.nursery", "low")]
+
+    temperatures = {
+        _targets(c): (
+            c.data.get(ATTR_TARGET_TEMP_LOW),
+            c.data.get(ATTR_TARGET_TEMP_HIGH),
+            c.data.get(ATTR_TEMPERATURE),
+        )
+        for c in mock_set_temp
+    }
+    assert temperatures == {
+        ("climate.living_room", "climate.kitchen"): (20, 24, None),
+        "climate.bedroom": (18.5, 22.5, None),
+        "climate.nursery": (None, None, 21),
+    }
@@ -0,0 +1,135 @@
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+
+from homeassistant.components.climate import (
+    ATTR_CURRENT_TEMPERATURE,
+    ATTR_TEMPERATURE,
+    SERVICE_SET_HVAC_MODE,
+    SERVICE_SET_TEMPERATURE,
+    HVACMode,
+)
+from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
+from homeassistant.const import CONF_NAME, CONF_PLATFORM
+from homeassistant.core import HomeAssistant, State
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_mock_service, mock_component
+
+from custom_components.climate_scheduler import DOMAIN
+from custom_components.climate_scheduler.const import (
+    CONF_CLIMATE_ENTITIES,
+    CONF_DEFAULT_STATE,
+    CONF_PROFILE_COST_OPTIMIZATION,
+    CONF_PROFILE_DEFAULT_HVAC_MODE,
+    CONF_PROFILE_DEFAULT_MIN_TEMP,
+    CONF_PROFILE_ID,
+    CONF_PROFILE_SCHEDULE,
+    CONF_PROFILES,
+    CONF_SCHEDULE_MIN_TEMP,
+    CONF_SCHEDULE_TIME,
+    CONF_TARIFF_SENSOR,
+)
+from custom_components.climate_scheduler.profile import ClimateSchedulerProfile
+from custom_components.climate_scheduler.tariff import parse_forecast, solve_setpoints
+
+
+def _forecast(start: datetime, prices: list[float]) -> list[dict]:
+    return [{"start": (start + timedelta(hours=h)).isoformat(), "price": p} for h, p in enumerate(prices)]
+
+
+def test_parse_forecast():
+    start = datetime(2024, 1, 1, 10, tzinfo=dt_util.UTC)
+    state = State("sensor.tariff", "0.2", {"forecast": _forecast(start, [0.2, 0.3, 0.1])})
+
+    assert parse_forecast(state, "forecast", start + timedelta(minutes=30)) == (0.2, 0.3, 0.1)
+    assert parse_forecast(state, "forecast", start + timedelta(hours=2)) == (0.1,)
+    assert parse_forecast(state, "forecast", start - timedelta(hours=1)) == ()
+    assert parse_forecast(state, "other", start) == ()
+    assert parse_forecast(None, "forecast", start) == ()
+
+
+def test_solver_preheats_during_cheap_hours():
+    prices = (0.1, 0.1, 0.1, 0.5, 0.5, 0.5)
+    lower = (17.0, 17.0, 17.0, 21.0, 21.0, 21.0)
+    upper = (23.0,) * 6
+    setpoints = solve_setpoints(prices, lower, upper, 18.0, 2.0, 0.5)
+
+    # Comfort is always met
+    assert all(s >= lo for s, lo in zip(setpoints, lower))
+    # The room is heated above the comfort bound while cheap, then coasts down
+    assert setpoints[2] > 21.0
+    assert setpoints[3] < setpoints[2]
+
+    # Same inputs are solved only once
+    assert solve_setpoints(prices, lower, upper, 18.0, 2.0, 0.5) is setpoints
+
+
+def test_solver_skips_unheated_hours():
+    setpoints = solve_setpoints((0.1, 0.1), (None, 20.0), (None, 22.0), 18.0, 1.0, 0.5)
+    assert setpoints[0] is None
+    assert setpoints[1] >= 18.5
+
+
+def test_profile_optimized_setpoints():
+    profile = ClimateSchedulerProfile(
+        {
+            CONF_PROFILE_ID: "Heating",
+            CONF_PROFILE_DEFAULT_HVAC_MODE: HVACMode.HEAT,
+            CONF_PROFILE_DEFAULT_MIN_TEMP: 19.0,
+            CONF_PROFILE_SCHEDULE: [],
+        }
+    )
+    day = date(2024, 1, 1)
+    profile.set_optimized_setpoints(
+        [
+            (datetime(2024, 1, 1, 22), 21.0),
+            (datetime(2024, 1, 1, 23), None),
+            (datetime(2024, 1, 2, 0), 22.0),
+            (datetime(2024, 1, 2, 2), None),
+        ]
+    )
+
+    assert profile.compute_climate(timedelta(hours=21), day).min_temp == 19.0
+    assert profile.compute_climate(timedelta(hours=22, minutes=30), day).min_temp == 21.0
+    assert profile.compute_climate(timedelta(hours=22, minutes=30), day, optimized=False).min_temp == 19.0
+    assert profile.compute_climate(timedelta(hours=23), day).min_temp == 19.0
+    assert profile.compute_climate(timedelta(hours=1), day + timedelta(days=1)).min_temp == 22.0
+    assert profile.compute_climate(timedelta(hours=3), day + timedelta(days=1)).min_temp == 19.0
+    # Cached
+    assert profile.compute_climate(timedelta(hours=1), day + timedelta(days=1)) is profile.compute_climate(
+        timedelta(hours=1, minutes=30), day + timedelta(days=1)
+    )
+
+
+async def test_switch_applies_optimized_setpoints(hass: HomeAssistant):
+    start = dt_util.now().replace(hour=5, minute=0, second=0, microsecond=0)
+    # Cheap now, expensive when the comfort temperature starts at 07:00
+    hass.states.async_set("sensor.tariff", "0.1", {"forecast": _forecast(start, [0.1, 0.1, 0.6, 0.6, 0.6, 0.6])})
+    hass.states.async_set("climate.test", HVACMode.HEAT, {ATTR_CURRENT_TEMPERATURE: 18.0})
+    config = {
+        CONF_PLATFORM: "climate_scheduler",
+        CONF_NAME: "Tariff",
+        CONF_DEFAULT_STATE: True,
+        CONF_CLIMATE_ENTITIES: ["climate.test"],
+        CONF_PROFILES: [
+            {
+                CONF_PROFILE_ID: "Heating",
+                CONF_PROFILE_DEFAULT_HVAC_MODE: HVACMode.HEAT,
+                CONF_PROFILE_DEFAULT_MIN_TEMP: 17,
+                CONF_PROFILE_SCHEDULE: [{CONF_SCHEDULE_TIME: timedelta(hours=7), CONF_SCHEDULE_MIN_TEMP: 21}],
+                CONF_PROFILE_COST_OPTIMIZATION: {CONF_TARIFF_SENSOR: "sensor.tariff"},
+            }
+        ],
+    }
+    mock_component(hass, "climate")
+    async_mock_service(hass, "climate", SERVICE_SET_HVAC_MODE)
+    mock_set_temp = async_mock_service(hass, "climate", SERVICE_SET_TEMPERATURE)
+
+    with patch("custom_components.climate_scheduler.switch.now", return_value=start + timedelta(minutes=10)):
+        full_config = {DOMAIN: {}, SWITCH_DOMAIN: [config]}
+        assert await async_setup_component(hass, DOMAIN, full_config)
+        assert await async_setup_component(hass, SWITCH_DOMAIN, full_config)
+        await hass.async_block_till_done()
+
+    # Pre-heats above the 17 degrees of the schedule while electricity is cheap
+    assert mock_set_temp[-1].data[ATTR_TEMPERATURE] > 17
@@ -0,0 +1,80 @@
+from datetime import timedelta
+
+from homeassistant.components.climate import SERVICE_SET_HVAC_MODE, SERVICE_SET_TEMPERATURE, HVACMode
+from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
+from homeassistant.const import ATTR_ENTITY_ID, CONF_NAME, CONF_PLATFORM, SERVICE_TURN_ON
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import async_mock_service, mock_component
+
+from custom_components.climate_scheduler import DOMAIN
+from custom_components.climate_scheduler.common import ComputedClimateData
+from custom_components.climate_scheduler.const import (
+    CONF_CLIMATE_ENTITIES,
+    CONF_PROFILE_DEFAULT_HVAC_MODE,
+    CONF_PROFILE_DEFAULT_MIN_TEMP,
+    CONF_PROFILE_ID,
+    CONF_PROFILES,
+    SERVICE_GET_TRACE,
+)
+from custom_components.climate_scheduler.trace import DecisionTrace
+
+
+def test_trace_is_bounded():
+    trace = DecisionTrace(size=3)
+    for hour in range(5):
+        trace.record("transition", "Default", timedelta(hours=hour))
+
+    assert len(trace) == 3
+    assert [entry["segment"] for entry in trace.as_list()] == ["2:00:00", "3:00:00", "4:00:00"]
+
+
+def test_trace_entry_format():
+    trace = DecisionTrace()
+    target = ComputedClimateData(HVACMode.HEAT, None, None, 21.0, None)
+    trace.record("interval", "Default", None, target, commands=2, skipped=1, duration=0.0012345)
+
+    entry = trace.as_list()[0]
+    assert entry["source"] == "interval"
+    assert entry["segment"] is None
+    assert entry["target"]["min_temp"] == 21.0
+    assert (entry["commands"], entry["skipped"], entry["reason"]) == (2, 1, None)
+    assert entry["duration_ms"] == 1.234
+
+
+async def test_get_trace_service(hass: HomeAssistant):
+    config = {
+        CONF_PLATFORM: "climate_scheduler",
+        CONF_NAME: "Bedroom",
+        CONF_CLIMATE_ENTITIES: ["climate.bedroom", "climate.closet"],
+        CONF_PROFILES: [
+            {
+                CONF_PROFILE_ID: "Default",
+                CONF_PROFILE_DEFAULT_HVAC_MODE: HVACMode.HEAT,
+                CONF_PROFILE_DEFAULT_MIN_TEMP: 21,
+            }
+        ],
+    }
+    mock_component(hass, "climate")
+    async_mock_service(hass, "climate", SERVICE_SET_HVAC_MODE)
+    async_mock_service(hass, "climate", SERVICE_SET_TEMPERATURE)
+    full_config = {DOMAIN: {}, SWITCH_DOMAIN: [config]}
+    assert await async_setup_component(hass, DOMAIN, full_config)
+    assert await async_setup_component(hass, SWITCH_DOMAIN, full_config)
+    await hass.async_block_till_done()
+
+    entity_id = "switch.climate_scheduler_bedroom"
+    await hass.services.async_call(SWITCH_DOMAIN, SERVICE_TURN_ON, {ATTR_ENTITY_ID: entity_id}, blocking=True)
+    await hass.services.async_call(SWITCH_DOMAIN, SERVICE_TURN_ON, {ATTR_ENTITY_ID: entity_id}, blocking=True)
+    await hass.async_block_till_done()
+
+    # Switches can be targeted through their climate entities
+    response = await hass.services.async_call(
+        DOMAIN, SERVICE_GET_TRACE, {ATTR_ENTITY_ID: "climate.closet"}, blocking=True, return_response=True
+    )
+    started, first, second = response[entity_id][-3:]
+    assert (started["source"], started["reason"]) == ("started", "off")
+    assert (first["source"], first["commands"], first["skipped"]) == ("turn_on", 4, 0)
+    assert first["target"]["hvac_mode"] == HVACMode.HEAT
+    # Nothing changed the second time
+    assert (second["commands"], second["skipped"]) == (0, 2)
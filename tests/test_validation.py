@@ -1,12 +1,18 @@
-from datetime import timedelta
+from datetime import date, timedelta
 
 import pytest
 import voluptuous as vol
 from homeassistant.components.climate import HVACMode
 
+from custom_components.climate_scheduler.common import SunRelativeTime
 from custom_components.climate_scheduler.const import (
+    CONF_PROFILE_DEFAULT_HVAC_MODE,
+    CONF_PROFILE_DEFAULT_MIN_TEMP,
+    CONF_PROFILE_EXTENDS,
     CONF_PROFILE_ID,
     CONF_PROFILE_SCHEDULE,
+    CONF_SCHEDULE_DATES,
+    CONF_SCHEDULE_DAYS,
     CONF_SCHEDULE_HVAC,
     CONF_SCHEDULE_MIN_TEMP,
     CONF_SCHEDULE_TIME,
@@ -14,7 +20,10 @@ from custom_components.climate_scheduler.const import (
 from custom_components.climate_scheduler.profile import PROFILES_SCHEMA
 from custom_components.climate_scheduler.schedule import SCHEDULE_SCHEMA
 from custom_components.climate_scheduler.validation import (
+    climate_entity,
     less_than_24h,
+    resolve_profile_extends,
+    schedule_time,
     unique_profiles,
     unique_schedule_times,
 )
@@ -32,6 +41,32 @@ def test_less_than_24h_invalid():
         less_than_24h(timedelta(hours=25))
 
 
+def test_schedule_time_fixed():
+    assert schedule_time("06:30:00") == timedelta(hours=6, minutes=30)
+    with pytest.raises(vol.Invalid):
+        schedule_time("24:00:00")
+
+
+def test_schedule_time_sun_relative():
+    assert schedule_time("sunrise") == SunRelativeTime("sunrise", timedelta())
+    assert schedule_time("sunset - 00:30") == SunRelativeTime("sunset", timedelta(minutes=-30))
+    assert schedule_time("Sunset+01:00:00") == SunRelativeTime("sunset", timedelta(hours=1))
+    with pytest.raises(vol.Invalid):
+        schedule_time("sunset * 2")
+    with pytest.raises(vol.Invalid):
+        schedule_time("dusk")
+
+
+def test_unique_schedule_times_sun_relative():
+    schedules = [
+        {CONF_SCHEDULE_TIME: SunRelativeTime("sunset", timedelta())},
+        {CONF_SCHEDULE_TIME: SunRelativeTime("sunset", timedelta(minutes=-30))},
+    ]
+    assert unique_schedule_times(schedules) == schedules
+    with pytest.raises(vol.Invalid):
+        unique_schedule_times(schedules + [{CONF_SCHEDULE_TIME: SunRelativeTime("sunset", timedelta())}])
+
+
 def test_unique_profiles_valid():
     profiles = [
         {CONF_PROFILE_ID: "p1"},
@@ -66,6 +101,39 @@ def test_unique_schedule_times_invalid():
         unique_schedule_times(schedules)
 
 
+def test_unique_schedule_times_on_different_days_valid():
+    schedules = [
+        {CONF_SCHEDULE_TIME: timedelta(hours=1), CONF_SCHEDULE_DAYS: ["mon"]},
+        {CONF_SCHEDULE_TIME: timedelta(hours=1), CONF_SCHEDULE_DAYS: ["tue"]},
+        {CONF_SCHEDULE_TIME: timedelta(hours=1), CONF_SCHEDULE_DATES: [date(2026, 12, 25)]},
+    ]
+    assert unique_schedule_times(schedules) == schedules
+
+
+def test_unique_schedule_times_on_overlapping_days_invalid():
+    schedules = [
+        {CONF_SCHEDULE_TIME: timedelta(hours=1)},
+        {CONF_SCHEDULE_TIME: timedelta(hours=1), CONF_SCHEDULE_DAYS: ["tue"]},
+    ]
+    with pytest.raises(vol.Invalid):
+        unique_schedule_times(schedules)
+
+
+def test_schedule_schema_days_and_dates_exclusive():
+    schedule = {
+        CONF_SCHEDULE_TIME: timedelta(hours=1),
+        CONF_SCHEDULE_DAYS: ["mon"],
+        CONF_SCHEDULE_DATES: ["2026-12-25"],
+    }
+    with pytest.raises(vol.Invalid):
+        SCHEDULE_SCHEMA([schedule])
+
+
+def test_schedule_schema_dates_parsed():
+    schedule = {CONF_SCHEDULE_TIME: timedelta(hours=1), CONF_SCHEDULE_DATES: "2026-12-25"}
+    assert SCHEDULE_SCHEMA([schedule])[0][CONF_SCHEDULE_DATES] == [date(2026, 12, 25)]
+
+
 def test_schedule_schema_valid():
     schedule = {
         CONF_SCHEDULE_TIME: timedelta(hours=1),
@@ -90,3 +158,81 @@ def test_profiles_schema_empty_schedule():
     }
     validated = PROFILES_SCHEMA([profile])
     assert validated[0][CONF_PROFILE_SCHEDULE] == []
+
+
+def test_climate_entity():
+    assert climate_entity("climate.test") == {"entity_id": "climate.test", "offset": 0.0}
+    assert climate_entity({"entity_id": "climate.test", "offset": "-1.5", CONF_SCHEDULE_HVAC: HVACMode.HEAT}) == {
+        "entity_id": "climate.test",
+        "offset": -1.5,
+        CONF_SCHEDULE_HVAC: HVACMode.HEAT,
+    }
+
+    with pytest.raises(vol.Invalid):
+        climate_entity("not an entity")
+    with pytest.raises(vol.Invalid):
+        climate_entity({"offset": 1})
+    with pytest.raises(vol.Invalid):
+        climate_entity({"entity_id": "climate.test", CONF_SCHEDULE_HVAC: "bogus"})
+
+
+def test_resolve_profile_extends():
+    morning = {CONF_SCHEDULE_TIME: timedelta(hours=7), CONF_SCHEDULE_MIN_TEMP: 21}
+    night = {CONF_SCHEDULE_TIME: timedelta(hours=22), CONF_SCHEDULE_MIN_TEMP: 17}
+    guest_night = {CONF_SCHEDULE_TIME: timedelta(hours=22), CONF_SCHEDULE_MIN_TEMP: 19}
+    weekend = {CONF_SCHEDULE_TIME: timedelta(hours=9), CONF_SCHEDULE_DAYS: ["sat", "sun"], CONF_SCHEDULE_MIN_TEMP: 22}
+    profiles = PROFILES_SCHEMA(
+        [
+            {CONF_PROFILE_ID: "Guest", CONF_PROFILE_EXTENDS: "Heating", CONF_PROFILE_SCHEDULE: [guest_night]},
+            {
+                CONF_PROFILE_ID: "Heating",
+                CONF_PROFILE_DEFAULT_HVAC_MODE: HVACMode.HEAT,
+                CONF_PROFILE_DEFAULT_MIN_TEMP: 20,
+                CONF_PROFILE_SCHEDULE: [morning, night],
+            },
+            {
+                CONF_PROFILE_ID: "Guest Weekend",
+                CONF_PROFILE_EXTENDS: "Guest",
+                CONF_PROFILE_DEFAULT_MIN_TEMP: 18,
+                CONF_PROFILE_SCHEDULE: [weekend],
+            },
+        ]
+    )
+    guest, heating, guest_weekend = resolve_profile_extends(profiles)
+
+    assert guest[CONF_PROFILE_ID] == "Guest"
+    assert CONF_PROFILE_EXTENDS not in guest
+    assert guest[CONF_PROFILE_DEFAULT_HVAC_MODE] == HVACMode.HEAT
+    assert guest[CONF_PROFILE_SCHEDULE] == [morning, guest_night]
+    # Inherited entries are shared rather than copied
+    assert guest[CONF_PROFILE_SCHEDULE][0] is heating[CONF_PROFILE_SCHEDULE][0]
+
+    assert guest_weekend[CONF_PROFILE_DEFAULT_MIN_TEMP] == 18
+    assert guest_weekend[CONF_PROFILE_SCHEDULE] == [morning, guest_night, weekend]
+
+
+def test_resolve_profile_extends_invalid():
+    with pytest.raises(vol.Invalid, match="unknown profile"):
+        resolve_profile_extends(PROFILES_SCHEMA([{CONF_PROFILE_ID: "a", CONF_PROFILE_EXTENDS: "b"}]))
+
+    with pytest.raises(vol.Invalid, match="extends itself"):
+        resolve_profile_extends(
+            PROFILES_SCHEMA(
+                [{CONF_PROFILE_ID: "a", CONF_PROFILE_EXTENDS: "b"}, {CONF_PROFILE_ID: "b", CONF_PROFILE_EXTENDS: "a"}]
+            )
+        )
+
+    # Extending entries must not collide with the entries they don't replace
+    with pytest.raises(vol.Invalid, match="Profile b"):
+        resolve_profile_extends(
+            PROFILES_SCHEMA(
+                [
+                    {CONF_PROFILE_ID: "a", CONF_PROFILE_SCHEDULE: [{CONF_SCHEDULE_TIME: timedelta(hours=7)}]},
+                    {
+                        CONF_PROFILE_ID: "b",
+                        CONF_PROFILE_EXTENDS: "a",
+                        CONF_PROFILE_SCHEDULE: [{CONF_SCHEDULE_TIME: timedelta(hours=7), CONF_SCHEDULE_DAYS: ["mon"]}],
+                    },
+                ]
+            )
+        )
@@ -0,0 +1,75 @@
+from datetime import timedelta
+
+from homeassistant.components.climate import SERVICE_SET_HVAC_MODE, HVACMode
+from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
+from homeassistant.const import ATTR_ENTITY_ID, CONF_NAME, CONF_PLATFORM, SERVICE_TURN_ON
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed, async_mock_service, mock_component
+
+from custom_components.climate_scheduler import DOMAIN
+from custom_components.climate_scheduler.const import (
+    CONF_CALLBACK_BUDGET,
+    CONF_CLIMATE_ENTITIES,
+    CONF_LOOP_LAG_SENSOR,
+    CONF_PROFILE_DEFAULT_HVAC_MODE,
+    CONF_PROFILE_ID,
+    CONF_PROFILES,
+    SIGNAL_WATCHDOG_UPDATED,
+    WATCHDOG_LAG_WINDOW,
+)
+from custom_components.climate_scheduler.watchdog import CallbackWatchdog
+
+SENSOR_ID = "sensor.climate_scheduler_loop_lag"
+
+
+async def test_lag_published_once_per_boundary(hass: HomeAssistant, freezer):
+    watchdog = CallbackWatchdog(hass, 1.0)
+    updates = []
+    async_dispatcher_connect(hass, SIGNAL_WATCHDOG_UPDATED, lambda: updates.append(watchdog.lag))
+
+    # Every switch samples the same boundary, the worst lag is kept
+    boundary = dt_util.utcnow() - timedelta(seconds=0.5)
+    watchdog.sample_lag(boundary)
+    freezer.tick(timedelta(seconds=1.5))
+    watchdog.sample_lag(boundary)
+    watchdog.sample_lag(boundary)
+    await hass.async_block_till_done()
+    assert updates == []
+
+    freezer.tick(WATCHDOG_LAG_WINDOW)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert updates == [2.0]
+    assert watchdog.boundary == boundary
+    assert watchdog.max_lag == 2.0
+
+
+async def test_slow_callback_flagged(hass: HomeAssistant, caplog):
+    config = {
+        CONF_PLATFORM: "climate_scheduler",
+        CONF_NAME: "Bedroom",
+        CONF_CLIMATE_ENTITIES: ["climate.bedroom"],
+        CONF_PROFILES: [{CONF_PROFILE_ID: "Default", CONF_PROFILE_DEFAULT_HVAC_MODE: HVACMode.HEAT}],
+    }
+    mock_component(hass, "climate")
+    async_mock_service(hass, "climate", SERVICE_SET_HVAC_MODE)
+    # Any callback is over a budget of 0
+    full_config = {DOMAIN: {CONF_CALLBACK_BUDGET: 0, CONF_LOOP_LAG_SENSOR: True}, SWITCH_DOMAIN: [config]}
+    assert await async_setup_component(hass, DOMAIN, full_config)
+    assert await async_setup_component(hass, SWITCH_DOMAIN, full_config)
+    await hass.async_block_till_done()
+
+    await hass.services.async_call(
+        SWITCH_DOMAIN, SERVICE_TURN_ON, {ATTR_ENTITY_ID: "switch.climate_scheduler_bedroom"}, blocking=True
+    )
+    await hass.async_block_till_done()
+
+    assert "turn_on took" in caplog.text
+    assert "the slowest call was climate.set_hvac_mode for climate.bedroom" in caplog.text
+    state = hass.states.get(SENSOR_ID)
+    assert state.attributes["slow_callbacks"] >= 1
+    assert state.attributes["last_slow_callback"]["callback"] == "turn_on"
+    assert state.attributes["last_slow_callback"]["service"] == "climate.set_hvac_mode"
@@ -0,0 +1,114 @@
+from homeassistant.components.climate import HVACMode
+from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
+from homeassistant.const import CONF_NAME, CONF_PLATFORM
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import mock_component
+
+from custom_components.climate_scheduler import DOMAIN
+from custom_components.climate_scheduler.const import (
+    CONF_CLIMATE_ENTITIES,
+    CONF_PROFILE_DEFAULT_HVAC_MODE,
+    CONF_PROFILE_DEFAULT_MIN_TEMP,
+    CONF_PROFILE_ID,
+    CONF_PROFILES,
+)
+
+ENTITY_ID = "switch.climate_scheduler_bedroom"
+
+
+async def _setup(hass: HomeAssistant):
+    config = {
+        CONF_PLATFORM: "climate_scheduler",
+        CONF_NAME: "Bedroom",
+        CONF_CLIMATE_ENTITIES: ["climate.bedroom"],
+        CONF_PROFILES: [
+            {CONF_PROFILE_ID: "Heat", CONF_PROFILE_DEFAULT_HVAC_MODE: HVACMode.HEAT, CONF_PROFILE_DEFAULT_MIN_TEMP: 21},
+            {CONF_PROFILE_ID: "Off", CONF_PROFILE_DEFAULT_HVAC_MODE: HVACMode.OFF},
+        ],
+    }
+    mock_component(hass, "climate")
+    full_config = {DOMAIN: {}, SWITCH_DOMAIN: [config]}
+    assert await async_setup_component(hass, DOMAIN, full_config)
+    assert await async_setup_component(hass, SWITCH_DOMAIN, full_config)
+    await hass.async_block_till_done()
+
+
+async def test_timeline(hass: HomeAssistant, hass_ws_client):
+    await _setup(hass)
+    client = await hass_ws_client(hass)
+
+    await client.send_json({"id": 1, "type": f"{DOMAIN}/timeline", "entity_id": ENTITY_ID})
+    msg = await client.receive_json()
+    assert msg["success"]
+    timeline = msg["result"]
+    assert timeline["profile"] == "Heat"
+    assert timeline["climates"][timeline["default"]] == [HVACMode.HEAT, None, None, 21.0, None]
+
+    # Nothing is sent again when the client already has the current version
+    await client.send_json(
+        {"id": 2, "type": f"{DOMAIN}/timeline", "entity_id": ENTITY_ID, "version": timeline["version"]}
+    )
+    msg = await client.receive_json()
+    assert msg["success"]
+    assert msg["result"] == {}
+
+    await client.send_json({"id": 3, "type": f"{DOMAIN}/timeline", "entity_id": "switch.unknown"})
+    msg = await client.receive_json()
+    assert not msg["success"]
+    assert msg["error"]["code"] == "not_found"
+
+
+async def test_subscribe_timeline(hass: HomeAssistant, hass_ws_client):
+    await _setup(hass)
+    client = await hass_ws_client(hass)
+
+    await client.send_json({"id": 1, "type": f"{DOMAIN}/subscribe_timeline", "entity_id": ENTITY_ID})
+    msg = await client.receive_json()
+    assert msg["success"]
+    msg = await client.receive_json()
+    assert msg["type"] == "event"
+    assert msg["event"]["profile"] == "Heat"
+
+    await hass.services.async_call(DOMAIN, "set_profile", {"entity_id": ENTITY_ID, "profile": "Off"}, blocking=True)
+    await hass.async_block_till_done()
+    msg = await client.receive_json()
+    assert msg["event"]["profile"] == "Off"
+    assert msg["event"]["climates"][msg["event"]["default"]][0] == HVACMode.OFF
+
+
+async def test_timeline_follows_hold(hass: HomeAssistant, hass_ws_client):
+    await _setup(hass)
+    client = await hass_ws_client(hass)
+
+    await client.send_json({"id": 1, "type": f"{DOMAIN}/subscribe_timeline", "entity_id": ENTITY_ID})
+    await client.receive_json()
+    msg = await client.receive_json()
+    assert msg["event"]["hold"] is None
+    version = msg["event"]["version"]
+
+    # Holding a temperature keeps the profile, but changes the version
+    await hass.services.async_call(
+        DOMAIN, "hold", {"entity_id": ENTITY_ID, "min_temp": 23, "duration": "01:00:00"}, blocking=True
+    )
+    await hass.async_block_till_done()
+    msg = await client.receive_json()
+    assert msg["event"]["profile"] == "Heat"
+    assert msg["event"]["hold"]["climate"] == [None, None, None, 23, None]
+    assert msg["event"]["version"] != version
+
+    # Holding a profile shows its schedule
+    await hass.services.async_call(
+        DOMAIN, "hold", {"entity_id": ENTITY_ID, "profile": "Off", "duration": "01:00:00"}, blocking=True
+    )
+    await hass.async_block_till_done()
+    msg = await client.receive_json()
+    assert msg["event"]["profile"] == "Off"
+    assert msg["event"]["hold"]["profile"] == "Off"
+
+    await hass.services.async_call(DOMAIN, "cancel_hold", {"entity_id": ENTITY_ID}, blocking=True)
+    await hass.async_block_till_done()
+    msg = await client.receive_json()
+    assert msg["event"]["profile"] == "Heat"
+    assert msg["event"]["hold"] is None
+    assert msg["event"]["version"] == version